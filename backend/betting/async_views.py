@@ -0,0 +1,85 @@
+"""
+Async variants of the public betting read endpoints (mounted under api/betting/async/...).
+
+Same parameters and responses as get_bet_info and get_all_groups in views.py, as
+plain Django async views for ASGI deployments. The queries of one request run one
+after another: the async ORM executes them in the request's sync thread anyway.
+"""
+import json
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from catalog.models import Race, Driver, RaceOutcome
+from catalog.current_season import aget_current_season
+from .views import group_page_params, group_pages, group_entry, next_group_cursor
+
+
+@require_GET
+async def get_bet_info(request):
+    race_date = request.GET.get('race')
+    if not race_date:
+        return JsonResponse({'error': 'Missing required parameter: race (YYYY-MM-DD)'}, status=400)
+
+    try:
+        date_obj = datetime.strptime(race_date, '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date format, expected YYYY-MM-DD.'}, status=400)
+
+    if not await Race.objects.filter(date=date_obj).aexists():
+        return JsonResponse({'error': f'Race {race_date} not found.'}, status=404)
+    prev_race = await Race.objects.filter(date__lt=date_obj).order_by('-date').afirst()
+    if not prev_race:
+        return JsonResponse({'error': 'No previous race available.'}, status=404)
+    current = await aget_current_season()
+    if not current:
+        return JsonResponse({'error': 'No seasons defined.'}, status=500)
+
+    prev_outcome = await RaceOutcome.objects.filter(race=prev_race).afirst()
+    bottom_10 = prev_outcome.bottom_10 if prev_outcome else []
+
+    # One query for all bottom-10 drivers instead of one per code
+    names = {
+        d.driver: f'{d.forename} {d.surname}'
+        async for d in Driver.objects.filter(driver__in=bottom_10).only('driver', 'forename', 'surname')
+    }
+
+    def map_codes(codes):
+        return [{'driver_id': code, 'name': names[code]} for code in codes if code in names]
+
+    return JsonResponse({
+        'race': race_date,
+        'drivers': [
+            {'driver_id': d['driver_id'], 'name': f"{d['forename']} {d['surname']}"}
+            for d in current['drivers']
+        ],
+        'last5': map_codes(bottom_10[:5]),
+        'mid5': map_codes(bottom_10[5:10]),
+    })
+
+
+@require_GET
+async def get_all_groups(request):
+    try:
+        after, limit = group_page_params(request)
+    except ValueError as exc:
+        return JsonResponse({'status': str(exc)}, status=400)
+
+    response = StreamingHttpResponse(_stream_groups(after, limit), content_type='application/json')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+async def _stream_groups(after, limit):
+    """Like views._stream_groups; each keyset page is loaded in the sync thread and sent as one chunk."""
+    pages = group_pages(after, limit)
+    yield '{"status": "success", "groups": ['
+    count, last_id = 0, after
+    while page := await sync_to_async(next)(pages, None):
+        yield (',' if count else '') + ','.join(json.dumps(group_entry(group)) for group in page)
+        count += len(page)
+        last_id = page[-1].id
+    next_cursor = await sync_to_async(next_group_cursor)(last_id, count, limit)
+    yield f'], "next_cursor": {json.dumps(next_cursor)}}}'
@@ -0,0 +1,174 @@
+"""
+Group leaderboards.
+
+Ranks are ordered by points, then exact podium hits, then the earliest bet. The
+aggregates behind them (BetStat.points, exact_podiums, first_bet_at) and the
+per-race deltas (last_race_points, previous_rank) are updated by evaluate_bets
+for the groups a race touched. Reads come from a snapshot cached per
+(group, leaderboard_version); every change to the standings bumps the version,
+so stale snapshots are never served and simply expire.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Group, Bet, BetStat, BetTop3
+from catalog.models import RaceOutcome
+
+CACHE_KEY = 'betting:leaderboard:{group_id}:{version}'
+CACHE_TIMEOUT = 60 * 60
+_NEVER = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def sort_key(stat):
+    return -stat.points, -stat.exact_podiums, stat.first_bet_at or _NEVER
+
+
+def ranked(stats):
+    """Yields (rank, stat) in leaderboard order; members with identical keys share a rank."""
+    rank, previous = 0, None
+    for position, stat in enumerate(sorted(stats, key=lambda s: (sort_key(s), s.pk)), start=1):
+        key = sort_key(stat)
+        if key != previous:
+            rank, previous = position, key
+        yield rank, stat
+
+
+def bump_version(group_ids):
+    """Invalidates the cached leaderboards of ``group_ids`` (membership or standings changed)."""
+    Group.objects.filter(id__in=group_ids).update(leaderboard_version=F('leaderboard_version') + 1)
+
+
+def record_race(results):
+    """
+    Applies one evaluated race. ``results`` maps (group_id, user_id) to
+    {'points', 'exact_podium', 'bet_date'} for every bet of that race.
+    Only the touched groups are re-ranked; members of those groups without a bet
+    get a zero delta. Call inside the transaction that marks the bets evaluated.
+    """
+    BetStat.objects.bulk_create(
+        [BetStat(group_id=group_id, user_id=user_id) for group_id, user_id in results],
+        ignore_conflicts=True,
+    )
+    group_ids = {group_id for group_id, _ in results}
+    stats_by_group = defaultdict(list)
+    for stat in BetStat.objects.select_for_update().filter(group_id__in=group_ids):
+        stats_by_group[stat.group_id].append(stat)
+
+    changed = []
+    for stats in stats_by_group.values():
+        for rank, stat in ranked(stats):
+            stat.previous_rank = rank
+        for stat in stats:
+            result = results.get((stat.group_id, stat.user_id))
+            stat.last_race_points = result['points'] if result else 0
+            if result:
+                stat.points += result['points']
+                stat.exact_podiums += result['exact_podium']
+                if stat.first_bet_at is None or result['bet_date'] < stat.first_bet_at:
+                    stat.first_bet_at = result['bet_date']
+        changed.extend(stats)
+
+    BetStat.objects.bulk_update(
+        changed, ['points', 'exact_podiums', 'first_bet_at', 'last_race_points', 'previous_rank'], batch_size=500
+    )
+    bump_version(group_ids)
+
+
+def aggregate(bets, top3, podiums):
+    """
+    Leaderboard aggregates per (group_id, user_id):
+      bets:    (bet_id, group_id, user_id, race_id, bet_date, points_awarded) of evaluated bets
+      top3:    (bet_id, driver_id) ordered by bet and position
+      podiums: race_id -> actual podium (RaceOutcome.podium)
+    """
+    top3_by_bet = defaultdict(list)
+    for bet_id, driver_id in top3:
+        top3_by_bet[bet_id].append(driver_id)
+
+    totals = defaultdict(lambda: {'points': 0, 'exact_podiums': 0, 'first_bet_at': None})
+    for bet_id, group_id, user_id, race_id, bet_date, points in bets:
+        total = totals[(group_id, user_id)]
+        total['points'] += points
+        total['exact_podiums'] += bool(podiums.get(race_id)) and top3_by_bet[bet_id] == podiums[race_id]
+        if total['first_bet_at'] is None or bet_date < total['first_bet_at']:
+            total['first_bet_at'] = bet_date
+    return totals
+
+
+def apply_totals(stats, totals):
+    """Copies the aggregates onto the BetStat rows that have evaluated bets; returns the changed rows."""
+    changed = []
+    for stat in stats:
+        total = totals.get((stat.group_id, stat.user_id))
+        if total:
+            stat.points = total['points']
+            stat.exact_podiums = total['exact_podiums']
+            stat.first_bet_at = total['first_bet_at']
+            changed.append(stat)
+    return changed
+
+
+def rebuild(group_ids=None):
+    """
+    Recomputes the aggregates from the evaluated bets, e.g. for bets scored
+    before the leaderboard fields existed. Per-race deltas are left untouched.
+    """
+    bets = Bet.objects.filter(evaluated=True)
+    stats = BetStat.objects.all()
+    if group_ids is not None:
+        bets = bets.filter(group_id__in=group_ids)
+        stats = stats.filter(group_id__in=group_ids)
+
+    totals = aggregate(
+        bets.values_list('id', 'group_id', 'user_id', 'race_id', 'bet_date', 'points_awarded'),
+        BetTop3.objects.filter(bet__in=bets).order_by('bet_id', 'position').values_list('bet_id', 'driver_id'),
+        dict(RaceOutcome.objects.filter(race__in=bets.values('race_id')).values_list('race_id', 'podium')),
+    )
+    changed = apply_totals(stats, totals)
+    BetStat.objects.bulk_update(changed, ['points', 'exact_podiums', 'first_bet_at'], batch_size=500)
+    bump_version({stat.group_id for stat in changed})
+    return len(changed)
+
+
+def build_leaderboard(group):
+    rows = []
+    stats = BetStat.objects.filter(group=group).select_related('user').only(
+        'id', 'user', 'points', 'exact_podiums', 'first_bet_at', 'last_race_points', 'previous_rank', 'user__username',
+    )
+    for rank, stat in ranked(stats):
+        rows.append({
+            'rank':           rank,
+            'user_id':        stat.user_id,
+            'user':           stat.user.username,
+            'points':         stat.points,
+            'exact_podiums':  stat.exact_podiums,
+            'first_bet_at':   stat.first_bet_at.isoformat() if stat.first_bet_at else None,
+            'last_race':      stat.last_race_points,
+            # positive: moved up since the previous race
+            'rank_change':    stat.previous_rank - rank if stat.previous_rank else None,
+        })
+    return {
+        'version': group.leaderboard_version,
+        'rows': rows,
+        # user id -> row index, for "my rank" without scanning
+        'positions': {row['user_id']: index for index, row in enumerate(rows)},
+    }
+
+
+def get_leaderboard(group):
+    """Snapshot of the group's leaderboard from the cache (rebuilt once per version)."""
+    key = CACHE_KEY.format(group_id=group.id, version=group.leaderboard_version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_leaderboard(group)
+        cache.set(key, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+def my_rank(snapshot, user):
+    """The requesting user's row, or None if they are not a member."""
+    index = snapshot['positions'].get(user.id)
+    return snapshot['rows'][index] if index is not None else None
@@ -1,116 +1,85 @@
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from django.db.models import Q, Case, When, Value
-from django.db.models.functions import Cast
-from django.forms import IntegerField
 from django.utils import timezone
-from betting.models import Bet, BetTop3, BetStat, Group
-from catalog.models import Result, QualifyingResult, Race
-import datetime
+from betting import leaderboard
+from betting.models import Bet, BetTop3
+from betting.scoring import race_outcome, score_bet
+from catalog.models import Race
 
 
 class Command(BaseCommand):
     help = 'Evaluate all bets for races that have finished and assign points'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild-leaderboards', action='store_true',
+                            help='Recompute all leaderboard aggregates from the evaluated bets first')
+
     def handle(self, *args, **options):
+        if options['rebuild_leaderboards']:
+            with transaction.atomic():
+                count = leaderboard.rebuild()
+            self.stdout.write(f'{count} leaderboard entries rebuilt')
+
         today = timezone.now().date()
-        # Fetch bets not yet evaluated for races up to today
-        bets = Bet.objects.filter(evaluated=False, race__date__lte=today)
+        # Races up to today that still have bets waiting for evaluation
+        race_dates = (
+            Bet.objects
+            .filter(evaluated=False, race__date__lte=today)
+            .values_list('race_id', flat=True)
+            .distinct()
+            .order_by('race_id')
+        )
         evaluated_count = 0
 
-        for bet in bets:
-            earned_points = 0
-            stat, _ = BetStat.objects.get_or_create(group=bet.group, user=bet.user)
-            eval_race = bet.race
-            # Find the race immediately before the evaluated race
-            prev_race = Race.objects.filter(date__lt=eval_race.date).order_by('-date').first()
-            if not prev_race:
+        for race in Race.objects.filter(date__in=list(race_dates)).order_by('date'):
+            # Same outcome for every bet on this race – compute it once
+            outcome = race_outcome(race)
+            if outcome is None:
                 continue
+            evaluated_count += self.evaluate_race(race, outcome)
 
-            # Results of the evaluated race
-            eval_results = list(Result.objects.filter(date=eval_race))
-            # Build sorted list of (position_int, driver_code) for eval race
-            numeric_eval = []
-            for r in eval_results:
-                try:
-                    pos = int(r.position)
-                except (ValueError, TypeError):
-                    continue
-                numeric_eval.append((pos, r.driver.driver))
-            numeric_eval.sort(key=lambda x: x[0])
-
-            # Predicted top3
-            predicted_top3 = [
-                bt3.driver.driver
-                for bt3 in BetTop3.objects.filter(bet=bet).order_by('position')
-            ]
-            # Actual top3
-            actual_top3 = [code for (_, code) in numeric_eval[:3]]
-
-            # 1 point per correct driver, plus 2 bonus if full order matches
-            for code in predicted_top3:
-                if code in actual_top3:
-                    earned_points += 1
-            if predicted_top3 == actual_top3:
-                earned_points += 2
-
-            # Last 5 prediction: worst 5 from prev_race
-            prev_results = list(Result.objects.filter(date=prev_race))
-            numeric_prev = []
-            for r in prev_results:
-                try:
-                    pos = int(r.position)
-                except (ValueError, TypeError):
-                    continue
-                numeric_prev.append((pos, r.driver.driver))
-            # worst = largest positions
-            numeric_prev.sort(key=lambda x: x[0], reverse=True)
-            last5_codes = [code for (_, code) in numeric_prev[:5]]
-            # best among those in eval race
-            best_last5 = None
-            for pos, code in numeric_eval:
-                if code in last5_codes:
-                    best_last5 = code
-                    break
-            if best_last5 and bet.bet_last_5 and best_last5 == bet.bet_last_5.driver:
-                earned_points += 2
-
-            # Positions 6-10 (next 5 worst)
-            mid5_codes = [code for (_, code) in numeric_prev[5:10]]
-            best_mid5 = None
-            for pos, code in numeric_eval:
-                if code in mid5_codes:
-                    best_mid5 = code
-                    break
-            if best_mid5 and bet.bet_last_10 and best_mid5 == bet.bet_last_10.driver:
-                earned_points += 2
+        self.stdout.write(self.style.SUCCESS(f'{evaluated_count} bets evaluated'))
 
-            # Fastest lap prediction (lexicographical fallback)
-            fastest_list = []
-            for r in eval_results:
-                if r.fastest_lap:
-                    fastest_list.append((r.fastest_lap, r.driver.driver))
-            fastest_list.sort(key=lambda x: x[0])
-            if fastest_list:
-                actual_fast = fastest_list[0][1]
-                if bet.bet_fastest_lap and actual_fast == bet.bet_fastest_lap.driver:
-                    earned_points += 2
+    def evaluate_race(self, race, outcome):
+        """Scores all pending bets of one race in memory and writes them in bulk."""
+        bets = list(
+            Bet.objects
+            .filter(evaluated=False, race=race)
+            .only('id', 'group_id', 'user_id', 'bet_date', 'bet_last_5_id', 'bet_last_10_id', 'bet_fastest_lap_id')
+        )
+        if not bets:
+            return 0
 
-            stat.points += earned_points
-            print(actual_top3)
-            print(last5_codes)
-            print(best_last5)
-            print(mid5_codes)
-            print(best_mid5)
-            # Save stats and mark bet evaluated
-            with transaction.atomic():
-                stat.save()
-                bet.points_awarded = earned_points
-                bet.evaluated = True
-                bet.save()
-            evaluated_count += 1
-
-        self.stdout.write(self.style.SUCCESS(f'{evaluated_count} bets evaluated'))
+        top3_by_bet = defaultdict(list)
+        for bet_id, driver_id in (
+            BetTop3.objects
+            .filter(bet__in=bets)
+            .order_by('bet_id', 'position')
+            .values_list('bet_id', 'driver_id')
+        ):
+            top3_by_bet[bet_id].append(driver_id)
 
+        results = {}
+        for bet in bets:
+            bet.points_awarded = score_bet(
+                top3_by_bet[bet.id],
+                bet.bet_last_5_id,
+                bet.bet_last_10_id,
+                bet.bet_fastest_lap_id,
+                outcome,
+            )
+            bet.evaluated = True
+            result = results.setdefault((bet.group_id, bet.user_id),
+                                        {'points': 0, 'exact_podium': 0, 'bet_date': bet.bet_date})
+            result['points'] += bet.points_awarded
+            result['exact_podium'] += bool(outcome['top3']) and top3_by_bet[bet.id] == outcome['top3']
+            result['bet_date'] = min(result['bet_date'], bet.bet_date)
 
+        with transaction.atomic():
+            Bet.objects.bulk_update(bets, ['points_awarded', 'evaluated'])
+            # points, tie-breaks and per-race deltas of the touched groups
+            leaderboard.record_race(results)
 
+        return len(bets)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0002_bet_evaluated_group_join_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bet',
+            name='points_awarded',
+            field=models.IntegerField(default=0),
+        ),
+    ]
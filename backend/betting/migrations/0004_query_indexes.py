@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0003_bet_points_awarded'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['evaluated', 'race'], name='bet_evaluated_race_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['group', 'evaluated'], name='bet_group_evaluated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(condition=models.Q(('evaluated', False)), fields=['race'], name='bet_pending_race_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='betstat',
+            index=models.Index(fields=['group', '-points'], name='betstat_group_points_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0004_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(condition=models.Q(('evaluated', True)), fields=['group', 'race', 'id'], name='bet_group_history_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:22
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_leaderboards(apps, schema_editor):
+    Bet = apps.get_model('betting', 'Bet')
+    BetTop3 = apps.get_model('betting', 'BetTop3')
+    BetStat = apps.get_model('betting', 'BetStat')
+    RaceOutcome = apps.get_model('catalog', 'RaceOutcome')
+
+    bets = Bet.objects.filter(evaluated=True)
+    podiums = dict(RaceOutcome.objects.values_list('race_id', 'podium'))
+    top3_by_bet = defaultdict(list)
+    for bet_id, driver_id in (
+        BetTop3.objects.filter(bet__in=bets).order_by('bet_id', 'position').values_list('bet_id', 'driver_id')
+    ):
+        top3_by_bet[bet_id].append(driver_id)
+
+    # exact podium hits and first bet per (group, user)
+    totals = defaultdict(lambda: {'exact_podiums': 0, 'first_bet_at': None})
+    for bet_id, group_id, user_id, race_id, bet_date in (
+        bets.values_list('id', 'group_id', 'user_id', 'race_id', 'bet_date').iterator()
+    ):
+        total = totals[(group_id, user_id)]
+        podium = podiums.get(race_id)
+        if podium and top3_by_bet[bet_id] == podium:
+            total['exact_podiums'] += 1
+        if total['first_bet_at'] is None or bet_date < total['first_bet_at']:
+            total['first_bet_at'] = bet_date
+
+    # points are already maintained by evaluate_bets – only fill in the new tie-breaks
+    changed = []
+    for stat in BetStat.objects.all():
+        total = totals.get((stat.group_id, stat.user_id))
+        if total:
+            stat.exact_podiums = total['exact_podiums']
+            stat.first_bet_at = total['first_bet_at']
+            changed.append(stat)
+    BetStat.objects.bulk_update(changed, ['exact_podiums', 'first_bet_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0005_history_index'),
+        ('catalog', '0004_raceoutcome'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='betstat',
+            name='exact_podiums',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='betstat',
+            name='first_bet_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='betstat',
+            name='last_race_points',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='betstat',
+            name='previous_rank',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='leaderboard_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
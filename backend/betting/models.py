@@ -10,6 +10,8 @@ class Group(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     join_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    # bumped on every change to the standings; part of the leaderboard cache key
+    leaderboard_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.name
@@ -19,9 +21,17 @@ class BetStat(models.Model):
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='betstats')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='betstats')
     points = models.IntegerField(default=0)
+    # leaderboard tie-breaks and per-race deltas, maintained by evaluate_bets
+    exact_podiums = models.IntegerField(default=0)
+    first_bet_at = models.DateTimeField(null=True, blank=True)
+    last_race_points = models.IntegerField(default=0)
+    previous_rank = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = ('group', 'user')
+        indexes = [
+            models.Index(fields=['group', '-points'], name='betstat_group_points_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} in {self.group.name}"
@@ -48,6 +58,17 @@ class Bet(models.Model):
         related_name='bets_top3'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['evaluated', 'race'], name='bet_evaluated_race_idx'),
+            models.Index(fields=['group', 'evaluated'], name='bet_group_evaluated_idx'),
+            # evaluate_bets only looks at pending bets
+            models.Index(fields=['race'], condition=models.Q(evaluated=False), name='bet_pending_race_idx'),
+            # get_evaluated_bets pages through a group's history by (race, id)
+            models.Index(fields=['group', 'race', 'id'], condition=models.Q(evaluated=True),
+                         name='bet_group_history_idx'),
+        ]
+
 
 class BetTop3(models.Model):
     bet       = models.ForeignKey(Bet, on_delete=models.CASCADE)
@@ -0,0 +1,49 @@
+from catalog.models import Race, RaceOutcome
+
+
+def race_outcome(race):
+    """
+    Everything a bet on ``race`` is scored against, read from the precomputed RaceOutcome rows:
+      - top3:        actual podium in order
+      - best_last5:  best finisher among the 5 worst of the previous race
+      - best_mid5:   best finisher among positions 6-10 from the bottom of the previous race
+      - fastest_lap: driver with the fastest lap
+    Returns None while the race has no results or there is no previous race.
+    """
+    prev_race = Race.objects.filter(date__lt=race.date).order_by('-date').first()
+    if not prev_race:
+        return None
+
+    outcomes = {o.race_id: o for o in RaceOutcome.objects.filter(race__in=[race, prev_race])}
+    outcome = outcomes.get(race.date)
+    if outcome is None:
+        return None
+
+    prev_bottom = outcomes[prev_race.date].bottom_10 if prev_race.date in outcomes else []
+    last5 = set(prev_bottom[:5])
+    mid5 = set(prev_bottom[5:10])
+
+    return {
+        'top3':        outcome.podium,
+        'best_last5':  next((code for code in outcome.classified if code in last5), None),
+        'best_mid5':   next((code for code in outcome.classified if code in mid5), None),
+        'fastest_lap': outcome.fastest_lap_driver_id,
+    }
+
+
+def score_bet(predicted_top3, bet_last_5, bet_last_10, bet_fastest_lap, outcome):
+    """
+    Points for one bet (driver ids in, no DB access):
+    1 per correct podium driver, +2 for the exact podium order,
+    2 each for the best of the last 5, the best of 6-10 and the fastest lap.
+    """
+    points = sum(1 for code in predicted_top3 if code in outcome['top3'])
+    if outcome['top3'] and predicted_top3 == outcome['top3']:
+        points += 2
+    if outcome['best_last5'] and bet_last_5 == outcome['best_last5']:
+        points += 2
+    if outcome['best_mid5'] and bet_last_10 == outcome['best_mid5']:
+        points += 2
+    if outcome['fastest_lap'] and bet_fastest_lap == outcome['fastest_lap']:
+        points += 2
+    return points
@@ -0,0 +1,406 @@
+import json
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from betting import leaderboard
+from betting.models import Group, Bet, BetTop3, BetStat
+from catalog.driver_codes import resolve_drivers
+from catalog.models import Season, Circuit, Driver, Constructor, Race, Result, RaceOutcome, DriverTeam
+from catalog.outcomes import refresh_race_outcomes
+
+
+DRIVERS = ['verstappen', 'norris', 'leclerc', 'piastri', 'hamilton', 'russell',
+           'sainz', 'alonso', 'gasly', 'ocon', 'albon', 'stroll']
+
+
+def streamed_json(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+class BettingDataMixin:
+    """Two finished races with twelve classified drivers each."""
+
+    def create_race_data(self):
+        season = Season.objects.create(season='2025')
+        circuit = Circuit.objects.create(circuit='monza', name='Monza', location='Monza', country='Italy')
+        team = Constructor.objects.create(constructor='red_bull', name='Red Bull', nationality='Austrian')
+        for code in DRIVERS:
+            Driver.objects.create(driver=code, forename=code.title(), surname=code.upper(),
+                                  dob=date(1990, 1, 1), nationality='Dutch')
+
+        self.prev_race = Race.objects.create(date=date(2025, 3, 2), season=season, circuit=circuit, round='1')
+        self.race = Race.objects.create(date=date(2025, 3, 16), season=season, circuit=circuit, round='2')
+
+        # previous race: finishing order as in DRIVERS
+        # evaluated race: reversed order, fastest lap by 'norris'
+        for race, order in ((self.prev_race, DRIVERS), (self.race, DRIVERS[::-1])):
+            for pos, code in enumerate(order, start=1):
+                Result.objects.create(
+                    date=race, driver_id=code, constructor=team, number=str(pos), grid=str(pos),
+                    position=str(pos), position_text=str(pos), points='0', laps='50',
+                    fastest_lap='1:20.000' if code == 'norris' and race == self.race else '1:25.000',
+                    status='Finished',
+                )
+        refresh_race_outcomes([self.prev_race.date, self.race.date])
+
+    def create_bet(self, user, group, top3, last5=None, last10=None, fastest=None):
+        bet = Bet.objects.create(user=user, group=group, race=self.race, bet_last_5_id=last5,
+                                 bet_last_10_id=last10, bet_fastest_lap_id=fastest)
+        for pos, code in enumerate(top3, start=1):
+            BetTop3.objects.create(bet=bet, driver_id=code, position=pos)
+        return bet
+
+
+class EvaluateBetsTestCase(BettingDataMixin, TestCase):
+    def setUp(self):
+        self.create_race_data()
+        self.alice = User.objects.create_user(username='alice', password='pw')
+        self.bob = User.objects.create_user(username='bob', password='pw')
+        self.group = Group.objects.create(name='paddock', owner=self.alice)
+        BetStat.objects.create(group=self.group, user=self.alice, points=3)
+
+    def test_scores_all_bets_of_a_race(self):
+        # actual top 3: stroll, albon, ocon
+        # previous last 5: alonso..stroll -> best now: stroll
+        # previous 6-10 from the bottom: leclerc..sainz -> best now: sainz
+        perfect = self.create_bet(self.alice, self.group, ['stroll', 'albon', 'ocon'],
+                                  last5='stroll', last10='sainz', fastest='norris')
+        partial = self.create_bet(self.bob, self.group, ['albon', 'stroll', 'verstappen'],
+                                  last5='gasly', fastest='leclerc')
+
+        call_command('evaluate_bets', stdout=StringIO())
+
+        perfect.refresh_from_db()
+        partial.refresh_from_db()
+        self.assertTrue(perfect.evaluated and partial.evaluated)
+        self.assertEqual(perfect.points_awarded, 3 + 2 + 2 + 2 + 2)
+        self.assertEqual(partial.points_awarded, 2)
+        self.assertEqual(BetStat.objects.get(group=self.group, user=self.alice).points, 3 + 11)
+        self.assertEqual(BetStat.objects.get(group=self.group, user=self.bob).points, 2)
+
+    def test_races_without_results_stay_pending(self):
+        Result.objects.filter(date=self.race).delete()
+        RaceOutcome.objects.filter(race=self.race).delete()
+        bet = self.create_bet(self.bob, self.group, ['stroll', 'albon', 'ocon'])
+
+        call_command('evaluate_bets', stdout=StringIO())
+
+        bet.refresh_from_db()
+        self.assertFalse(bet.evaluated)
+
+    def test_no_classified_podium_is_not_an_exact_podium(self):
+        RaceOutcome.objects.filter(race=self.race).update(podium=[])
+        bet = self.create_bet(self.bob, self.group, [])
+
+        call_command('evaluate_bets', stdout=StringIO())
+
+        bet.refresh_from_db()
+        self.assertEqual((bet.evaluated, bet.points_awarded), (True, 0))
+        self.assertEqual(BetStat.objects.get(group=self.group, user=self.bob).exact_podiums, 0)
+
+
+class AsyncViewsTestCase(BettingDataMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_race_data()
+        alice = User.objects.create_user(username='alice', password='pw')
+        bob = User.objects.create_user(username='bob', password='pw')
+        group = Group.objects.create(name='paddock', owner=alice)
+        BetStat.objects.create(group=group, user=alice)
+        BetStat.objects.create(group=group, user=bob)
+
+    def test_same_payload_as_sync_views(self):
+        sync = self.client.get(reverse('betting:get_bet_info'), {'race': '2025-03-16'})
+        async_ = self.client.get(reverse('betting:async_get_bet_info'), {'race': '2025-03-16'})
+        self.assertEqual(async_.json(), sync.json())
+
+
+        info = self.client.get(reverse('betting:async_get_bet_info'), {'race': '2025-03-16'}).json()
+        self.assertEqual([d['driver_id'] for d in info['last5']], DRIVERS[:-6:-1])
+
+    async def test_groups_are_streamed_page_by_page(self):
+        await Group.objects.acreate(name='pitlane', owner=await User.objects.aget(username='bob'))
+        with mock.patch('betting.views.GROUP_PAGE_SIZE', 1):
+            for params in ({}, {'limit': 1}):
+                response = await self.async_client.get(reverse('betting:async_get_all_groups'), params)
+                chunks = [chunk async for chunk in response.streaming_content]
+                sync = await sync_to_async(self.client.get)(reverse('betting:get_all_groups'), params)
+                self.assertEqual(json.loads(b''.join(chunks)), await sync_to_async(streamed_json)(sync))
+        # opening, one chunk per page, closing
+        self.assertEqual(len(chunks), 3)
+
+    def test_unknown_race(self):
+        response = self.client.get(reverse('betting:async_get_bet_info'), {'race': '2024-01-01'})
+        self.assertEqual(response.status_code, 404)
+
+
+class GroupListTestCase(TestCase):
+    def setUp(self):
+        users = [User.objects.create_user(username=f'user{i}', password='pw') for i in range(6)]
+        for i in range(5):
+            group = Group.objects.create(name=f'group{i}', owner=users[i])
+            for user in users[:i + 1]:
+                BetStat.objects.create(group=group, user=user)
+
+    def test_constant_queries_and_members(self):
+        # one page: groups with owner + prefetched members
+        with self.assertNumQueries(2):
+            data = streamed_json(self.client.get(reverse('betting:get_all_groups')))
+        self.assertEqual([len(g['members']) for g in data['groups']], [1, 2, 3, 4, 5])
+        self.assertEqual(data['groups'][1]['owner'], 'user1')
+        self.assertIsNone(data['next_cursor'])
+
+    def test_cursor_pagination(self):
+        url = reverse('betting:get_all_groups')
+        names, cursor = [], ''
+        while True:
+            data = streamed_json(self.client.get(url, {'limit': 2, 'cursor': cursor}))
+            names += [g['group_name'] for g in data['groups']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(names, [f'group{i}' for i in range(5)])
+
+        self.assertEqual(self.client.get(url, {'limit': 0}).status_code, 400)
+
+
+class EvaluatedBetsTestCase(BettingDataMixin, APITestCase):
+    def setUp(self):
+        self.create_race_data()
+        self.alice = User.objects.create_user(username='alice', password='pw')
+        self.bob = User.objects.create_user(username='bob', password='pw')
+        self.group = Group.objects.create(name='paddock', owner=self.alice)
+        for user in (self.alice, self.bob):
+            BetStat.objects.create(group=self.group, user=user)
+            for race in (self.prev_race, self.race):
+                bet = Bet.objects.create(user=user, group=self.group, race=race, evaluated=True, points_awarded=2,
+                                         bet_last_5_id='stroll')
+                for pos, code in enumerate(['norris', 'leclerc', 'piastri'], start=1):
+                    BetTop3.objects.create(bet=bet, driver_id=code, position=pos)
+        self.client.force_authenticate(user=self.alice)
+        self.url = reverse('betting:get_evaluated_bets')
+
+    def test_constant_queries(self):
+        # group, bets, top-3 picks, standings
+        with self.assertNumQueries(4):
+            data = self.client.post(self.url, {'group': 'paddock'}, format='json').json()
+        self.assertEqual(len(data['bets']), 4)
+        self.assertEqual(data['bets'][0]['bet_top_3'], ['norris', 'leclerc', 'piastri'])
+        self.assertEqual(data['bets'][0]['bet_last_5'], 'stroll')
+        self.assertIsNone(data['next_cursor'])
+
+    def test_keyset_pages_and_filters(self):
+        pages, cursor = [], None
+        while True:
+            data = self.client.post(self.url, {'group': 'paddock', 'limit': 3, 'cursor': cursor},
+                                    format='json').json()
+            pages.append([(b['race'], b['user']) for b in data['bets']])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(pages, [
+            [('2025-03-02', 'alice'), ('2025-03-02', 'bob'), ('2025-03-16', 'alice')],
+            [('2025-03-16', 'bob')],
+        ])
+
+        data = self.client.post(self.url, {'group': 'paddock', 'race': '2025-03-16', 'user': 'bob'},
+                                format='json').json()
+        self.assertEqual([(b['race'], b['user']) for b in data['bets']], [('2025-03-16', 'bob')])
+
+        for bad in ({'limit': 'x'}, {'race': '16.03.2025'}, {'cursor': 'nope'}):
+            response = self.client.post(self.url, {'group': 'paddock', **bad}, format='json')
+            self.assertEqual(response.status_code, 400, bad)
+
+
+class DriverCodeResolverTestCase(BettingDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_race_data()
+        team = Constructor.objects.get(pk='red_bull')
+        for code in DRIVERS[:-1]:  # 'stroll' only raced in earlier seasons
+            DriverTeam.objects.create(driver_id=code, constructor=team, season_id='2025')
+        self.alice = User.objects.create_user(username='alice', password='pw')
+        self.group = Group.objects.create(name='paddock', owner=self.alice)
+        BetStat.objects.create(group=self.group, user=self.alice)
+        self.client.force_authenticate(user=self.alice)
+
+    def test_roster_hits_without_queries(self):
+        resolve_drivers([])  # build the roster from the season snapshot
+        with self.assertNumQueries(0):
+            found = resolve_drivers(['Norris', 'leclerc', None, ''])
+        self.assertEqual(found['Norris'], {'driver_id': 'norris', 'name': 'Norris NORRIS'})
+        self.assertEqual(set(found), {'Norris', 'leclerc'})
+
+        # codes outside the current roster: one query for all of them
+        with self.assertNumQueries(1):
+            found = resolve_drivers(['STROLL', 'unknown', 'albon'])
+        self.assertEqual(found['STROLL']['driver_id'], 'stroll')
+        self.assertEqual(set(found), {'STROLL', 'albon'})
+
+    def test_set_and_update_bet(self):
+        response = self.client.post(reverse('betting:set_bet'), {
+            'group': 'paddock', 'race': '2025-03-16', 'bet_top_3': ['Stroll', 'ALBON', 'ocon'],
+            'bet_last_5': 'Gasly', 'bet_fastest_lap': 'NORRIS',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        bet = response.json()['bet']
+        self.assertEqual(bet['bet_top_3'], ['stroll', 'albon', 'ocon'])
+        self.assertEqual((bet['bet_last_5'], bet['bet_fastest_lap']), ('gasly', 'norris'))
+
+        response = self.client.put(reverse('betting:update_bet', args=['2025-03-16']), {
+            'race': '2025-03-16', 'group': 'paddock', 'bet_top_3': ['VERSTAPPEN', 'norris', 'nobody'],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nobody', response.json()['error'])
+
+
+class BetWriteTestCase(BettingDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_race_data()
+        self.alice = User.objects.create_user(username='alice', password='pw')
+        self.group = Group.objects.create(name='paddock', owner=self.alice)
+        BetStat.objects.create(group=self.group, user=self.alice)
+        self.client.force_authenticate(user=self.alice)
+        resolve_drivers([])
+
+    def place(self, top3):
+        return self.client.post(reverse('betting:set_bet'), {
+            'group': 'paddock', 'race': '2025-03-16', 'bet_top_3': top3, 'bet_last_5': 'gasly',
+        }, format='json')
+
+    def test_single_validation_pass_and_bulk_insert(self):
+        # race, group, duplicate check, one code lookup (no current roster here),
+        # bet insert and one top-3 insert inside a savepoint
+        with self.assertNumQueries(8):
+            response = self.place(['stroll', 'albon', 'ocon'])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['bet']['bet_top_3'], ['stroll', 'albon', 'ocon'])
+        self.assertEqual(list(BetTop3.objects.values_list('driver_id', flat=True)), ['stroll', 'albon', 'ocon'])
+
+    def test_invalid_codes_write_nothing(self):
+        response = self.place(['stroll', 'nobody', 'ocon'])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Bet.objects.exists())
+
+        self.place(['stroll', 'albon', 'ocon'])
+        response = self.client.put(reverse('betting:update_bet', args=['2025-03-16']), {
+            'race': '2025-03-16', 'group': 'paddock', 'bet_top_3': ['norris', 'nobody'], 'bet_last_5': 'ocon',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        bet = Bet.objects.get()
+        self.assertEqual(bet.bet_last_5_id, 'gasly')
+        self.assertEqual(list(bet.bettop3_set.values_list('driver_id', flat=True)), ['stroll', 'albon', 'ocon'])
+
+        response = self.client.put(reverse('betting:update_bet', args=['2025-03-16']), {
+            'race': '2025-03-16', 'group': 'paddock', 'bet_top_3': ['norris', 'leclerc', 'albon'],
+        }, format='json')
+        self.assertEqual(response.json()['bet']['bet_top_3'], ['norris', 'leclerc', 'albon'])
+        self.assertEqual(list(bet.bettop3_set.values_list('driver_id', flat=True)), ['norris', 'leclerc', 'albon'])
+
+
+class LeaderboardTestCase(BettingDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_race_data()
+        self.alice, self.bob, self.carol = (
+            User.objects.create_user(username=name, password='pw') for name in ('alice', 'bob', 'carol')
+        )
+        self.group = Group.objects.create(name='paddock', owner=self.alice)
+        for user in (self.alice, self.bob, self.carol):
+            BetStat.objects.create(group=self.group, user=user)
+        self.client.force_authenticate(user=self.carol)
+
+    def group_info(self):
+        return self.client.post(reverse('betting:get_group_info'), {'group_name': 'paddock'}, format='json').json()
+
+    def test_ranks_tie_breaks_and_deltas(self):
+        # alice and carol: exact podium (5 points); bob: 5 points without it
+        self.create_bet(self.carol, self.group, ['stroll', 'albon', 'ocon'])
+        self.create_bet(self.alice, self.group, ['stroll', 'albon', 'ocon'])
+        self.create_bet(self.bob, self.group, ['albon', 'stroll', 'ocon'], last5='stroll')
+        BetStat.objects.filter(user=self.bob).update(points=1)  # from an earlier race
+
+        call_command('evaluate_bets', stdout=StringIO())
+
+        info = self.group_info()
+        self.assertEqual([(row['user'], row['rank'], row['points']) for row in info['bet_stats']],
+                         [('bob', 1, 6), ('carol', 2, 5), ('alice', 3, 5)])
+        # before: bob 1st, carol and alice tied 2nd
+        self.assertEqual([row['rank_change'] for row in info['bet_stats']], [0, 0, -1])
+        self.assertEqual([row['last_race'] for row in info['bet_stats']], [5, 5, 5])
+        self.assertEqual(info['me']['rank'], 2)
+        self.assertEqual(info['leaderboard_version'], 1)
+
+        # a late joiner ranks last with no delta and invalidates the snapshot
+        dave = User.objects.create_user(username='dave', password='pw')
+        self.client.force_authenticate(user=dave)
+        self.client.post(reverse('betting:join_group'), {'group_name': 'paddock'}, format='json')
+        info = self.group_info()
+        self.assertEqual(info['me'], info['bet_stats'][3])
+        self.assertIsNone(info['me']['rank_change'])
+
+    def test_snapshot_is_cached_per_version(self):
+        self.client.post(reverse('betting:get_group_info'), {'group_name': 'paddock'}, format='json')
+        group = Group.objects.get(pk=self.group.pk)
+        with self.assertNumQueries(0):
+            snapshot = leaderboard.get_leaderboard(group)
+        self.assertEqual(leaderboard.my_rank(snapshot, self.carol)['user'], 'carol')
+
+        self.create_bet(self.bob, self.group, ['stroll', 'albon', 'ocon'])
+        call_command('evaluate_bets', stdout=StringIO())
+        response = self.client.post(reverse('betting:get_evaluated_bets'), {'group': 'paddock'}, format='json')
+        self.assertEqual(response.json()['standings'][0]['user'], 'bob')
+        self.assertEqual(response.json()['standings'][0]['rank_change'], 0)
+        self.assertEqual(response.json()['me']['rank'], 2)
+
+    def test_rebuild(self):
+        self.create_bet(self.bob, self.group, ['stroll', 'albon', 'ocon'])
+        call_command('evaluate_bets', stdout=StringIO())
+        BetStat.objects.update(points=0, exact_podiums=0, first_bet_at=None)
+
+        call_command('evaluate_bets', '--rebuild-leaderboards', stdout=StringIO())
+
+        stat = BetStat.objects.get(user=self.bob)
+        self.assertEqual((stat.points, stat.exact_podiums), (5, 1))
+        self.assertIsNotNone(stat.first_bet_at)
+
+
+class LeaderboardMigrationTestCase(BettingDataMixin, TransactionTestCase):
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        return executor.loader.project_state([target]).apps
+
+    def test_backfills_tie_breaks(self):
+        apps = self.migrate(('betting', '0005_history_index'))
+        self.addCleanup(self.migrate, ('betting', '0006_leaderboard'))
+        Group, Bet, BetTop3, BetStat = (
+            apps.get_model('betting', name) for name in ('Group', 'Bet', 'BetTop3', 'BetStat')
+        )
+
+        self.create_race_data()
+        alice = User.objects.create_user(username='alice', password='pw')
+        group = Group.objects.create(name='paddock', owner_id=alice.id)
+        BetStat.objects.create(group=group, user_id=alice.id, points=7)
+        for race, top3 in ((self.prev_race, DRIVERS[:3]), (self.race, ['stroll', 'albon', 'ocon'])):
+            bet = Bet.objects.create(group=group, user_id=alice.id, race_id=race.date, evaluated=True, points_awarded=5)
+            for pos, code in enumerate(top3, start=1):
+                BetTop3.objects.create(bet=bet, driver_id=code, position=pos)
+
+        apps = self.migrate(('betting', '0006_leaderboard'))
+
+        stat = apps.get_model('betting', 'BetStat').objects.get()
+        self.assertEqual((stat.points, stat.exact_podiums), (7, 2))
+        self.assertEqual(stat.first_bet_at, Bet.objects.order_by('bet_date').first().bet_date)
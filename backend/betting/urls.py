@@ -16,6 +16,7 @@ from .views import (
     get_evaluated_bets,
     get_bet_info
 )
+from . import async_views
 
 urlpatterns = [
     path('groups/create/', create_group, name='create_group'),
@@ -37,4 +38,8 @@ urlpatterns = [
          name='get_last_5_drivers_before'),
     path('bets/standings/bottom5-after-choice/', get_last_5_drivers,
          name='get_last_5_drivers'),
+
+    # async variants (ASGI)
+    path('async/groups/getallgroups/', async_views.get_all_groups, name='async_get_all_groups'),
+    path('async/bets/info/', async_views.get_bet_info, name='async_get_bet_info'),
 ]
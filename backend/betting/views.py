@@ -10,11 +10,17 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_yasg import openapi
 
+from . import leaderboard
 from .models import Group, Bet, BetStat, BetTop3
-from catalog.models import Race, Driver, Driverstanding, Season, Result, DriverTeam
+from catalog.models import Race, Driverstanding, Result, RaceOutcome
+from catalog.current_season import get_current_season
+from catalog.driver_codes import resolve_drivers
 import json
 from datetime import date, datetime
-from django.http import JsonResponse
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view
 
 
@@ -92,6 +98,8 @@ def join_group(request):
 
     user = request.user
     _, created = BetStat.objects.get_or_create(user=user, group=group)
+    if created:
+        leaderboard.bump_version([group.id])
 
     return Response({'status': 'joined group successfully'})
 
@@ -122,7 +130,8 @@ def leave_group(request):
     except Group.DoesNotExist:
         return Response({'status': 'group not found'}, status=404)
     try:
-        BetStat.objects.filter(user=request.user, group=group).delete()
+        if BetStat.objects.filter(user=request.user, group=group).delete()[0]:
+            leaderboard.bump_version([group.id])
     except BetStat.DoesNotExist:
         return Response({'status': 'user is not in any group'}, status=400)
 
@@ -132,6 +141,12 @@ def leave_group(request):
 @swagger_auto_schema(
     method='get',
     operation_summary="Get all betting groups",
+    manual_parameters=[
+        openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          description='next_cursor of the previous page'),
+        openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                          description='Page size (optional, all groups when omitted)'),
+    ],
     responses={
         200: openapi.Response(
             description="List of groups",
@@ -151,7 +166,8 @@ def leave_group(request):
                                 'members':    openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING)),
                             }
                         )
-                    )
+                    ),
+                    'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, x_nullable=True),
                 }
             )
         )
@@ -159,20 +175,89 @@ def leave_group(request):
 )
 @api_view(['GET'])
 def get_all_groups(request):
-    groups = Group.objects.all()
-    group_list = []
-    for group in groups:
-        group_list.append({
-            'group_id': group.id,
-            'group_name': group.name,
-            'owner': group.owner.username,
-            'created_at': group.created_at.isoformat(),
-            'members': [
-                bs.user.username for bs in BetStat.objects.filter(group=group)
-            ]
+    """
+    Streams groups as JSON in keyset pages (constant queries per page, flat memory).
+    Optional query params:
+      - cursor: return groups after this cursor (next_cursor of the previous page)
+      - limit:  at most this many groups; next_cursor is null on the last page
+    """
+    try:
+        after, limit = group_page_params(request)
+    except ValueError as exc:
+        return Response({'status': str(exc)}, status=400)
+
+    response = StreamingHttpResponse(_stream_groups(after, limit), content_type='application/json')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+# groups per query while streaming
+GROUP_PAGE_SIZE = 500
+MAX_GROUP_LIMIT = 1000
+
+
+def group_page_params(request):
+    """(cursor, limit) from the query string; raises ValueError with a message."""
+    try:
+        after = int(request.GET.get('cursor') or 0)
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    except ValueError:
+        raise ValueError('cursor and limit must be integers')
+    if limit is not None and not 0 < limit <= MAX_GROUP_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_GROUP_LIMIT}')
+    return after, limit
+
+
+def group_pages(after=0, limit=None):
+    """
+    Groups ordered by id in pages of GROUP_PAGE_SIZE, owner joined and members
+    prefetched: two queries per page however many members a group has.
+    """
+    members = Prefetch('betstats', queryset=BetStat.objects.select_related('user').order_by('pk'))
+    while limit is None or limit > 0:
+        size = GROUP_PAGE_SIZE if limit is None else min(GROUP_PAGE_SIZE, limit)
+        page = list(
+            Group.objects
+            .filter(id__gt=after)
+            .select_related('owner')
+            .prefetch_related(members)
+            .order_by('id')[:size]
+        )
+        if page:
+            yield page
+        if len(page) < size:
+            return
+        after = page[-1].id
+        if limit is not None:
+            limit -= len(page)
+
+
+def group_entry(group):
+    return {
+        'group_id': group.id,
+        'group_name': group.name,
+        'owner': group.owner.username,
+        'created_at': group.created_at.isoformat(),
+        'members': [bs.user.username for bs in group.betstats.all()],
+    }
+
+
+def next_group_cursor(last_id, count, limit):
+    """Cursor for the next page, None when this was the last one."""
+    if limit is None or count < limit or not Group.objects.filter(id__gt=last_id).exists():
+        return None
+    return str(last_id)
+
 
-        })
-    return Response({'status': 'success', 'groups': group_list})
+def _stream_groups(after, limit):
+    yield '{"status": "success", "groups": ['
+    count, last_id = 0, after
+    for page in group_pages(after, limit):
+        for group in page:
+            yield (',' if count else '') + json.dumps(group_entry(group))
+            count += 1
+        last_id = page[-1].id
+    yield f'], "next_cursor": {json.dumps(next_group_cursor(last_id, count, limit))}}}'
 
 
 @swagger_auto_schema(
@@ -321,41 +406,40 @@ def set_bet(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # 4) Fahrer-Lookup-Helper
-    def get_driver(code):
-        return Driver.objects.filter(driver__iexact=code).first() if code else None
-
-    # 5) Bet anlegen (ohne Top-3)
-    bet = Bet.objects.create(
-        user=user,
-        group=group,
-        race=race,
-        bet_last_5      = get_driver(data.get("bet_last_5")),
-        bet_last_10     = get_driver(data.get("bet_last_10")),
-        bet_fastest_lap = get_driver(data.get("bet_fastest_lap")),
-    )
-
-    # 6) Top-3 über Through-Model
+    # 4) Alle Fahrer-Codes der Wette in einem Durchgang auflösen
     top3_codes = data.get("bet_top_3", [])
-    not_found   = []
-    for idx, code in enumerate(top3_codes, start=1):
-        driver = get_driver(code)
-        if not driver:
-            not_found.append(code)
-        else:
-            BetTop3.objects.create(bet=bet, driver=driver, position=idx)
+    drivers = resolve_drivers([data.get("bet_last_5"), data.get("bet_last_10"), data.get("bet_fastest_lap"),
+                               *top3_codes])
 
+    def get_driver(code):
+        entry = drivers.get(str(code)) if code else None
+        return entry['driver_id'] if entry else None
+
+    # 5) Alles prüfen, bevor geschrieben wird
+    ordered_top3 = [get_driver(code) for code in top3_codes]
+    not_found = [code for code, driver in zip(top3_codes, ordered_top3) if not driver]
     if not_found:
-        BetTop3.objects.filter(bet=bet).delete()
-        bet.delete()
         return JsonResponse(
             {"error": f"Drivers not found for bet_top_3: {not_found}"},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # 7) Antwort mit exakter Reihenfolge
-    ordered_top3 = [bt3.driver.driver for bt3 in bet.bettop3_set.all()]
+    # 6) Bet und Top-3 (Through-Model) in einer Transaktion anlegen
+    with transaction.atomic():
+        bet = Bet.objects.create(
+            user=user,
+            group=group,
+            race=race,
+            bet_last_5_id      = get_driver(data.get("bet_last_5")),
+            bet_last_10_id     = get_driver(data.get("bet_last_10")),
+            bet_fastest_lap_id = get_driver(data.get("bet_fastest_lap")),
+        )
+        BetTop3.objects.bulk_create(
+            BetTop3(bet=bet, driver_id=driver, position=idx)
+            for idx, driver in enumerate(ordered_top3, start=1)
+        )
 
+    # 7) Antwort aus den geprüften Eingaben, in exakter Reihenfolge
     return JsonResponse({
         "message": "Bet created successfully",
         "bet": {
@@ -364,9 +448,9 @@ def set_bet(request):
             "group":           group.name,
             "race":            race_str,
             "bet_top_3":       ordered_top3,
-            "bet_last_5":      bet.bet_last_5.driver      if bet.bet_last_5      else None,
-            "bet_last_10":     bet.bet_last_10.driver     if bet.bet_last_10     else None,
-            "bet_fastest_lap": bet.bet_fastest_lap.driver if bet.bet_fastest_lap else None,
+            "bet_last_5":      bet.bet_last_5_id,
+            "bet_last_10":     bet.bet_last_10_id,
+            "bet_fastest_lap": bet.bet_fastest_lap_id,
             "bet_date":        bet.bet_date.isoformat(),
         }
     }, status=status.HTTP_201_CREATED)
@@ -709,46 +793,46 @@ def update_bet(request, race_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    # 5) Fahrer‐Lookup‐Helper
-    def get_driver(code):
-        if not code:
-            return None
-        return Driver.objects.filter(driver__iexact=code).first()
-
-    # 6) FK‐Felder updaten
-    if "bet_last_5" in data:
-        bet.bet_last_5 = get_driver(data["bet_last_5"])
-    if "bet_last_10" in data:
-        bet.bet_last_10 = get_driver(data["bet_last_10"])
-    if "bet_fastest_lap" in data:
-        bet.bet_fastest_lap = get_driver(data["bet_fastest_lap"])
-
-    # 7) Erst speichern, dann die Top-3 via through-Model setzen
-    bet.save()
-
+    # 5) Alle Fahrer-Codes der Änderung in einem Durchgang auflösen
     top3_codes = data.get("bet_top_3")
-    if top3_codes is not None:
-        # Lösche vorhandene Einträge
-        BetTop3.objects.filter(bet=bet).delete()
+    drivers = resolve_drivers([data.get("bet_last_5"), data.get("bet_last_10"), data.get("bet_fastest_lap"),
+                               *(top3_codes or [])])
 
-        not_found = []
-        for idx, code in enumerate(top3_codes, start=1):
-            driver = get_driver(code)
-            if not driver:
-                not_found.append(code)
-            else:
-                BetTop3.objects.create(bet=bet, driver=driver, position=idx)
+    def get_driver(code):
+        entry = drivers.get(str(code)) if code else None
+        return entry['driver_id'] if entry else None
 
+    # 6) Top-3 prüfen, bevor geschrieben wird
+    if top3_codes is not None:
+        ordered_top3 = [get_driver(code) for code in top3_codes]
+        not_found = [code for code, driver in zip(top3_codes, ordered_top3) if not driver]
         if not_found:
-            # Rollback bei ungültigen Codes
-            BetTop3.objects.filter(bet=bet).delete()
             return JsonResponse(
                 {"error": f"Drivers not found for bet_top_3: {not_found}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    # 8) Response: Top-3 in stored order (via BetTop3.Meta.ordering)
-    ordered_top3 = [bt3.driver.driver for bt3 in BetTop3.objects.filter(bet=bet)]
+    # 7) FK‐Felder updaten
+    if "bet_last_5" in data:
+        bet.bet_last_5_id = get_driver(data["bet_last_5"])
+    if "bet_last_10" in data:
+        bet.bet_last_10_id = get_driver(data["bet_last_10"])
+    if "bet_fastest_lap" in data:
+        bet.bet_fastest_lap_id = get_driver(data["bet_fastest_lap"])
+
+    # 8) Bet speichern und Top-3 via through-Model ersetzen – in einer Transaktion
+    with transaction.atomic():
+        bet.save()
+        if top3_codes is not None:
+            BetTop3.objects.filter(bet=bet).delete()
+            BetTop3.objects.bulk_create(
+                BetTop3(bet=bet, driver_id=driver, position=idx)
+                for idx, driver in enumerate(ordered_top3, start=1)
+            )
+
+    # 9) Response: Top-3 aus der Eingabe, sonst in gespeicherter Reihenfolge (BetTop3.Meta.ordering)
+    if top3_codes is None:
+        ordered_top3 = list(BetTop3.objects.filter(bet=bet).values_list('driver_id', flat=True))
 
     return JsonResponse({
         "message": "Bet updated successfully",
@@ -758,9 +842,9 @@ def update_bet(request, race_id):
             "group": bet.group.id,
             "race": race_id,
             "bet_top_3": ordered_top3,
-            "bet_last_5": bet.bet_last_5.driver if bet.bet_last_5 else None,
-            "bet_last_10": bet.bet_last_10.driver if bet.bet_last_10 else None,
-            "bet_fastest_lap": bet.bet_fastest_lap.driver if bet.bet_fastest_lap else None,
+            "bet_last_5": bet.bet_last_5_id,
+            "bet_last_10": bet.bet_last_10_id,
+            "bet_fastest_lap": bet.bet_fastest_lap_id,
             "bet_date": bet.bet_date.isoformat(),
         }
     }, status=status.HTTP_200_OK)
@@ -813,44 +897,26 @@ def get_bet_info(request):
         return JsonResponse({'error': 'No previous race available.'}, status=404)
 
     # 3) Current-season drivers for Top-3 & Fastest-lap
-    seasons = Season.objects.values_list('season', flat=True)
-    years = [int(s) for s in seasons if s.isdigit()]
-    if not years:
+    current = get_current_season()
+    if not current:
         return JsonResponse({'error': 'No seasons defined.'}, status=500)
-    max_year = max(years)
-    latest_season = Season.objects.get(season=str(max_year))
-    driver_teams = DriverTeam.objects.filter(season=latest_season).select_related('driver')
     drivers = [
-        {'driver_id': dt.driver.driver, 'name': f'{dt.driver.forename} {dt.driver.surname}'}
-        for dt in driver_teams
+        {'driver_id': d['driver_id'], 'name': f"{d['forename']} {d['surname']}"}
+        for d in current['drivers']
     ]
 
-    # 4) Compute bottom-5 and 6–10 from the previous race
-    prev_results = Result.objects.filter(date=prev_race)
-    numeric_prev = []
-    for r in prev_results:
-        try:
-            pos = int(r.position)
-        except (ValueError, TypeError):
-            continue
-        numeric_prev.append((pos, r.driver.driver))
-    # sort descending (worst finishers first)
-    numeric_prev.sort(key=lambda x: x[0], reverse=True)
-
-    last5_codes = [code for _, code in numeric_prev[:5]]
-    mid5_codes = [code for _, code in numeric_prev[5:10]]
-
-    # 5) Map driver codes to full details
+    # 4) Bottom-5 and 6–10 from the previous race (worst finishers first)
+    prev_outcome = RaceOutcome.objects.filter(race=prev_race).first()
+    bottom_10 = prev_outcome.bottom_10 if prev_outcome else []
+
+    last5_codes = bottom_10[:5]
+    mid5_codes = bottom_10[5:10]
+
+    # 5) Map driver codes to full details (one pass, unknown codes in one query)
+    names = resolve_drivers(bottom_10)
+
     def map_codes(codes):
-        result = []
-        for code in codes:
-            d = Driver.objects.filter(driver=code).first()
-            if d:
-                result.append({
-                    'driver_id': d.driver,
-                    'name': f'{d.forename} {d.surname}'
-                })
-        return result
+        return [names[code] for code in codes if code in names]
 
     data = {
         'race': race_date,
@@ -876,26 +942,8 @@ def get_last_5_drivers_before(request):
     if not last_race:
         return JsonResponse({"error": "No completed races found."}, status=404)
 
-    drivers = (
-        Result.objects
-        .filter(date=last_race)
-        .exclude(position__in=["", "\\N"])
-        .extra(select={'pos_int': "CAST(position AS INTEGER)"})
-        .order_by('-pos_int')[5:10]
-    )
-
-    data = [
-        {
-            "driver": res.driver.driver,
-            "forename": res.driver.forename,
-            "surname": res.driver.surname,
-            "constructor": res.constructor.name,
-            "position": res.position,
-            "points": res.points
-        }
-        for res in reversed(drivers)  # optional: kleinste Position zuerst
-    ]
-    return JsonResponse(data, safe=False)
+    # 6th to 10th worst finisher, best position first
+    return JsonResponse(_bottom_drivers(last_race, 5, 10), safe=False)
 
 
 @swagger_auto_schema(
@@ -912,15 +960,25 @@ def get_last_5_drivers(request):
     if not last_race:
         return JsonResponse({"error": "No completed races found."}, status=404)
 
-    drivers = (
-        Result.objects
-        .filter(date=last_race)
-        .extra(select={'pos_int': "CAST(position AS INTEGER)"})
-        .exclude(position__in=["", "\\N"])
-        .order_by('-pos_int')[:5]
-    )
+    # 5 worst finishers, best position first
+    return JsonResponse(_bottom_drivers(last_race, 0, 5), safe=False)
+
 
-    data = [
+def _bottom_drivers(race, start, stop):
+    """
+    Result details for a slice of the race's precomputed bottom 10
+    (worst finisher = index 0), returned best position first.
+    """
+    outcome = RaceOutcome.objects.filter(race=race).first()
+    codes = outcome.bottom_10[start:stop][::-1] if outcome else []
+
+    results = {
+        res.driver_id: res
+        for res in Result.objects
+            .filter(date=race, driver_id__in=codes)
+            .select_related('driver', 'constructor')
+    }
+    return [
         {
             "driver": res.driver.driver,
             "forename": res.driver.forename,
@@ -929,9 +987,8 @@ def get_last_5_drivers(request):
             "position": res.position,
             "points": res.points
         }
-        for res in reversed(drivers)
+        for res in (results[code] for code in codes if code in results)
     ]
-    return JsonResponse(data, safe=False)
 
 
 @swagger_auto_schema(
@@ -957,18 +1014,16 @@ def get_group_info(request):
     if not group_name:
         return Response({'status': 'missing group_id'}, status=400)
     try:
-        group = Group.objects.get(name=group_name)
-        bet_stats  = BetStat.objects.filter(group=group)
+        group = Group.objects.select_related('owner').get(name=group_name)
+        standings = leaderboard.get_leaderboard(group)
         group_info = {
             'group_id': group.id,
             'group_name': group.name,
             'owner': group.owner.username,
-            'bet_stats': [
-                {
-                    'user': bs.user.username,
-                    'points': bs.points
-                } for bs in bet_stats
-            ]
+            'leaderboard_version': standings['version'],
+            # ranked: points, then exact podium hits, then earliest bet
+            'bet_stats': standings['rows'],
+            'me': leaderboard.my_rank(standings, request.user),
         }
         return Response(group_info)
 
@@ -976,17 +1031,56 @@ def get_group_info(request):
         return Response({'status': 'group not found'}, status=404)
 
 
+MAX_BET_LIMIT = 500
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError('Invalid date format, expected YYYY-MM-DD.')
+
+
+def _parse_limit(value):
+    if not value:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+
+
+def _parse_bet_cursor(value):
+    """'<race date>:<bet id>' -> (date, id)"""
+    if not value:
+        return None
+    race, _, bet_id = str(value).partition(':')
+    try:
+        return _parse_date(race), int(bet_id)
+    except ValueError:
+        raise ValueError('Invalid cursor.')
+
+
 @swagger_auto_schema(
     method='post',
     operation_summary="Get evaluated bets and user points",
     request_body=openapi.Schema(
         type=openapi.TYPE_OBJECT,
         required=['group'],
-        properties={'group': openapi.Schema(type=openapi.TYPE_STRING)},
+        properties={
+            'group':  openapi.Schema(type=openapi.TYPE_STRING),
+            'race':   openapi.Schema(type=openapi.TYPE_STRING, description='Only this race (YYYY-MM-DD)'),
+            'user':   openapi.Schema(type=openapi.TYPE_STRING, description='Only this username'),
+            'limit':  openapi.Schema(type=openapi.TYPE_INTEGER,
+                                     description=f'Page size (optional, max {MAX_BET_LIMIT}; all bets when omitted)'),
+            'cursor': openapi.Schema(type=openapi.TYPE_STRING, description='next_cursor of the previous page'),
+        },
     ),
     responses={
         200: openapi.Response('Evaluated bets and standings'),
-        400: openapi.Response('Missing group'),
+        400: openapi.Response('Missing group or invalid filter'),
         404: openapi.Response('Group not found'),
     }
 )
@@ -995,11 +1089,15 @@ def get_group_info(request):
 def get_evaluated_bets(request):
     """
     For a given group, returns:
-      - bets: each evaluated bet, the points earned, and the user's predictions
-      - standings: cumulative points per user in that group
+      - bets: each evaluated bet, the points earned, and the user's predictions,
+        ordered by race date and bet id
+      - standings: the group's leaderboard (rank, points, tie-breaks, last-race delta)
+      - me: the requesting user's leaderboard row (None if not a member)
+      - next_cursor: pass as "cursor" to get the next page (None on the last one)
 
     Request JSON:
-      { "group": "<unique group name>" }
+      { "group": "<unique group name>", "race": "YYYY-MM-DD", "user": "<username>",
+        "limit": 50, "cursor": "<next_cursor>" }   (all but group optional)
     """
     group_name = request.data.get('group')
     if not group_name:
@@ -1008,6 +1106,15 @@ def get_evaluated_bets(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    try:
+        race = _parse_date(request.data.get('race'))
+        cursor = _parse_bet_cursor(request.data.get('cursor'))
+        limit = _parse_limit(request.data.get('limit'))
+        if limit is not None and not 0 < limit <= MAX_BET_LIMIT:
+            raise ValueError(f'limit must be between 1 and {MAX_BET_LIMIT}')
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
     # 1) Lookup group
     try:
         group = Group.objects.get(name=group_name)
@@ -1017,40 +1124,57 @@ def get_evaluated_bets(request):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    # 2) Fetch all evaluated bets for the group
-    evaluated_bets = (
-        Bet.objects
-           .filter(group=group, evaluated=True)
-           .select_related('user', 'race',
-                           'bet_last_5', 'bet_last_10', 'bet_fastest_lap')
-           .order_by('race__date', 'user__username')
+    # 2) One page of evaluated bets, keyset on (race date, bet id); driver ids read raw
+    bets = Bet.objects.filter(group=group, evaluated=True)
+    if race:
+        bets = bets.filter(race_id=race)
+    if request.data.get('user'):
+        bets = bets.filter(user__username=request.data['user'])
+    if cursor:
+        after_race, after_id = cursor
+        bets = bets.filter(Q(race_id__gt=after_race) | Q(race_id=after_race, id__gt=after_id))
+    bets = list(
+        bets
+        .order_by('race_id', 'id')
+        .values('id', 'race_id', 'user__username', 'points_awarded',
+                'bet_last_5_id', 'bet_last_10_id', 'bet_fastest_lap_id')
+        [:limit + 1 if limit is not None else None]
     )
-
-    bets_data = []
-    for bet in evaluated_bets:
-        # Top-3 from the through-model (ordered by position)
-        top3 = [
-            bt3.driver.driver
-            for bt3 in BetTop3.objects.filter(bet=bet).order_by('position')
-        ]
-        bets_data.append({
-            'user':            bet.user.username,
-            'race':            bet.race.date.isoformat(),
-            'points':          bet.points_awarded,
-            'bet_top_3':       top3,
-            'bet_last_5':      bet.bet_last_5.driver      if bet.bet_last_5      else None,
-            'bet_last_10':     bet.bet_last_10.driver     if bet.bet_last_10     else None,
-            'bet_fastest_lap': bet.bet_fastest_lap.driver if bet.bet_fastest_lap else None,
-        })
-
-    # 3) Fetch cumulative standings
-    stats = BetStat.objects.filter(group=group).select_related('user')
-    standings_data = [
-        {'user': stat.user.username, 'points': stat.points}
-        for stat in stats
+    next_cursor = None
+    if limit is not None and len(bets) > limit:
+        bets = bets[:limit]
+        next_cursor = f"{bets[-1]['race_id'].isoformat()}:{bets[-1]['id']}"
+
+    # 3) Top-3 picks of all bets on the page in one query
+    top3 = defaultdict(list)
+    for bet_id, driver_id in (
+        BetTop3.objects
+        .filter(bet_id__in=[bet['id'] for bet in bets])
+        .order_by('bet_id', 'position')
+        .values_list('bet_id', 'driver_id')
+    ):
+        top3[bet_id].append(driver_id)
+
+    bets_data = [
+        {
+            'user':            bet['user__username'],
+            'race':            bet['race_id'].isoformat(),
+            'points':          bet['points_awarded'],
+            'bet_top_3':       top3[bet['id']],
+            'bet_last_5':      bet['bet_last_5_id'],
+            'bet_last_10':     bet['bet_last_10_id'],
+            'bet_fastest_lap': bet['bet_fastest_lap_id'],
+        }
+        for bet in bets
     ]
 
+    # 4) Ranked standings from the group's cached leaderboard
+    standings = leaderboard.get_leaderboard(group)
+
     return JsonResponse({
-        'bets':      bets_data,
-        'standings': standings_data,
+        'bets':        bets_data,
+        'standings':   standings['rows'],
+        'me':          leaderboard.my_rank(standings, request.user),
+        'next_cursor': next_cursor,
     }, safe=False)
+
@@ -0,0 +1,85 @@
+"""
+Async Varianten der lesenden Catalog-Endpunkte (unter api/catalog/async/...).
+
+Gleiche Parameter und Antworten wie die DRF-Views in views.py, aber als
+einfache Django-async-Views: unter ASGI (uvicorn/daphne) bedient die
+Event-Loop andere Requests, während eine Abfrage läuft. Die Abfragen eines
+Requests laufen nacheinander – das async ORM führt sie ohnehin im
+Sync-Thread des Requests aus.
+"""
+from django.db.models import F
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from catalog.career import career_or_zero
+from catalog.current_season import aget_current_season
+from catalog.models import Season, Driver, Constructor, Driverstanding, Constructorstanding
+from catalog.response_cache import cached_response, request_params
+from catalog.views import driver_detail, team_detail, driver_standing, team_standing
+
+
+async def _none_if_missing(query):
+    try:
+        return await query
+    except (Driver.DoesNotExist, Constructor.DoesNotExist):
+        return None
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+@cached_response
+async def detailed_driver_view(request):
+    driver_id = request_params(request).get('driver_id')
+    if not driver_id:
+        return JsonResponse({'error': 'Bitte driver_id im Request-Body mitgeben.'}, status=400)
+
+    driver = await _none_if_missing(Driver.objects.select_related('career_stats').aget(pk=driver_id))
+    if driver is None:
+        return JsonResponse({'error': f'Kein Fahrer mit der ID "{driver_id}" gefunden.'}, status=404)
+    current = await aget_current_season()
+
+    return JsonResponse({'driver': driver_detail(driver, career_or_zero(driver), current)})
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+@cached_response
+async def detailed_team_view(request):
+    team_id = request_params(request).get('team_id')
+    if not team_id:
+        return JsonResponse({'error': 'Bitte team_id im Request-Body mitgeben.'}, status=400)
+
+    team = await _none_if_missing(Constructor.objects.select_related('career_stats').aget(pk=team_id))
+    if team is None:
+        return JsonResponse({'error': f'Kein Team mit der ID "{team_id}" gefunden.'}, status=404)
+    current = await aget_current_season()
+    if not current:
+        return JsonResponse({'error': 'Keine Saison-Daten gefunden.'}, status=404)
+
+    return JsonResponse(team_detail(team, career_or_zero(team), current))
+
+
+async def _standings(request, queryset, row):
+    year = request_params(request).get('year')
+    if not year:
+        return JsonResponse({"error": "Missing required field: year"}, status=400)
+
+    if not await Season.objects.filter(season=str(year)).aexists():
+        return JsonResponse({"error": f"No data for season {year}"}, status=404)
+    standings = queryset.filter(season_id=str(year)).order_by(F('position_num').asc(nulls_last=True))
+    return JsonResponse([row(s) async for s in standings], safe=False)
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+@cached_response
+async def insight_driver_standings(request):
+    return await _standings(request, Driverstanding.objects.select_related('driver', 'constructor'), driver_standing)
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+@cached_response
+async def insight_team_standings(request):
+    return await _standings(request, Constructorstanding.objects.select_related('constructor'), team_standing)
@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from catalog.models import Result
+from catalog import stats
+
+CACHE_PREFIX = 'catalog:boxplot'
+# Abgeschlossene Saisons ändern sich nicht mehr
+CACHE_TIMEOUT = 24 * 60 * 60
+# Platzhalter für "keine Ergebnisse in dieser Saison" (None wäre vom Cache-Fehltreffer nicht zu unterscheiden)
+EMPTY = 'empty'
+
+
+def box_plots(field, entity_id, years, current, limit=None):
+    """
+    Box-Plots je Saison für einen Fahrer (field='driver') oder ein Team (field='constructor').
+
+    years:   Jahreszahlen (int) in gewünschter Reihenfolge
+    current: Schnappschuss der aktuellen Saison – deren Einträge hängen am Datenstand
+    limit:   höchstens so viele Saisons mit Ergebnissen zurückgeben
+    """
+    return box_plots_many(field, [entity_id], years, current, limit)[entity_id]
+
+
+def box_plots_many(field, entity_ids, years, current, limit=None):
+    """
+    Wie box_plots, für mehrere Fahrer/Teams auf einmal (entity_id -> Box-Plots).
+
+    Fehlende Einträge werden mit einer einzigen Abfrage nachgeladen und je
+    Fahrer/Team und Saison im Cache abgelegt.
+    """
+    def key(entity_id, year):
+        version = f":{current['etag']}" if str(year) == current['season'] else ''
+        return f'{CACHE_PREFIX}:{field}:{entity_id}:{year}{version}'
+
+    keys = {(entity_id, year): key(entity_id, year) for entity_id in entity_ids for year in years}
+    cached = cache.get_many(keys.values())
+    missing = [pair for pair, k in keys.items() if k not in cached]
+
+    if missing:
+        positions = defaultdict(list)
+        for entity_id, season, position in (
+            Result.objects
+            .filter(**{f'{field}__in': {entity_id for entity_id, _ in missing}},
+                    date__season__in={str(year) for _, year in missing}, position_num__isnull=False)
+            .order_by('date', 'driver')
+            .values_list(field, 'date__season_id', 'position_num')
+        ):
+            positions[(entity_id, int(season))].append(position)
+
+        # Quartile aller nachgeladenen Reihen in einem Durchgang
+        filled = [pair for pair in missing if positions[pair]]
+        fresh = {keys[pair]: EMPTY for pair in missing}
+        for pair, box in zip(filled, stats.box_plots([year for _, year in filled], [positions[p] for p in filled])):
+            fresh[keys[pair]] = box
+        cache.set_many(fresh, CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    result = {}
+    for entity_id in entity_ids:
+        boxes = [cached[keys[(entity_id, year)]] for year in years if cached[keys[(entity_id, year)]] != EMPTY]
+        result[entity_id] = boxes[:limit] if limit is not None else boxes
+    return result
@@ -0,0 +1,179 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Min, Q, Sum
+
+from catalog.upsert import bulk_upsert
+
+DRIVER_SEASON_FIELDS = ['races', 'wins', 'podiums', 'poles', 'points', 'best_grid', 'champion']
+DRIVER_CAREER_FIELDS = ['races', 'wins', 'podiums', 'poles', 'points', 'best_grid', 'championships',
+                        'seasons_active', 'updated_at']
+CONSTRUCTOR_SEASON_FIELDS = ['wins', 'podiums', 'poles', 'points']
+CONSTRUCTOR_CAREER_FIELDS = ['wins', 'podiums', 'poles', 'points', 'seasons_active', 'updated_at']
+
+
+def refresh_career_stats(driver_ids=None, constructor_ids=None, apps=global_apps):
+    """
+    Berechnet Saison- und Karriere-Statistiken der betroffenen Fahrer/Teams neu.
+    None bedeutet: alle. Die Teams der betroffenen Fahrer werden mitberechnet,
+    da deren Poles über die Fahrer zählen.
+    apps: für die Daten-Migration (historische Modelle).
+    Liefert die Anzahl neu berechneter Fahrer und Teams.
+    """
+    if driver_ids is not None and constructor_ids is not None:
+        DriverTeam = apps.get_model('catalog', 'DriverTeam')
+        constructor_ids = set(constructor_ids) | set(
+            DriverTeam.objects.filter(driver_id__in=driver_ids).values_list('constructor_id', flat=True)
+        )
+
+    drivers = refresh_driver_stats(apps, driver_ids)
+    constructors = refresh_constructor_stats(apps, constructor_ids)
+    return drivers, constructors
+
+
+def _only(qs, field, ids):
+    return qs if ids is None else qs.filter(**{f'{field}__in': ids})
+
+
+def refresh_driver_stats(apps, driver_ids):
+    Result = apps.get_model('catalog', 'Result')
+    QualifyingResult = apps.get_model('catalog', 'QualifyingResult')
+    Driverstanding = apps.get_model('catalog', 'Driverstanding')
+    DriverTeam = apps.get_model('catalog', 'DriverTeam')
+
+    seasons = defaultdict(lambda: {
+        'races': 0, 'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0), 'best_grid': None, 'champion': False,
+    })
+
+    for row in (
+        _only(Result.objects, 'driver_id', driver_ids)
+        .values('driver_id', 'date__season_id')
+        .order_by()
+        .annotate(
+            races=Count('id'),
+            wins=Count('id', filter=Q(position_num=1)),
+            podiums=Count('id', filter=Q(position_num__lte=3)),
+            points=Sum('points_num'),
+            best_grid=Min('grid_num', filter=Q(grid_num__gt=0)),
+        )
+    ):
+        stats = seasons[(row['driver_id'], row['date__season_id'])]
+        stats.update(races=row['races'], wins=row['wins'], podiums=row['podiums'],
+                     points=row['points'] or Decimal(0), best_grid=row['best_grid'])
+
+    for row in (
+        _only(QualifyingResult.objects.filter(position_num=1), 'driver_id', driver_ids)
+        .values('driver_id', 'date__season_id')
+        .order_by()
+        .annotate(poles=Count('id'))
+    ):
+        seasons[(row['driver_id'], row['date__season_id'])]['poles'] = row['poles']
+
+    for key in _only(Driverstanding.objects.filter(positionText='1'), 'driver_id', driver_ids).values_list(
+        'driver_id', 'season_id'
+    ):
+        seasons[key]['champion'] = True
+
+    active = defaultdict(set)
+    for driver_id, season_id in _only(DriverTeam.objects, 'driver_id', driver_ids).values_list('driver_id', 'season_id'):
+        active[driver_id].add(season_id)
+
+    careers = {}
+    for driver_id in set(active) | {driver_id for driver_id, _ in seasons} | set(driver_ids or ()):
+        careers[driver_id] = {
+            'driver_id': driver_id, 'races': 0, 'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0),
+            'best_grid': None, 'championships': 0, 'seasons_active': sorted(active[driver_id], reverse=True),
+        }
+    for (driver_id, _), stats in seasons.items():
+        career = careers[driver_id]
+        for field in ('races', 'wins', 'podiums', 'poles', 'points'):
+            career[field] += stats[field]
+        career['championships'] += stats['champion']
+        if stats['best_grid'] is not None:
+            career['best_grid'] = min(filter(None, (career['best_grid'], stats['best_grid'])))
+
+    bulk_upsert(
+        apps.get_model('catalog', 'DriverSeasonStats'),
+        [{'driver_id': d, 'season_id': s, **stats} for (d, s), stats in seasons.items()],
+        ['driver', 'season'], DRIVER_SEASON_FIELDS,
+    )
+    bulk_upsert(apps.get_model('catalog', 'DriverCareerStats'), list(careers.values()), ['driver'],
+                DRIVER_CAREER_FIELDS)
+    return len(careers)
+
+
+def refresh_constructor_stats(apps, constructor_ids):
+    Result = apps.get_model('catalog', 'Result')
+    QualifyingResult = apps.get_model('catalog', 'QualifyingResult')
+    Constructorstanding = apps.get_model('catalog', 'Constructorstanding')
+    DriverTeam = apps.get_model('catalog', 'DriverTeam')
+
+    seasons = defaultdict(lambda: {'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0)})
+
+    for row in (
+        _only(Result.objects.filter(position_num__lte=3), 'constructor_id', constructor_ids)
+        .values('constructor_id', 'date__season_id')
+        .order_by()
+        .annotate(podiums=Count('id'))
+    ):
+        seasons[(row['constructor_id'], row['date__season_id'])]['podiums'] = row['podiums']
+
+    # Siege und Punkte wie bisher aus der Team-WM
+    for constructor_id, season_id, points, wins in _only(
+        Constructorstanding.objects, 'constructor_id', constructor_ids
+    ).values_list('constructor_id', 'season_id', 'points_num', 'wins_num'):
+        stats = seasons[(constructor_id, season_id)]
+        stats['points'] = points or Decimal(0)
+        stats['wins'] = wins or 0
+
+    # Poles zählen für das Team, für das der Fahrer in der Saison fuhr
+    team_of = {}
+    active = defaultdict(set)
+    for season_id, driver_id, constructor_id in _only(DriverTeam.objects, 'constructor_id', constructor_ids).values_list(
+        'season_id', 'driver_id', 'constructor_id'
+    ):
+        team_of[(season_id, driver_id)] = constructor_id
+        active[constructor_id].add(season_id)
+
+    for driver_id, season_id in (
+        QualifyingResult.objects
+        .filter(position_num=1, driver_id__in={driver_id for _, driver_id in team_of})
+        .values_list('driver_id', 'date__season_id')
+    ):
+        constructor_id = team_of.get((season_id, driver_id))
+        if constructor_id is not None:
+            seasons[(constructor_id, season_id)]['poles'] += 1
+
+    careers = {}
+    for constructor_id in set(active) | {c for c, _ in seasons} | set(constructor_ids or ()):
+        careers[constructor_id] = {
+            'constructor_id': constructor_id, 'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0),
+            'seasons_active': sorted(active[constructor_id], reverse=True),
+        }
+    for (constructor_id, _), stats in seasons.items():
+        for field in CONSTRUCTOR_SEASON_FIELDS:
+            careers[constructor_id][field] += stats[field]
+
+    bulk_upsert(
+        apps.get_model('catalog', 'ConstructorSeasonStats'),
+        [{'constructor_id': c, 'season_id': s, **stats} for (c, s), stats in seasons.items()],
+        ['constructor', 'season'], CONSTRUCTOR_SEASON_FIELDS,
+    )
+    bulk_upsert(apps.get_model('catalog', 'ConstructorCareerStats'), list(careers.values()), ['constructor'],
+                CONSTRUCTOR_CAREER_FIELDS)
+    return len(careers)
+
+
+def career_or_zero(obj):
+    """
+    Karriere-Statistik eines Fahrers/Teams (mit select_related('career_stats') geladen).
+    Fehlt die Zeile noch, gibt es eine ungespeicherte mit Nullwerten: Lese-Endpunkte
+    schreiben nicht, die Zeilen legen populate_f1 und Migration 0007 an.
+    """
+    try:
+        return obj.career_stats
+    except ObjectDoesNotExist:
+        relation = type(obj).career_stats.related
+        return relation.related_model(**{relation.field.name: obj})
@@ -0,0 +1,134 @@
+import hashlib
+import json
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F
+
+from catalog.models import Season, DriverTeam, Driverstanding, Constructorstanding, DriverSeasonStats, \
+    ConstructorSeasonStats
+from catalog.stats import SeasonMatrix
+
+CACHE_KEY = 'catalog:current_season'
+# Invalidiert wird von populate_f1 (geteilter Cache, siehe CACHE_BACKEND) – das Timeout ist nur eine Obergrenze
+CACHE_TIMEOUT = 15 * 60
+
+
+def build_current_season():
+    """
+    Ermittelt die aktuelle (numerisch höchste) Saison und berechnet
+    Fahrer-/Team-Kader samt WM-Stand vor. None, wenn es keine Saison gibt.
+    """
+    years = sorted((int(s) for s in Season.objects.values_list('season', flat=True) if s.isdigit()), reverse=True)
+    if not years:
+        return None
+    season = str(years[0])
+
+    driver_standings = {
+        s['driver_id']: s
+        for s in Driverstanding.objects.filter(season=season).values(
+            'driver_id', 'points', 'positionText', 'points_num', 'wins_num'
+        )
+    }
+
+    driver_stats = {
+        s['driver_id']: s
+        for s in DriverSeasonStats.objects.filter(season=season).values('driver_id', 'podiums', 'poles')
+    }
+    team_stats = {
+        s['constructor_id']: s
+        for s in ConstructorSeasonStats.objects.filter(season=season).values('constructor_id', 'podiums', 'poles')
+    }
+
+    # Saisonform (Schnitt, Zielankünfte, Teamkollegen-Vergleich) für alle Fahrer/Teams auf einmal
+    matrix = SeasonMatrix.load(season)
+    driver_form = matrix.driver_stats()
+    team_form = matrix.team_stats()
+
+    drivers = []
+    for dt in DriverTeam.objects.filter(season=season).select_related('driver', 'constructor').order_by('pk'):
+        standing = driver_standings.get(dt.driver_id, {})
+        drivers.append({
+            'driver_id': dt.driver.driver,
+            'forename': dt.driver.forename,
+            'surname': dt.driver.surname,
+            'nationality': dt.driver.nationality,
+            'number': dt.driver_season_number,
+            'team_id': dt.constructor_id,
+            'team': dt.constructor.name,
+            'points': standing.get('points', '0'),
+            'position': standing.get('positionText', ''),
+            'points_num': float(standing.get('points_num') or 0),
+            'wins': standing.get('wins_num') or 0,
+            'podiums': driver_stats.get(dt.driver_id, {}).get('podiums', 0),
+            'poles': driver_stats.get(dt.driver_id, {}).get('poles', 0),
+            'form': driver_form.get(dt.driver_id),
+        })
+
+    # Kader je Team – alle DriverTeam-Zeilen kommen aus der einen Abfrage oben
+    drivers_by_team = defaultdict(list)
+    for d in drivers:
+        drivers_by_team[d['team_id']].append({
+            'driver_id': d['driver_id'],
+            'forename': d['forename'],
+            'surname': d['surname'],
+            'number': d['number'],
+        })
+
+    teams = []
+    for standing in (
+        Constructorstanding.objects
+        .filter(season=season)
+        .select_related('constructor')
+        .order_by(F('position_num').asc(nulls_last=True), 'pk')
+    ):
+        team = standing.constructor
+        teams.append({
+            'team_id': team.constructor,
+            'name': team.name,
+            'nationality': team.nationality,
+            'points': standing.points,
+            'position': standing.positionText,
+            'points_num': float(standing.points_num or 0),
+            'wins': standing.wins_num or 0,
+            'podiums': team_stats.get(team.constructor, {}).get('podiums', 0),
+            'poles': team_stats.get(team.constructor, {}).get('poles', 0),
+            'form': team_form.get(team.constructor),
+            'drivers': drivers_by_team[team.constructor],
+        })
+
+    snapshot = {
+        'season': season,
+        'years': years,
+        'drivers': drivers,
+        'teams': teams,
+    }
+    # Ändert sich mit jedem neuen Datenstand der Saison (für ETag/304)
+    snapshot['etag'] = hashlib.md5(json.dumps(snapshot, sort_keys=True).encode()).hexdigest()
+    return snapshot
+
+
+def get_current_season():
+    """Schnappschuss der aktuellen Saison aus dem Cache (bei Bedarf neu berechnet)."""
+    snapshot = cache.get(CACHE_KEY)
+    if snapshot is None:
+        snapshot = build_current_season()
+        if snapshot is not None:
+            cache.set(CACHE_KEY, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+async def aget_current_season():
+    """Wie get_current_season, für die async Views (Neuberechnung im Thread-Pool)."""
+    snapshot = await cache.aget(CACHE_KEY)
+    if snapshot is None:
+        snapshot = await sync_to_async(build_current_season)()
+        if snapshot is not None:
+            await cache.aset(CACHE_KEY, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_current_season():
+    """Wird von populate_f1 nach jedem Lauf aufgerufen."""
+    cache.delete(CACHE_KEY)
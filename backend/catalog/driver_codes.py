@@ -0,0 +1,59 @@
+from catalog.current_season import get_current_season
+from catalog.models import Driver
+
+# (etag des Saison-Schnappschusses, casefold(Code) -> Fahrer) – je Prozess
+_roster = (None, {})
+
+
+def _entry(driver_id, forename, surname):
+    return {'driver_id': driver_id, 'name': f'{forename} {surname}'}
+
+
+def _current_roster():
+    """
+    Fahrer der aktuellen Saison nach Code (ohne Groß-/Kleinschreibung).
+    Wird neu aufgebaut, sobald sich der Schnappschuss ändert – populate_f1
+    verwirft ihn nach jedem Lauf.
+    """
+    global _roster
+    current = get_current_season()
+    if current is None:
+        return {}
+    etag, drivers = _roster
+    if etag != current['etag']:
+        drivers = {
+            d['driver_id'].casefold(): _entry(d['driver_id'], d['forename'], d['surname'])
+            for d in current['drivers']
+        }
+        _roster = (current['etag'], drivers)
+    return drivers
+
+
+def resolve_drivers(codes):
+    """
+    Code -> {'driver_id', 'name'} für alle gefundenen Codes (wie driver__iexact).
+    Fahrer der aktuellen Saison kommen aus dem Speicher, alle übrigen aus
+    einer gemeinsamen Abfrage.
+    """
+    codes = {str(code) for code in codes if code}
+    roster = _current_roster()
+    found = {}
+    unknown = set()
+    for code in codes:
+        entry = roster.get(code.casefold())
+        if entry:
+            found[code] = entry
+        else:
+            unknown.add(code)
+
+    if unknown:
+        others = {
+            driver_id.casefold(): _entry(driver_id, forename, surname)
+            for driver_id, forename, surname in Driver.objects.filter(
+                driver__in=unknown | {code.casefold() for code in unknown}
+            ).values_list('driver', 'forename', 'surname')
+        }
+        for code in unknown:
+            if code.casefold() in others:
+                found[code] = others[code.casefold()]
+    return found
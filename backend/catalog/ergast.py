@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.utils import timezone
+
+BASE_URL = 'https://api.jolpi.ca/ergast/f1'
+
+# Jolpica erlaubt max. 100 Einträge pro Seite und ca. 4 Requests pro Sekunde
+PAGE_LIMIT = 100
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 4
+DEFAULT_WORKERS = 4
+DEFAULT_RETRY_AFTER = 60
+
+# Daten der laufenden Saison (und saisonübergreifende Endpunkte) können sich ändern
+CURRENT_TTL = timedelta(minutes=10)
+SEASON_ENDPOINT = re.compile(r'^/(\d{4})/')
+
+
+class RateLimiter:
+    """
+    Token-Bucket, den sich alle Threads eines Clients teilen.
+    rate:  nachgefüllte Tokens pro Sekunde
+    burst: maximale Anzahl Tokens auf Vorrat
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blockiert, bis ein Token verfügbar ist, und verbraucht es."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hält alle Threads an (z.B. nach 429 mit Retry-After) und leert den Vorrat."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+
+class ResponseCache:
+    """
+    Ablage der Seiten auf der Platte, Schlüssel ist Endpunkt + Offset + Limit.
+    Abgeschlossene Saisons laufen nie ab, alles andere nach current_ttl;
+    danach wird per ETag/Last-Modified beim Server nachgefragt.
+    """
+
+    def __init__(self, directory, current_ttl=CURRENT_TTL):
+        self.directory = directory
+        self.current_ttl = current_ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, endpoint, offset, limit):
+        key = hashlib.sha1(f'{endpoint}?limit={limit}&offset={offset}'.encode()).hexdigest()
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, endpoint, offset, limit):
+        try:
+            with open(self.path(endpoint, offset, limit), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, endpoint, offset, limit, data, etag=None, last_modified=None):
+        entry = {
+            'endpoint': endpoint,
+            'offset': offset,
+            'fetched_at': timezone.now().isoformat(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data,
+        }
+        # Erst in eine temporäre Datei schreiben, damit parallele Worker nie halbe Dateien lesen
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.path(endpoint, offset, limit))
+
+    def is_fresh(self, entry):
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        match = SEASON_ENDPOINT.match(entry['endpoint'])
+        # Saison war beim Abruf schon vorbei -> Daten ändern sich nicht mehr
+        if match and int(match.group(1)) < fetched_at.year:
+            return True
+        return timezone.now() - fetched_at < self.current_ttl
+
+
+class ErgastClient:
+    """
+    Holt paginierte Endpunkte der Ergast/Jolpica API.
+    Die erste Seite liefert MRData.total, alle weiteren Offsets werden
+    parallel (innerhalb des Rate-Limits) geladen und in Reihenfolge zusammengeführt.
+    Alle Requests laufen über eine gemeinsame Session mit Keep-Alive.
+    """
+
+    def __init__(self, base_url=BASE_URL, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 workers=DEFAULT_WORKERS, page_limit=PAGE_LIMIT, timeout=30, cache=None, log=None):
+        self.base_url = base_url
+        self.limiter = RateLimiter(rate, burst)
+        self.workers = workers
+        self.page_limit = page_limit
+        self.timeout = timeout
+        self.cache = cache
+        self.log = log or (lambda msg: None)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch(self, endpoint):
+        """Liefert alle Einträge eines Endpunkts über alle Seiten."""
+        first = self.get_page(endpoint, 0)
+        items = list(extract_items(first, endpoint))
+
+        total = int(first['MRData'].get('total', 0))
+        offsets = range(self.page_limit, total, self.page_limit)
+        if not offsets:
+            return items
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # map() liefert die Seiten in der Reihenfolge der Offsets
+            for data in pool.map(lambda offset: self.get_page(endpoint, offset), offsets):
+                items.extend(extract_items(data, endpoint))
+        return items
+
+    def get_page(self, endpoint, offset):
+        url = f"{self.base_url}{endpoint}.json"
+        params = {'limit': self.page_limit, 'offset': offset}
+
+        cached = self.cache.get(endpoint, offset, self.page_limit) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            return cached['data']
+
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        while True:
+            self.limiter.acquire()
+            resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            if resp.status_code == 429:
+                retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                self.log(f'Zu viele Requests – warte {retry_after:.0f}s ({endpoint}, offset {offset})')
+                self.limiter.pause(retry_after)
+                continue
+            if resp.status_code == 304 and cached:
+                data = cached['data']
+            else:
+                resp.raise_for_status()
+                data = resp.json()
+
+            if self.cache:
+                self.cache.put(
+                    endpoint, offset, self.page_limit, data,
+                    etag=resp.headers.get('ETag') or (cached or {}).get('etag'),
+                    last_modified=resp.headers.get('Last-Modified') or (cached or {}).get('last_modified'),
+                )
+            return data
+
+
+def parse_retry_after(value):
+    """Retry-After kann Sekunden oder ein HTTP-Datum sein."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - timezone.now()).total_seconds())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def extract_items(data, endpoint):
+    """Extrahiert den richtigen JSON-Pfad je nach Endpunkt."""
+    mr = data['MRData']
+
+    match endpoint:
+        case "/seasons":
+            return mr['SeasonTable']['Seasons']
+
+        case "/circuits":
+            return mr['CircuitTable']['Circuits']
+
+        case ep if ep.endswith("drivers"):
+            return mr['DriverTable']['Drivers']
+
+        case ep if ep.endswith("constructors"):
+            return mr['ConstructorTable']['Constructors']
+
+        case ep if ep.endswith("races"):
+            return mr['RaceTable']['Races']
+
+        case ep if ep.endswith("qualifying"):
+            return mr['RaceTable']['Races']
+
+        case ep if ep.endswith("results"):
+            return mr['RaceTable']['Races']
+
+        # Fängt alle Endpunkte ab, die auf "driverStandings" enden
+        case ep if ep.endswith("driverStandings"):
+            standings_lists = mr['StandingsTable']['StandingsLists']
+            if not standings_lists:
+                return []
+
+            first_list = standings_lists[0]
+            return first_list.get('DriverStandings', [])
+
+        case ep if ep.endswith("constructorstandings"):
+            standings_lists = mr['StandingsTable']['StandingsLists']
+            if not standings_lists:
+                return []
+            return standings_lists[0].get('ConstructorStandings', [])
+
+
+    return []
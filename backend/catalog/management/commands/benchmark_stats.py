@@ -0,0 +1,151 @@
+import random
+import timeit
+from collections import defaultdict
+from math import floor, ceil
+
+from django.core.management.base import BaseCommand, CommandError
+from catalog.models import Result
+from catalog import stats
+
+
+def python_percentile(data, percent):
+    """Bisherige Variante aus catalog/views.py (Referenz für den Vergleich)."""
+    if not data:
+        return None
+    k = (len(data) - 1) * (percent / 100.0)
+    f = floor(k)
+    c = ceil(k)
+    if f == c:
+        return data[int(k)]
+    return data[f] * (c - k) + data[c] * (k - f)
+
+
+def python_box_plots(series):
+    """Bisherige Schleife: Positionen einzeln parsen, sortieren, Quartile je Reihe."""
+    boxes = []
+    for raw in series:
+        positions = []
+        for pos in raw:
+            try:
+                positions.append(int(pos))
+            except (ValueError, TypeError):
+                continue
+        if not positions:
+            continue
+        sorted_pos = sorted(positions)
+        boxes.append((
+            sorted_pos[0],
+            python_percentile(sorted_pos, 25),
+            python_percentile(sorted_pos, 50),
+            python_percentile(sorted_pos, 75),
+            sorted_pos[-1],
+        ))
+    return boxes
+
+
+def python_driver_form(rows):
+    """Zielankunftsquote und Schnitt je Fahrer als Python-Schleife (ohne Teamkollegen-Vergleich)."""
+    per_driver = defaultdict(list)
+    for _, driver, _, position, _, position_text in rows:
+        per_driver[driver].append(position if position_text.isdigit() else None)
+    form = {}
+    for driver, positions in per_driver.items():
+        finished = [p for p in positions if p is not None]
+        form[driver] = (
+            len(finished) / len(positions),
+            sum(finished) / len(finished) if finished else None,
+        )
+    return form
+
+
+def python_team_form(rows):
+    """Zielankunftsquote, Schnitt und Positionsgewinn je Team als Python-Schleife."""
+    totals = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for _, _, team, position, grid, position_text in rows:
+        t = totals[team]
+        t[0] += 1
+        if position_text.isdigit():
+            t[1] += 1
+            t[2] += position
+            if grid:
+                t[3] += grid - position
+                t[4] += 1
+    return {
+        team: (finished / starts, total / finished if finished else None, gain / gained if gained else None)
+        for team, (starts, finished, total, gain, gained) in totals.items()
+    }
+
+
+def synthetic_rows(seasons, drivers=20, rounds=24):
+    """Zufällige Ergebnisse ((Saison, Runde), driver, constructor, position, grid, positionText)."""
+    rng = random.Random(42)
+    rows = []
+    for season in range(seasons):
+        for rnd in range(rounds):
+            order = rng.sample(range(1, drivers + 1), drivers)
+            for d, position in enumerate(order):
+                text = 'R' if rng.random() < 0.1 else str(position)
+                rows.append(((season, rnd), f'd{d}', f't{d // 2}', position, rng.randint(1, drivers), text))
+    return rows
+
+
+class Command(BaseCommand):
+    help = ('Mikro-Benchmark: Box-Plot-Quartile und Fahrer-Kennzahlen mit den bisherigen '
+            'Python-Schleifen gegen catalog.stats (NumPy).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, metavar='SEASONS',
+                            help='Zufallsdaten für so viele Saisons statt der Datenbank verwenden')
+        parser.add_argument('--repeat', type=int, default=20, help='Wiederholungen je Messung (Standard: 20)')
+
+    def handle(self, *args, **options):
+        if options['synthetic']:
+            rows = synthetic_rows(options['synthetic'])
+        else:
+            rows = list(Result.objects.values_list(
+                'date_id', 'driver_id', 'constructor_id', 'position_num', 'grid_num', 'position_text'
+            ))
+        if not rows:
+            raise CommandError('Keine Ergebnisse – populate_f1 ausführen oder --synthetic verwenden.')
+
+        # Reihen je Fahrer und Saison wie in den Box-Plot-Views
+        series = defaultdict(list)
+        for race, driver, _, position, _, _ in rows:
+            if position is not None:
+                season = race[0] if isinstance(race, tuple) else race.year
+                series[(season, driver)].append(position)
+        series = list(series.values())
+        text_series = [[str(p) for p in s] for s in series]
+
+        repeat = options['repeat']
+        self.stdout.write(f'{len(rows)} Ergebnisse, {len(series)} Reihen, {repeat} Wiederholungen')
+        self.report(
+            'Box-Plot-Quartile',
+            timeit.timeit(lambda: python_box_plots(text_series), number=repeat),
+            timeit.timeit(lambda: stats.box_plots(range(len(series)), series), number=repeat),
+            repeat,
+        )
+        # Die Matrix wird einmal je Saison-Schnappschuss aufgebaut und dann für alle Kennzahlen genutzt
+        build_ms = timeit.timeit(lambda: stats.SeasonMatrix(rows), number=repeat) / repeat * 1000
+        self.stdout.write(f'Matrix-Aufbau: {build_ms:.2f} ms')
+        matrix = stats.SeasonMatrix(rows)
+        self.report(
+            'Fahrer-Kennzahlen',
+            timeit.timeit(lambda: python_driver_form(rows), number=repeat),
+            timeit.timeit(matrix.driver_stats, number=repeat),
+            repeat,
+        )
+        self.report(
+            'Team-Kennzahlen',
+            timeit.timeit(lambda: python_team_form(rows), number=repeat),
+            timeit.timeit(matrix.team_stats, number=repeat),
+            repeat,
+        )
+
+    def report(self, name, python_seconds, numpy_seconds, repeat):
+        python_ms = python_seconds / repeat * 1000
+        numpy_ms = numpy_seconds / repeat * 1000
+        self.stdout.write(
+            f'{name}: Python {python_ms:.2f} ms, NumPy {numpy_ms:.2f} ms '
+            f'(Faktor {python_ms / numpy_ms:.1f})'
+        )
@@ -0,0 +1,82 @@
+import re
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from betting.models import Bet, BetStat, Group
+from catalog.models import Season, Race, QualifyingResult, Result, Driverstanding, Constructorstanding, RaceOutcome
+
+# PostgreSQL: "Seq Scan on catalog_result", SQLite: "SCAN catalog_result" (ohne Index)
+SEQ_SCAN = re.compile(r'Seq Scan on (\w+)|\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)')
+
+
+def sample_ids():
+    """Beispielwerte aus der befüllten Datenbank (neueste Saison, ein Fahrer/Team daraus)."""
+    season = max(Season.objects.values_list('season', flat=True), key=lambda s: int(s) if s.isdigit() else 0, default=None)
+    result = Result.objects.filter(date__season=season).only('driver_id', 'constructor_id').first()
+    if result is None:
+        raise CommandError('Keine Ergebnisse in der Datenbank – zuerst populate_f1 ausführen.')
+    return {
+        'season': season,
+        'driver': result.driver_id,
+        'constructor': result.constructor_id,
+        'group': Group.objects.values_list('id', flat=True).first(),
+    }
+
+
+def main_queries(ids):
+    """Die Haupt-Abfragen der Katalog- und Wett-Views (Name -> QuerySet)."""
+    season, driver, constructor, group = ids['season'], ids['driver'], ids['constructor'], ids['group']
+    queries = {
+        'detailed_driver: Saison-Ergebnisse': Result.objects.filter(driver=driver, date__season=season),
+        'detailed_driver: Podien': Result.objects.filter(driver=driver, position_num__lte=3),
+        'detailed_driver: Poles': QualifyingResult.objects.filter(driver=driver, position='1'),
+        'detailed_team: Saison-Ergebnisse': Result.objects.filter(constructor=constructor, date__season=season),
+        'detailed_team: Podien': Result.objects.filter(constructor=constructor, position_num__lte=3),
+        'team_standings: Rennen der Saison': Race.objects.filter(season=season).order_by('date'),
+        'insight: Fahrer-WM-Stand': Driverstanding.objects.filter(season=season).order_by(
+            F('position_num').asc(nulls_last=True)),
+        'insight: Team-WM-Stand': Constructorstanding.objects.filter(season=season).order_by(
+            F('position_num').asc(nulls_last=True)),
+        'betting: letzter Rennausgang': RaceOutcome.objects.filter(race__date__lt=date.today()).order_by('-race'),
+        'evaluate_bets: offene Wetten': Bet.objects.filter(evaluated=False, race__date__lte=date.today()),
+    }
+    if group is not None:
+        queries.update({
+            'group_info: ausgewertete Wetten': Bet.objects.filter(group=group, evaluated=True),
+            'group_info: Rangliste': BetStat.objects.filter(group=group).order_by('-points'),
+        })
+    return queries
+
+
+class Command(BaseCommand):
+    help = ('Fuehrt EXPLAIN (auf PostgreSQL EXPLAIN ANALYZE) fuer die Haupt-Abfragen der Views '
+            'gegen die befuellte Datenbank aus und markiert sequentielle Scans.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Kompletten Plan jeder Abfrage ausgeben')
+
+    def handle(self, *args, **options):
+        analyze = connection.vendor == 'postgresql'
+        flagged = 0
+
+        for name, qs in main_queries(sample_ids()).items():
+            plan = qs.explain(analyze=True) if analyze else qs.explain()
+            scans = sorted({table for match in SEQ_SCAN.finditer(plan) for table in match.groups() if table})
+
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'{name}: sequentieller Scan auf {", ".join(scans)}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if options['verbose_plans'] or scans:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if flagged:
+            self.stdout.write(self.style.WARNING(
+                f'{flagged} Abfrage(n) mit sequentiellem Scan (bei sehr kleinen Tabellen waehlt der Planer ihn u.U. trotz Index).'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('Keine sequentiellen Scans.'))
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+import numpy as np
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.management.commands.explain_queries import sample_ids
+
+
+# Endpunkte mit async Variante unter async/... (catalog/async_views.py)
+ASYNC_ENDPOINTS = ['driver/detailedview', 'team/detailedview', 'insigth/getdriverstandings', 'insigth/getteamstanding']
+
+
+def endpoints(ids):
+    """Catalog-Endpunkte mit Beispielparametern aus der Datenbank (Pfad -> Parameter)."""
+    driver, team, year = ids['driver'], ids['constructor'], ids['season']
+    return {
+        'init': {},
+        'getcurrentdrivers': {},
+        'getcurrentteams': {},
+        'driver/detailedview': {'driver_id': driver},
+        'driver/getboxplot': {'driver_id': driver},
+        'driver/getstandings': {'driver_id': driver, 'season': year},
+        'team/detailedview': {'team_id': team},
+        'team/getboxplot': {'team_id': team},
+        'team/getstandings': {'team_id': team, 'year': year},
+        'insigth/getdriverstandings': {'year': year},
+        'insigth/getteamstanding': {'year': year},
+    }
+
+
+class Command(BaseCommand):
+    help = ('Lasttest gegen einen laufenden Server: Durchsatz und p50/p99-Latenz je Catalog-Endpunkt. '
+            'Mit --save/--compare lassen sich zwei Konfigurationen (z.B. vor und nach '
+            'CONN_MAX_AGE/Cache) vergleichen.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000/api/catalog/')
+        parser.add_argument('--requests', type=int, default=200, help='Anfragen je Endpunkt (Standard: 200)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Parallele Clients (Standard: 8)')
+        parser.add_argument('--method', choices=['GET', 'POST'], default='POST')
+        parser.add_argument('--bypass-cache', action='store_true',
+                            help='Jede Anfrage mit eigenem Parameter, damit der Antwort-Cache nicht greift')
+        parser.add_argument('--async-views', action='store_true',
+                            help='Nur Endpunkte mit async Variante, und zwar über async/... (Server unter ASGI)')
+        parser.add_argument('--save', metavar='DATEI', help='Ergebnisse als JSON speichern')
+        parser.add_argument('--compare', metavar='DATEI', help='Mit gespeicherten Ergebnissen (vorher) vergleichen')
+
+    def handle(self, *args, **options):
+        baseline = {}
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        base_url = options['base_url'].rstrip('/') + '/'
+        nonce = count()
+        local = threading.local()
+
+        def call(path, params):
+            # eine Session (Keep-Alive) je Client-Thread
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            session = local.session
+            if options['bypass_cache']:
+                params = {**params, 'nocache': next(nonce)}
+            start = time.perf_counter()
+            if options['method'] == 'GET':
+                response = session.get(base_url + path, params=params, timeout=30)
+            else:
+                response = session.post(base_url + path, json=params, timeout=30)
+            elapsed = (time.perf_counter() - start) * 1000
+            return elapsed, response.status_code
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            targets = endpoints(sample_ids())
+            if options['async_views']:
+                targets = {f'async/{path}': targets[path] for path in ASYNC_ENDPOINTS}
+            for path, params in targets.items():
+                try:
+                    call(path, params)  # Aufwärmen (Verbindung, Schnappschuss)
+                except requests.RequestException as exc:
+                    raise CommandError(f'{base_url}{path} nicht erreichbar: {exc}')
+                start = time.perf_counter()
+                timings = list(pool.map(lambda _: call(path, params), range(options['requests'])))
+                wall = time.perf_counter() - start
+                latencies = np.array([ms for ms, _ in timings])
+                errors = sum(1 for _, code in timings if code >= 400)
+                results[path] = {
+                    'p50': float(np.percentile(latencies, 50)),
+                    'p99': float(np.percentile(latencies, 99)),
+                    'rps': options['requests'] / wall,
+                    'errors': errors,
+                }
+                # async/x mit x aus einem früheren (synchronen) Lauf vergleichen
+                self.report(path, results[path], baseline.get(path) or baseline.get(path.removeprefix('async/')))
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'Gespeichert in {options["save"]}')
+
+    def report(self, path, result, before):
+        line = f'{path}: {result["rps"]:.0f} req/s, p50 {result["p50"]:.1f} ms, p99 {result["p99"]:.1f} ms'
+        if result['errors']:
+            line += f', {result["errors"]} Fehler'
+        if before:
+            line += f'  (vorher p50 {before["p50"]:.1f} ms, p99 {before["p99"]:.1f} ms'
+            if 'rps' in before:
+                line += f', {before["rps"]:.0f} req/s'
+            line += f'; Faktor p50 {before["p50"] / result["p50"]:.1f}, p99 {before["p99"] / result["p99"]:.1f})'
+        self.stdout.write(self.style.WARNING(line) if result['errors'] else line)
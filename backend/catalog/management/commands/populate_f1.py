@@ -1,154 +1,424 @@
+import threading
 import time
-from copyreg import constructor
-
-import requests
-from requests.exceptions import HTTPError
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from catalog.models import Season, Circuit, Driver, Constructor, Race, DriverTeam, QualifyingResult, Result, Driverstanding, Constructorstanding, DataUpdate
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction, connections
+from catalog.models import Season, Circuit, Driver, Constructor, Race, DriverTeam, QualifyingResult, Result, Driverstanding, Constructorstanding, DataUpdate, IngestWatermark, IngestCheckpoint
+from catalog.upsert import bulk_upsert, DEFAULT_BATCH_SIZE
+from catalog.outcomes import refresh_race_outcomes
+from catalog.current_season import invalidate_current_season
+from catalog.response_cache import bump_data_version
+from catalog.career import refresh_career_stats
+from catalog.utils import (
+    to_milliseconds, result_numbers, qualifying_numbers, standing_numbers,
+    RESULT_NUMERIC_FIELDS, QUALIFYING_NUMERIC_FIELDS, STANDING_NUMERIC_FIELDS,
+)
+from catalog.ergast import ErgastClient, ResponseCache, DEFAULT_RATE, DEFAULT_WORKERS
+from django.conf import settings
 from datetime import datetime
 from datetime import timedelta
 from django.utils import timezone
 from django.db.models import IntegerField
 from django.db.models.functions import Cast
 
-BASE_URL = 'https://api.jolpi.ca/ergast/f1'
+# Datentypen, deren letzte eingelesene Runde je Saison gemerkt wird
+ROUND_DATA_TYPES = ('qualifying', 'results', 'standings')
+
+# So lange nach dem Rennen wird eine Runde bei jedem Lauf erneut geladen (nachträgliche Strafen)
+RECHECK_DAYS = 3
+
+DEFAULT_SEASON_WORKERS = 4
+DEFAULT_RETRIES = 2
 
 def fetch_json(self, endpoint):
     """Hilfsfunktion: JSON von Ergast abrufen und paginieren."""
+    return self.client.fetch(endpoint)
 
-    offset = 0
-    limit = 100
-    all_items = []
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes}m {seconds:02d}s'
 
-    while True:
-        url = f"{BASE_URL}{endpoint}.json?limit={limit}&offset={offset}"
-
-        try:
-            resp = requests.get(url)
-            resp.raise_for_status()
-        except HTTPError as e:
-            if resp.status_code == 429:
-                retry_after = int(resp.headers.get('Retry-After', 60))
-                time.sleep(retry_after)
-                self.stdout.write(f'Zu viele Requests erstmal warten')
-                continue
-            raise
-        data = resp.json()
-        # Pfad je nach Endpunkt, z.B. data['MRData']['StandingsTable']['StandingsLists']
-        items = extract_items(data, endpoint)
-        if not items:
-            break
-        all_items.extend(items)
-        offset += limit
-        time.sleep(2)
-    return all_items
-
-def extract_items(data, endpoint):
-    """Extrahiert den richtigen JSON-Pfad je nach Endpunkt."""
-    mr = data['MRData']
-
-    match endpoint:
-        case "/seasons":
-            return mr['SeasonTable']['Seasons']
-
-        case "/circuits":
-            return mr['CircuitTable']['Circuits']
-
-        case ep if ep.endswith("drivers"):
-            return mr['DriverTable']['Drivers']
-
-        case ep if ep.endswith("constructors"):
-            return mr['ConstructorTable']['Constructors']
-
-        case ep if ep.endswith("races"):
-            return mr['RaceTable']['Races']
-
-        case ep if ep.endswith("qualifying"):
-            return mr['RaceTable']['Races']
-
-        case ep if ep.endswith("results"):
-            return mr['RaceTable']['Races']
-
-        # Fängt alle Endpunkte ab, die auf "driverStandings" enden
-        case ep if ep.endswith("driverStandings"):
-            standings_lists = mr['StandingsTable']['StandingsLists']
-            if not standings_lists:
-                return []
-
-            first_list = standings_lists[0]
-            return first_list.get('DriverStandings', [])
-
-        case ep if ep.endswith("constructorstandings"):
-            standings_lists = mr['StandingsTable']['StandingsLists']
-            if not standings_lists:
-                return []
-            return standings_lists[0].get('ConstructorStandings', [])
-
-
-    return []
+def season_endpoint(name, latest=0, round=None):
+    """Baut z.B. /results, /2025/results oder /2025/7/results."""
+    if latest == 0:
+        return f'/{name}'
+    if round is None:
+        return f'/{latest}/{name}'
+    return f'/{latest}/{round}/{name}'
 
 class Command(BaseCommand):
     help = 'Befüllt die F1-Tabellen mit Daten aus der Ergast API'
 
-    @transaction.atomic
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Anzahl Zeilen pro INSERT ... ON CONFLICT Statement',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help='Anzahl parallel geladener Seiten pro Endpunkt',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=DEFAULT_RATE,
+            help='Maximale Requests pro Sekunde an die Ergast API',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Antworten nicht aus dem lokalen Cache lesen oder dort ablegen',
+        )
+        parser.add_argument(
+            '--full-season',
+            action='store_true',
+            help='Aktuelle Saison komplett neu laden statt nur neuer Runden',
+        )
+        parser.add_argument(
+            '--season-workers',
+            type=int,
+            default=DEFAULT_SEASON_WORKERS,
+            help='Anzahl parallel geladener Saisons beim Nachladen der Wertungen',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=DEFAULT_RETRIES,
+            help='Wie oft fehlgeschlagene Saisons erneut versucht werden',
+        )
+        parser.add_argument(
+            '--backfill-standings',
+            nargs='*',
+            metavar='SEASON',
+            help='Nur die Fahrer- und Teamwertungen dieser Saisons (ohne Angabe: aller Saisons) nachladen',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Abgebrochenen ersten Komplett-Import fortsetzen statt neu zu beginnen',
+        )
+
     def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.season_workers = options['season_workers']
+        self.retries = options['retries']
+        self.upsert_stats = {}
+        self.output_lock = threading.Lock()
+        # Fahrer/Teams mit neuen Daten – deren Karriere-Statistik wird neu berechnet
+        self.touched_drivers = set()
+        self.touched_constructors = set()
+        self.client = self.make_client(options)
+
+        if options['backfill_standings'] is not None:
+            self.backfill_standings(options['backfill_standings'] or None)
+            self.refresh_career()
+            self.finish()
+            return
 
-        upd, created = DataUpdate.objects.get_or_create(name='populate_f1')
+        upd = DataUpdate.objects.filter(name='populate_f1').first()
+        if upd is None:
+            # Erst nach vollständigem Import gibt es den DataUpdate-Eintrag
+            self.full_load(resume=options['resume'])
+            self.refresh_career(everything=True)
+            DataUpdate.objects.update_or_create(name='populate_f1')
+            self.finish()
+            return
 
-        if not created and timezone.now() - upd.last_run < timedelta(minutes=30):
+        if timezone.now() - upd.last_run < timedelta(minutes=30):
             self.stdout.write('Datenbank wurde erst vor weniger als 30 min aktualisiert – übersprungen.')
             return
 
-        self.load_seasons()
-        self.load_circuits()
-
-        if created:
-            self.stdout.write('Erster Lauf – lade alle Daten …')
-            self.load_drivers()
-            self.load_constructors()
-            self.load_races()
-            self.load_qualifying_results()
-            self.load_results()
-            self.load_driver_standing()
-            self.load_constructor_standing()
+        with transaction.atomic():
+            self.load_seasons()
+            self.load_circuits()
+
+            if options['full_season']:
+                season = self.latest_season()
+                self.stdout.write(f'Lade Season: {season}')
+                self.load_drivers(season)
+                self.load_constructors(season)
+                self.load_races(season)
+                self.load_qualifying_results(season)
+                self.load_results(season)
+                self.load_driver_standing(season)
+                self.load_constructor_standing(season)
+                self.sync_watermarks(season)
+            else:
+                self.refresh_new_rounds(self.latest_season())
+
+            self.refresh_career()
+            upd.save(update_fields=['last_run'])
+
+        self.finish()
+
+    def make_client(self, options):
+        return ErgastClient(
+            rate=options['rate'],
+            workers=options['workers'],
+            cache=None if options['no_cache'] else ResponseCache(settings.ERGAST_CACHE_DIR),
+            log=self.stdout.write,
+        )
+
+    def refresh_career(self, everything=False):
+        if everything:
+            drivers, constructors = refresh_career_stats()
+        elif self.touched_drivers or self.touched_constructors:
+            drivers, constructors = refresh_career_stats(self.touched_drivers, self.touched_constructors)
         else:
-            latest = Season.objects.annotate(as_int=Cast('season', IntegerField())).order_by('-as_int').first()
-            season = latest.season
-            self.stdout.write(f'Lade Season: {season}')
-            self.load_drivers(season)
-            self.load_constructors(season)
-            self.load_races(season)
-            self.load_qualifying_results(season)
-            self.load_results(season)
-            self.load_driver_standing(season)
-            self.load_constructor_standing(season)
-
-        upd.save(update_fields=['last_run'])
+            return
+        self.stdout.write(f'Karriere-Statistik für {drivers} Fahrer und {constructors} Teams neu berechnet.')
+
+    def finish(self):
+        # Gecachten Schnappschuss der aktuellen Saison und alle gecachten Antworten verwerfen
+        invalidate_current_season()
+        bump_data_version()
+        self.report_upserts()
         self.stdout.write('Fertig!')
 
+    def full_load(self, resume=False):
+        """
+        Erster Lauf: lädt alle Daten in Abschnitten (Tabelle bzw. Tabelle + Saison),
+        die jeweils einzeln committet und als IngestCheckpoint vermerkt werden.
+        Mit resume=True werden bereits erledigte Abschnitte übersprungen.
+        """
+        if resume:
+            done = set(IngestCheckpoint.objects.values_list('chunk', 'season'))
+            self.stdout.write(f'Erster Lauf – setze fort ({len(done)} Abschnitte bereits geladen) …')
+        else:
+            IngestCheckpoint.objects.all().delete()
+            done = set()
+            self.stdout.write('Erster Lauf – lade alle Daten …')
+
+        # Tabellen ohne Saisonbezug, in Reihenfolge der Fremdschlüssel
+        for chunk, load in (
+            ('seasons', self.load_seasons),
+            ('circuits', self.load_circuits),
+            ('drivers', self.load_drivers),
+            ('constructors', self.load_constructors),
+            ('races', self.load_races),
+        ):
+            if (chunk, '') not in done:
+                self.run_chunk(chunk, '', load)
+
+        seasons = list(Season.objects.values_list('season', flat=True))
+        failed = []
+        for chunk, label, load in (
+            ('qualifying', 'Qualifying', self.load_qualifying_results),
+            ('results', 'Ergebnisse', self.load_results),
+            ('driverstandings', 'Fahrerwertung', self.save_driver_standing),
+            ('constructorstandings', 'Teamwertung', self.save_constructor_standing),
+        ):
+            todo = [year for year in seasons if (chunk, year) not in done]
+            if len(todo) < len(seasons):
+                self.stdout.write(f'{label}: {len(seasons) - len(todo)} Saisons bereits geladen – übersprungen.')
+            failed += [(label, year) for year in self.backfill(label, todo, load, chunk)]
+
+        if failed:
+            missing = ', '.join(f'{label} {year}' for label, year in failed)
+            raise CommandError(f'Nicht geladen: {missing} – fortsetzen mit "populate_f1 --resume"')
+
+        with transaction.atomic():
+            self.sync_watermarks(self.latest_season())
+
+    def run_chunk(self, chunk, season, load, *args):
+        """Ein Abschnitt = eine Transaktion inkl. Checkpoint."""
+        with transaction.atomic():
+            load(*args)
+            IngestCheckpoint.objects.update_or_create(chunk=chunk, season=season)
+
+    def backfill_standings(self, seasons=None):
+        """Lädt Fahrer- und Teamwertungen aller (oder der angegebenen) Saisons parallel nach."""
+        if seasons is None:
+            seasons = list(Season.objects.values_list('season', flat=True))
+
+        failed = self.backfill('Fahrerwertung', seasons, self.save_driver_standing, 'driverstandings')
+        failed += self.backfill('Teamwertung', seasons, self.save_constructor_standing, 'constructorstandings')
+        if failed:
+            years = ' '.join(sorted(set(failed)))
+            raise CommandError(
+                f'Wertungen für {years} fehlgeschlagen – erneut mit '
+                f'"populate_f1 --backfill-standings {years}"'
+            )
+
+    def backfill(self, label, seasons, load_season, chunk):
+        """
+        Verteilt die Saisons auf einen Worker-Pool. Jede Saison wird in einer
+        eigenen Transaktion geschrieben, fehlgeschlagene Saisons werden bis zu
+        --retries mal erneut versucht. Gibt die endgültig fehlgeschlagenen zurück.
+        """
+        pending = list(seasons)
+        total = len(pending)
+        done = 0
+        started = time.monotonic()
+
+        for attempt in range(self.retries + 1):
+            failed = []
+            with ThreadPoolExecutor(max_workers=self.season_workers) as pool:
+                futures = {pool.submit(self.save_season, chunk, load_season, year): year for year in pending}
+                for future in as_completed(futures):
+                    year = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed.append(year)
+                        self.log(f'{label} {year} fehlgeschlagen (Versuch {attempt + 1}): {e}')
+                        continue
+
+                    done += 1
+                    elapsed = time.monotonic() - started
+                    eta = elapsed / done * (total - done)
+                    self.log(f'[{done}/{total}] {label} {year} geladen – Restzeit ca. {format_duration(eta)}')
+
+            if not failed:
+                break
+            pending = failed
+
+        return failed
+
+    def save_season(self, chunk, load_season, year):
+        """Läuft im Worker-Thread: eine Saison, eine Transaktion, eigene DB-Verbindung."""
+        try:
+            self.run_chunk(chunk, year, load_season, year)
+        finally:
+            connections.close_all()
+
+    def log(self, msg):
+        with self.output_lock:
+            self.stdout.write(msg)
+
+    def latest_season(self):
+        latest = Season.objects.annotate(as_int=Cast('season', IntegerField())).order_by('-as_int').first()
+        return latest.season
+
+    def refresh_new_rounds(self, season):
+        """
+        Inkrementeller Lauf: lädt die Runden der Saison, die seit dem letzten Lauf
+        gefahren wurden, und dazu die Runden der letzten RECHECK_DAYS Tage erneut –
+        Disqualifikationen und Strafen der Stewards erscheinen oft erst Stunden
+        oder Tage nach dem Rennen. Unveränderte Runden kosten dank ETag nur ein 304.
+        Ohne neue oder kürzlich gefahrene Runde bleibt es beim Kalender-Abgleich.
+        """
+        self.load_races(season)
+
+        today = timezone.now().date()
+        finished_rounds = list(
+            Race.objects
+            .filter(season_id=season, date__lte=today)
+            .annotate(round_int=Cast('round', IntegerField()))
+            .order_by('round_int')
+            .values_list('round_int', 'date')
+        )
+        recent = {rnd for rnd, race_date in finished_rounds if race_date >= today - timedelta(days=RECHECK_DAYS)}
+        marks = {
+            data_type: IngestWatermark.objects.get_or_create(data_type=data_type, season_id=season)[0]
+            for data_type in ROUND_DATA_TYPES
+        }
+        pending = {
+            data_type: [rnd for rnd, _ in finished_rounds if rnd > marks[data_type].last_round or rnd in recent]
+            for data_type in ('qualifying', 'results')
+        }
+        if not pending['qualifying'] and not pending['results']:
+            self.stdout.write(f'Season {season}: keine neuen Runden seit Runde {marks["results"].last_round}.')
+            return
+
+        # Neue Fahrer/Teams (z.B. Ersatzfahrer) müssen vor den Ergebnissen existieren
+        self.load_drivers(season)
+        self.load_constructors(season)
+
+        loaders = {
+            'qualifying': self.load_qualifying_results,
+            'results': self.load_results,
+        }
+        for data_type, load in loaders.items():
+            mark = marks[data_type]
+            for rnd in pending[data_type]:
+                if rnd <= mark.last_round:
+                    # Erneute Prüfung einer bereits eingelesenen Runde
+                    load(season, rnd)
+                    continue
+                # Leere Antwort: Runde ist upstream noch nicht veröffentlicht
+                if not load(season, rnd):
+                    break
+                mark.last_round = rnd
+                mark.save(update_fields=['last_round', 'updated_at'])
+
+        # Wertung zum Stand der letzten Runde – auch wenn diese nur erneut geprüft wurde
+        standings = marks['standings']
+        last_result_round = marks['results'].last_round
+        if last_result_round and (last_result_round > standings.last_round or last_result_round in recent):
+            self.load_driver_standing(season, last_result_round)
+            self.load_constructor_standing(season, last_result_round)
+            standings.last_round = last_result_round
+            standings.save(update_fields=['last_round', 'updated_at'])
+
+        self.stdout.write(f'Season {season}: Runde {last_result_round} eingelesen.')
+
+    def sync_watermarks(self, season):
+        """Setzt die Wasserstände nach einem kompletten Lauf auf den Stand der Datenbank."""
+        def last_round(model):
+            rounds = (
+                model.objects
+                .filter(date__season_id=season)
+                .annotate(round_int=Cast('date__round', IntegerField()))
+                .values_list('round_int', flat=True)
+            )
+            return max(rounds, default=0)
+
+        last_results = last_round(Result)
+        rounds = {
+            'qualifying': last_round(QualifyingResult),
+            'results': last_results,
+            'standings': last_results,
+        }
+        for data_type, rnd in rounds.items():
+            IngestWatermark.objects.update_or_create(
+                data_type=data_type, season_id=season, defaults={'last_round': rnd}
+            )
+
+    def upsert(self, model, rows, unique_fields, update_fields):
+        """Schreibt rows gebündelt in die Tabelle und merkt sich die Zähler je Tabelle."""
+        inserted, updated = bulk_upsert(model, rows, unique_fields, update_fields, self.batch_size)
+        self.count_upserts(model.__name__, inserted, updated)
+
+        with self.output_lock:
+            if model in (Result, QualifyingResult, Driverstanding):
+                self.touched_drivers.update(row['driver_id'] for row in rows)
+            if model in (Result, Constructorstanding):
+                self.touched_constructors.update(row['constructor_id'] for row in rows)
+
+    def count_upserts(self, table, inserted, updated):
+        with self.output_lock:
+            stats = self.upsert_stats.setdefault(table, {'inserted': 0, 'updated': 0})
+            stats['inserted'] += inserted
+            stats['updated'] += updated
+
+    def report_upserts(self):
+        for table, stats in self.upsert_stats.items():
+            self.stdout.write(f"{table}: {stats['inserted']} neu, {stats['updated']} aktualisiert")
+
     def load_seasons(self):
         seasons = fetch_json(self, '/seasons')
-        for s in seasons:
-            Season.objects.update_or_create(
-                season= s['season'],
-                defaults= {}
-            )
+        rows = [{'season': s['season']} for s in seasons]
+        self.upsert(Season, rows, ['season'], [])
         self.stdout.write(f'{len(seasons)} Seasons geladen.')
 
     def load_circuits(self):
         circuits = fetch_json(self, '/circuits')
-        for c in circuits:
-            Circuit.objects.update_or_create(
-                # Objekt in DB finden falls vorhanden
-                circuit= c['circuitId'],
-                # Alle Werte aktuallisieren oder erstellen
-                defaults= {
-                    'name': c['circuitName'],
-                    'location': c['Location']['locality'],
-                    'country': c['Location']['country'],
-                }
-            )
+        rows = [
+            {
+                'circuit': c['circuitId'],
+                'name': c['circuitName'],
+                'location': c['Location']['locality'],
+                'country': c['Location']['country'],
+            }
+            for c in circuits
+        ]
+        self.upsert(Circuit, rows, ['circuit'], ['name', 'location', 'country'])
 
         self.stdout.write(f'{len(circuits)} Circuits geladen.')
 
@@ -159,22 +429,20 @@ class Command(BaseCommand):
         else:
             drivers = fetch_json(self, '/drivers')
 
+        rows = []
         for d in drivers:
             dob_str = d.get('dateOfBirth')
             dob = datetime.strptime(dob_str, '%Y-%m-%d').date() if dob_str else None
 
-            Driver.objects.update_or_create(
-                # Objekt in DB finden falls vorhanden
-                driver=d['driverId'],
-                # Alle Werte aktuallisieren oder erstellen
-                defaults={
-                    'number': d.get('permanentNumber', ''),
-                    'forename': d['givenName'],
-                    'surname': d['familyName'],
-                    'dob': dob,
-                    'nationality': d['nationality'],
-                }
-            )
+            rows.append({
+                'driver': d['driverId'],
+                'number': d.get('permanentNumber', ''),
+                'forename': d['givenName'],
+                'surname': d['familyName'],
+                'dob': dob,
+                'nationality': d['nationality'],
+            })
+        self.upsert(Driver, rows, ['driver'], ['number', 'forename', 'surname', 'dob', 'nationality'])
         self.stdout.write(f'{len(drivers)} Drivers geladen.')
 
     def load_constructors(self, latest = 0):
@@ -183,16 +451,15 @@ class Command(BaseCommand):
         else:
             constructors = fetch_json(self, '/constructors')
 
-        for c in constructors:
-            Constructor.objects.update_or_create(
-                # Objekt in DB finden falls vorhanden
-                constructor=c['constructorId'],
-                # Alle Werte aktuallisieren oder erstellen
-                defaults={
-                    'name': c['name'],
-                    'nationality': c['nationality'],
-                }
-            )
+        rows = [
+            {
+                'constructor': c['constructorId'],
+                'name': c['name'],
+                'nationality': c['nationality'],
+            }
+            for c in constructors
+        ]
+        self.upsert(Constructor, rows, ['constructor'], ['name', 'nationality'])
         self.stdout.write(f'{len(constructors)} Constructors geladen.')
 
     def load_races(self, latest = 0):
@@ -201,51 +468,61 @@ class Command(BaseCommand):
         else:
             races = fetch_json(self, '/races')
 
+        rows = []
         for race in races:
             date_str = race.get('date')
             date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
 
-            Race.objects.update_or_create(
-                date = date,
-                defaults = {
-                    'season_id': race['season'],
-                    'circuit_id': race['Circuit']['circuitId'],
-                    'round': race['round'],
-                }
-            )
+            rows.append({
+                'date': date,
+                'season_id': race['season'],
+                'circuit_id': race['Circuit']['circuitId'],
+                'round': race['round'],
+            })
+        self.upsert(Race, rows, ['date'], ['season', 'circuit', 'round'])
 
         self.stdout.write(f'{len(races)} Races geladen.')
 
-    def load_qualifying_results(self, latest = 0):
-        if latest != 0:
-            qualifying_results = fetch_json(self, f'/{latest}/qualifying')
-        else:
-            qualifying_results = fetch_json(self, '/qualifying')
+    def load_qualifying_results(self, latest = 0, round = None):
+        qualifying_results = fetch_json(self, season_endpoint('qualifying', latest, round))
 
+        rows = []
         for result in qualifying_results:
             date_str = result.get('date')
             date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
 
             for ql in result.get('QualifyingResults', []):
-                    QualifyingResult.objects.update_or_create(
-                        date_id = date,
-                        driver_id = ql['Driver']['driverId'],
-                        defaults = {
-                            'position': ql['position'],
-                            'q1': ql.get('Q1', ''),
-                            'q2': ql.get('Q2', ''),
-                            'q3': ql.get('Q3', ''),
-                        }
-                    )
+                rows.append({
+                    'date_id': date,
+                    'driver_id': ql['Driver']['driverId'],
+                    'position': ql['position'],
+                    'q1': ql.get('Q1', ''),
+                    'q2': ql.get('Q2', ''),
+                    'q3': ql.get('Q3', ''),
+                })
+                rows[-1].update(qualifying_numbers(rows[-1]))
+        self.upsert(
+            QualifyingResult, rows, ['date', 'driver'],
+            ['position', 'q1', 'q2', 'q3'] + QUALIFYING_NUMERIC_FIELDS,
+        )
 
         self.stdout.write(f'{len(qualifying_results)} Qualifying fuer Races geladen.')
+        return len(qualifying_results)
 
-    def load_results(self, latest = 0):
-        if latest != 0:
-            races = fetch_json(self, f'/{latest}/results')
-        else:
-            races = fetch_json(self, '/results')
+    def load_results(self, latest = 0, round = None):
+        races = fetch_json(self, season_endpoint('results', latest, round))
 
+        # Ergast paginiert nach Ergebniszeilen: ein Rennen kann über zwei Seiten
+        # (= zwei Einträge mit gleichem Datum) verteilt sein. Die Siegerzeit für
+        # die "+Abstand"-Zeiten daher erst über alle Teile hinweg einsammeln.
+        winner_ms = {}
+        for race in races:
+            for r in race.get('Results', []):
+                if r['position'] == '1':
+                    winner_ms[race.get('date')] = to_milliseconds(r.get('Time', {}).get('time'))
+
+        result_rows = []
+        driver_team_rows = []
         for race in races:
             date_str = race.get('date')
             date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
@@ -254,88 +531,101 @@ class Command(BaseCommand):
             for result in race.get('Results', []):
                 time_str = result.get('Time', {}).get('time', '')
                 fastest_lap = result.get('FastestLap', {}).get('Time', {}).get('time', '')
-                Result.objects.update_or_create(
-                    date_id = date,
-                    driver_id = result['Driver']['driverId'],
-                    defaults={
-                        'constructor_id': result['Constructor']['constructorId'],
-                        'number': result['number'],
-                        'grid': result['grid'],
-                        'position': result['position'],
-                        'position_text': result['positionText'],
-                        'points': result['points'],
-                        'laps': result['laps'],
-                        'time': time_str,
-                        'fastest_lap': fastest_lap,
-                        'status': result['status'],
-                    }
-                )
-
-                DriverTeam.objects.update_or_create(
-                    season_id = season,
-                    driver_id = result['Driver']['driverId'],
-                    defaults={
-                        'constructor_id': result['Constructor']['constructorId'],
-                        'driver_season_number': result['number'],
-                    }
-                )
+                result_rows.append({
+                    'date_id': date,
+                    'driver_id': result['Driver']['driverId'],
+                    'constructor_id': result['Constructor']['constructorId'],
+                    'number': result['number'],
+                    'grid': result['grid'],
+                    'position': result['position'],
+                    'position_text': result['positionText'],
+                    'points': result['points'],
+                    'laps': result['laps'],
+                    'time': time_str,
+                    'fastest_lap': fastest_lap,
+                    'status': result['status'],
+                })
+                result_rows[-1].update(result_numbers(result_rows[-1], winner_ms.get(date_str)))
+
+                driver_team_rows.append({
+                    'season_id': season,
+                    'driver_id': result['Driver']['driverId'],
+                    'constructor_id': result['Constructor']['constructorId'],
+                    'driver_season_number': result['number'],
+                })
+
+        self.upsert(
+            Result, result_rows, ['date', 'driver'],
+            ['constructor', 'number', 'grid', 'position', 'position_text', 'points',
+             'laps', 'time', 'fastest_lap', 'status'] + RESULT_NUMERIC_FIELDS,
+        )
+        self.upsert(DriverTeam, driver_team_rows, ['season', 'driver'], ['constructor', 'driver_season_number'])
+
+        # Rennausgang (Podium, letzte 10, schnellste Runde) für Wetten/Oberfläche vorberechnen
+        race_dates = {row['date_id'] for row in result_rows}
+        if race_dates:
+            self.count_upserts('RaceOutcome', *refresh_race_outcomes(race_dates))
 
         self.stdout.write(f'{len(races)} Results fuer Races geladen.')
+        return len(races)
 
-    def load_driver_standing(self, latest = 0):
+    def load_driver_standing(self, latest = 0, round = None):
 
         if latest != 0:
-            seasons = [latest]
+            self.save_driver_standing(latest, round)
         else:
-            seasons = Season.objects.values_list('season', flat=True)
-
-        for year in seasons:
-            drivers_standing = fetch_json(self, f'/{year}/driverStandings')
-
-            for standing in drivers_standing:
-
-                driver = standing['Driver']['driverId']
-                position = standing.get('position', ''),
-                positionText = standing['positionText']
-                points = standing['points']
-                wins = standing['wins']
-
-                for constructor in standing['Constructors']:
-
-                    Driverstanding.objects.update_or_create(
-                        season_id = year,
-                        driver_id = driver,
-                        defaults = {
-                            'constructor_id': constructor['constructorId'],
-                            'position': position,
-                            'positionText': positionText,
-                            'points': points,
-                            'wins': wins,
-                        }
-                    )
-
-    def load_constructor_standing(self, latest = 0):
+            self.backfill_standings()
+
+    def save_driver_standing(self, year, round = None):
+        drivers_standing = fetch_json(self, season_endpoint('driverStandings', year, round))
+
+        rows = []
+        for standing in drivers_standing:
+
+            # Bei mehreren Teams in einer Saison gewinnt (wie bisher) das letzte
+            for constructor in standing['Constructors']:
+                rows.append({
+                    'season_id': year,
+                    'driver_id': standing['Driver']['driverId'],
+                    'constructor_id': constructor['constructorId'],
+                    'position': standing.get('position', ''),
+                    'positionText': standing['positionText'],
+                    'points': standing['points'],
+                    'wins': standing['wins'],
+                })
+                rows[-1].update(standing_numbers(rows[-1]))
+
+        self.upsert(
+            Driverstanding, rows, ['season', 'driver'],
+            ['constructor', 'position', 'positionText', 'points', 'wins'] + STANDING_NUMERIC_FIELDS,
+        )
+
+    def load_constructor_standing(self, latest = 0, round = None):
 
         if latest != 0:
-            seasons = [latest]
+            self.save_constructor_standing(latest, round)
         else:
-            seasons = Season.objects.values_list('season', flat=True)
-
-        for year in seasons:
-            constructors_standing = fetch_json(self, f'/{year}/constructorstandings')
-
-            for standing in constructors_standing:
-
-                Constructorstanding.objects.update_or_create(
-                    season_id = year,
-                    constructor_id = standing['Constructor']['constructorId'],
-                    defaults = {
-                        'position': standing.get('position', ''),
-                        'positionText': standing['positionText'],
-                        'points': standing['points'],
-                        'wins': standing['wins'],
-                    }
-                )
+            self.backfill_standings()
+
+    def save_constructor_standing(self, year, round = None):
+        constructors_standing = fetch_json(self, season_endpoint('constructorstandings', year, round))
+
+        rows = []
+        for standing in constructors_standing:
+            rows.append({
+                'season_id': year,
+                'constructor_id': standing['Constructor']['constructorId'],
+                'position': standing.get('position', ''),
+                'positionText': standing['positionText'],
+                'points': standing['points'],
+                'wins': standing['wins'],
+            })
+            rows[-1].update(standing_numbers(rows[-1]))
+
+        self.upsert(
+            Constructorstanding, rows, ['season', 'constructor'],
+            ['position', 'positionText', 'points', 'wins'] + STANDING_NUMERIC_FIELDS,
+        )
 
 
     # erstmal weglassen wird nicht benoetigt
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_type', models.CharField(max_length=50)),
+                ('last_round', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalog.season')),
+            ],
+            options={
+                'unique_together': {('data_type', 'season')},
+            },
+        ),
+    ]
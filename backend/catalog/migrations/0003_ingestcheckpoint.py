@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_ingestwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk', models.CharField(max_length=50)),
+                ('season', models.CharField(blank=True, max_length=5)),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('chunk', 'season')},
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:49
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def to_milliseconds(time_str):
+    """Rundenzeit wie "1:27.097" in Millisekunden, leer oder unlesbar -> None."""
+    if not time_str:
+        return None
+    try:
+        *head, seconds = time_str.strip().split(':')
+        total = float(seconds)
+        for i, part in enumerate(reversed(head)):
+            total += int(part) * 60 ** (i + 1)
+    except ValueError:
+        return None
+    return round(total * 1000)
+
+
+def fill_race_outcomes(apps, schema_editor):
+    Result = apps.get_model('catalog', 'Result')
+    RaceOutcome = apps.get_model('catalog', 'RaceOutcome')
+
+    by_race = defaultdict(list)
+    for race_id, position, driver_id, fastest_lap in (
+        Result.objects.values_list('date_id', 'position', 'driver_id', 'fastest_lap').iterator()
+    ):
+        by_race[race_id].append((position, driver_id, fastest_lap))
+
+    outcomes = []
+    for race_id, race_results in by_race.items():
+        numeric = []
+        fastest = []
+        for position, driver_id, fastest_lap in race_results:
+            try:
+                numeric.append((int(position), driver_id))
+            except (ValueError, TypeError):
+                pass
+            lap_ms = to_milliseconds(fastest_lap)
+            if lap_ms is not None:
+                fastest.append((lap_ms, driver_id))
+        numeric.sort()
+        fastest.sort()
+
+        classified = [driver_id for _, driver_id in numeric]
+        outcomes.append(RaceOutcome(
+            race_id=race_id,
+            winner_id=classified[0] if classified else None,
+            podium=classified[:3],
+            classified=classified,
+            bottom_10=classified[::-1][:10],
+            fastest_lap_driver_id=fastest[0][1] if fastest else None,
+            fastest_lap_ms=fastest[0][0] if fastest else None,
+        ))
+    # Tabelle wird in dieser Migration angelegt – reines INSERT genügt
+    RaceOutcome.objects.bulk_create(outcomes, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_ingestcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaceOutcome',
+            fields=[
+                ('race', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='outcome', serialize=False, to='catalog.race')),
+                ('podium', models.JSONField(default=list)),
+                ('classified', models.JSONField(default=list)),
+                ('bottom_10', models.JSONField(default=list)),
+                ('fastest_lap_ms', models.IntegerField(blank=True, null=True)),
+                ('fastest_lap_driver', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.driver')),
+                ('winner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.driver')),
+            ],
+        ),
+        migrations.RunPython(fill_race_outcomes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,192 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:51
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+
+
+def to_milliseconds(time_str):
+    """Zeit wie "1:27.097" oder "1:31:44.742" in Millisekunden, leer oder unlesbar -> None."""
+    if not time_str:
+        return None
+    try:
+        *head, seconds = time_str.strip().split(':')
+        total = float(seconds)
+        for i, part in enumerate(reversed(head)):
+            total += int(part) * 60 ** (i + 1)
+    except ValueError:
+        return None
+    return round(total * 1000)
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def to_decimal(value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def race_time_ms(time_str, winner_ms):
+    """Abstände ("+5.123") werden auf die Siegerzeit addiert."""
+    if time_str and time_str.startswith('+'):
+        gap = to_milliseconds(time_str[1:])
+        return winner_ms + gap if gap is not None and winner_ms is not None else None
+    return to_milliseconds(time_str)
+
+
+BATCH_SIZE = 1000
+
+
+def fill_typed(model, numbers, fields, source_fields):
+    batch = []
+    for obj in model.objects.only('pk', *source_fields).iterator(chunk_size=BATCH_SIZE):
+        for name, value in numbers(obj).items():
+            setattr(obj, name, value)
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, fields)
+
+
+def fill_numeric_columns(apps, schema_editor):
+    Result = apps.get_model('catalog', 'Result')
+    # Abstände ("+5.123") beziehen sich auf die Zeit des Siegers
+    winner_ms = {
+        date_id: to_milliseconds(time)
+        for date_id, time in Result.objects.filter(position='1').values_list('date_id', 'time')
+    }
+    fill_typed(
+        Result,
+        lambda r: {
+            'position_num': to_int(r.position),
+            'grid_num': to_int(r.grid),
+            'laps_num': to_int(r.laps),
+            'points_num': to_decimal(r.points),
+            'time_ms': race_time_ms(r.time, winner_ms.get(r.date_id)),
+            'fastest_lap_ms': to_milliseconds(r.fastest_lap),
+        },
+        ['position_num', 'grid_num', 'laps_num', 'points_num', 'time_ms', 'fastest_lap_ms'],
+        ['date_id', 'position', 'grid', 'laps', 'points', 'time', 'fastest_lap'],
+    )
+    fill_typed(
+        apps.get_model('catalog', 'QualifyingResult'),
+        lambda q: {
+            'position_num': to_int(q.position),
+            'q1_ms': to_milliseconds(q.q1),
+            'q2_ms': to_milliseconds(q.q2),
+            'q3_ms': to_milliseconds(q.q3),
+        },
+        ['position_num', 'q1_ms', 'q2_ms', 'q3_ms'],
+        ['position', 'q1', 'q2', 'q3'],
+    )
+    for name in ('Driverstanding', 'Constructorstanding'):
+        fill_typed(
+            apps.get_model('catalog', name),
+            lambda s: {
+                'position_num': to_int(s.position),
+                'points_num': to_decimal(s.points),
+                'wins_num': to_int(s.wins),
+            },
+            ['position_num', 'points_num', 'wins_num'],
+            ['position', 'points', 'wins'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_raceoutcome'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='constructorstanding',
+            name='points_num',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='constructorstanding',
+            name='position_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='constructorstanding',
+            name='wins_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='driverstanding',
+            name='points_num',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='driverstanding',
+            name='position_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='driverstanding',
+            name='wins_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualifyingresult',
+            name='position_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualifyingresult',
+            name='q1_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualifyingresult',
+            name='q2_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualifyingresult',
+            name='q3_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='fastest_lap_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='grid_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='laps_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='points_num',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='position_num',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='time_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_numeric_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_numeric_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='constructorstanding',
+            index=models.Index(fields=['season', 'position_num'], name='cstanding_season_pos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverstanding',
+            index=models.Index(fields=['season', 'position_num'], name='dstanding_season_pos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='qualifyingresult',
+            index=models.Index(fields=['driver', 'position'], name='quali_driver_pos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['season', 'date'], name='race_season_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['driver', 'date'], name='result_driver_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['constructor', 'date'], name='result_constr_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(condition=models.Q(('position__in', ['1', '2', '3'])), fields=['driver'], name='result_podium_driver_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(condition=models.Q(('position__in', ['1', '2', '3'])), fields=['constructor'], name='result_podium_constr_idx'),
+        ),
+    ]
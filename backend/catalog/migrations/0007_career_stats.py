@@ -0,0 +1,174 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:57
+
+from collections import defaultdict
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+BATCH_SIZE = 1000
+
+
+def fill_career_stats(apps, schema_editor):
+    """
+    Erstbefüllung der Statistik-Tabellen. Die Tabellen werden in dieser
+    Migration angelegt – reines INSERT genügt (die unique_together-Indizes
+    entstehen erst am Ende der Migration, ON CONFLICT ginge hier noch nicht).
+    """
+    Result = apps.get_model('catalog', 'Result')
+    QualifyingResult = apps.get_model('catalog', 'QualifyingResult')
+    Driverstanding = apps.get_model('catalog', 'Driverstanding')
+    Constructorstanding = apps.get_model('catalog', 'Constructorstanding')
+    DriverTeam = apps.get_model('catalog', 'DriverTeam')
+
+    driver_seasons = defaultdict(lambda: {
+        'races': 0, 'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0), 'best_grid': None, 'champion': False,
+    })
+    for row in Result.objects.values('driver_id', 'date__season_id').order_by().annotate(
+        races=Count('id'),
+        wins=Count('id', filter=Q(position_num=1)),
+        podiums=Count('id', filter=Q(position_num__lte=3)),
+        points=Sum('points_num'),
+        best_grid=Min('grid_num', filter=Q(grid_num__gt=0)),
+    ):
+        driver_seasons[(row['driver_id'], row['date__season_id'])].update(
+            races=row['races'], wins=row['wins'], podiums=row['podiums'],
+            points=row['points'] or Decimal(0), best_grid=row['best_grid'],
+        )
+    for row in QualifyingResult.objects.filter(position_num=1).values(
+        'driver_id', 'date__season_id'
+    ).order_by().annotate(poles=Count('id')):
+        driver_seasons[(row['driver_id'], row['date__season_id'])]['poles'] = row['poles']
+    for key in Driverstanding.objects.filter(positionText='1').values_list('driver_id', 'season_id'):
+        driver_seasons[key]['champion'] = True
+
+    constructor_seasons = defaultdict(lambda: {'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0)})
+    for row in Result.objects.filter(position_num__lte=3).values(
+        'constructor_id', 'date__season_id'
+    ).order_by().annotate(podiums=Count('id')):
+        constructor_seasons[(row['constructor_id'], row['date__season_id'])]['podiums'] = row['podiums']
+    for constructor_id, season_id, points, wins in Constructorstanding.objects.values_list(
+        'constructor_id', 'season_id', 'points_num', 'wins_num'
+    ):
+        stats = constructor_seasons[(constructor_id, season_id)]
+        stats['points'] = points or Decimal(0)
+        stats['wins'] = wins or 0
+
+    team_of = {}
+    drivers_active, constructors_active = defaultdict(set), defaultdict(set)
+    for season_id, driver_id, constructor_id in DriverTeam.objects.values_list('season_id', 'driver_id',
+                                                                             'constructor_id'):
+        team_of[(season_id, driver_id)] = constructor_id
+        drivers_active[driver_id].add(season_id)
+        constructors_active[constructor_id].add(season_id)
+    # Poles zählen für das Team, für das der Fahrer in der Saison fuhr
+    for driver_id, season_id in QualifyingResult.objects.filter(position_num=1).values_list(
+        'driver_id', 'date__season_id'
+    ):
+        constructor_id = team_of.get((season_id, driver_id))
+        if constructor_id is not None:
+            constructor_seasons[(constructor_id, season_id)]['poles'] += 1
+
+    driver_careers = {
+        driver_id: {'races': 0, 'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0), 'best_grid': None,
+                    'championships': 0, 'seasons_active': sorted(drivers_active[driver_id], reverse=True)}
+        for driver_id in set(drivers_active) | {driver_id for driver_id, _ in driver_seasons}
+    }
+    for (driver_id, _), stats in driver_seasons.items():
+        career = driver_careers[driver_id]
+        for field in ('races', 'wins', 'podiums', 'poles', 'points'):
+            career[field] += stats[field]
+        career['championships'] += stats['champion']
+        if stats['best_grid'] is not None:
+            career['best_grid'] = min(filter(None, (career['best_grid'], stats['best_grid'])))
+
+    constructor_careers = {
+        constructor_id: {'wins': 0, 'podiums': 0, 'poles': 0, 'points': Decimal(0),
+                         'seasons_active': sorted(constructors_active[constructor_id], reverse=True)}
+        for constructor_id in set(constructors_active) | {c for c, _ in constructor_seasons}
+    }
+    for (constructor_id, _), stats in constructor_seasons.items():
+        for field in ('wins', 'podiums', 'poles', 'points'):
+            constructor_careers[constructor_id][field] += stats[field]
+
+    for name, rows in (
+        ('DriverSeasonStats', [{'driver_id': d, 'season_id': s, **stats} for (d, s), stats in driver_seasons.items()]),
+        ('DriverCareerStats', [{'driver_id': d, **stats} for d, stats in driver_careers.items()]),
+        ('ConstructorSeasonStats',
+         [{'constructor_id': c, 'season_id': s, **stats} for (c, s), stats in constructor_seasons.items()]),
+        ('ConstructorCareerStats', [{'constructor_id': c, **stats} for c, stats in constructor_careers.items()]),
+    ):
+        model = apps.get_model('catalog', name)
+        model.objects.bulk_create([model(**row) for row in rows], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructorCareerStats',
+            fields=[
+                ('constructor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='career_stats', serialize=False, to='catalog.constructor')),
+                ('wins', models.IntegerField(default=0)),
+                ('podiums', models.IntegerField(default=0)),
+                ('poles', models.IntegerField(default=0)),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('seasons_active', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DriverCareerStats',
+            fields=[
+                ('driver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='career_stats', serialize=False, to='catalog.driver')),
+                ('races', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('podiums', models.IntegerField(default=0)),
+                ('poles', models.IntegerField(default=0)),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('best_grid', models.IntegerField(blank=True, null=True)),
+                ('championships', models.IntegerField(default=0)),
+                ('seasons_active', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConstructorSeasonStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wins', models.IntegerField(default=0)),
+                ('podiums', models.IntegerField(default=0)),
+                ('poles', models.IntegerField(default=0)),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('constructor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='catalog.constructor')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalog.season')),
+            ],
+            options={
+                'unique_together': {('constructor', 'season')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DriverSeasonStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('races', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('podiums', models.IntegerField(default=0)),
+                ('poles', models.IntegerField(default=0)),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('best_grid', models.IntegerField(blank=True, null=True)),
+                ('champion', models.BooleanField(default=False)),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='catalog.driver')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalog.season')),
+            ],
+            options={
+                'unique_together': {('driver', 'season')},
+            },
+        ),
+        migrations.RunPython(fill_career_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_career_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_podium_driver_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_podium_constr_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(condition=models.Q(('position_num__lte', 3)), fields=['driver'], name='result_podium_driver_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(condition=models.Q(('position_num__lte', 3)), fields=['constructor'], name='result_podium_constr_idx'),
+        ),
+    ]
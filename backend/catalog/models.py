@@ -8,6 +8,25 @@ class DataUpdate(models.Model):
     name      = models.CharField(max_length=50, unique=True)
     last_run  = models.DateTimeField(auto_now=True)
 
+class IngestWatermark(models.Model):
+    """Letzte vollständig eingelesene Runde je Datentyp und Saison (populate_f1)."""
+    data_type  = models.CharField(max_length=50)
+    season     = models.ForeignKey('Season', on_delete=models.CASCADE)
+    last_round = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('data_type', 'season'),)
+
+class IngestCheckpoint(models.Model):
+    """Abgeschlossener Abschnitt (Tabelle + Saison) des ersten Komplett-Imports."""
+    chunk        = models.CharField(max_length=50)
+    season       = models.CharField(max_length=5, blank=True)
+    completed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('chunk', 'season'),)
+
 class Season(models.Model):
     season = models.CharField(primary_key=True, max_length=5)
 
@@ -36,6 +55,11 @@ class Race(models.Model):
     circuit = models.ForeignKey(Circuit, on_delete=models.CASCADE)
     round = models.CharField(max_length=100)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['season', 'date'], name='race_season_date_idx'),
+        ]
+
 class DriverTeam(models.Model):
     season = models.ForeignKey(Season, on_delete=models.CASCADE)
     driver = models.ForeignKey(Driver, on_delete=models.CASCADE)
@@ -52,9 +76,17 @@ class QualifyingResult(models.Model):
     q1 = models.CharField(null=True, blank=True, max_length=100)
     q2 = models.CharField(null=True, blank=True, max_length=100)
     q3 = models.CharField(null=True, blank=True, max_length=100)
+    # Typisierte Spalten (Text oben bleibt für die Anzeige)
+    position_num = models.IntegerField(null=True, blank=True)
+    q1_ms = models.IntegerField(null=True, blank=True)
+    q2_ms = models.IntegerField(null=True, blank=True)
+    q3_ms = models.IntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = (('date', 'driver'),)
+        indexes = [
+            models.Index(fields=['driver', 'position'], name='quali_driver_pos_idx'),
+        ]
 
 class Result(models.Model):
     date = models.ForeignKey(Race, on_delete=models.CASCADE)
@@ -69,9 +101,90 @@ class Result(models.Model):
     time = models.CharField(max_length=100, blank=True)
     fastest_lap = models.CharField(max_length=100, blank=True)
     status = models.CharField(max_length=100)
+    # Typisierte Spalten (Text oben bleibt für die Anzeige)
+    position_num = models.IntegerField(null=True, blank=True)
+    grid_num = models.IntegerField(null=True, blank=True)
+    laps_num = models.IntegerField(null=True, blank=True)
+    points_num = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    time_ms = models.IntegerField(null=True, blank=True)
+    fastest_lap_ms = models.IntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = (('date', 'driver'),)
+        indexes = [
+            models.Index(fields=['driver', 'date'], name='result_driver_date_idx'),
+            models.Index(fields=['constructor', 'date'], name='result_constr_date_idx'),
+            # Podien (Fahrer- und Teamansicht) – nur ein kleiner Teil der Ergebnisse
+            models.Index(fields=['driver'], condition=models.Q(position_num__lte=3),
+                         name='result_podium_driver_idx'),
+            models.Index(fields=['constructor'], condition=models.Q(position_num__lte=3),
+                         name='result_podium_constr_idx'),
+        ]
+
+class RaceOutcome(models.Model):
+    """
+    Vorberechneter Ausgang eines Rennens (wird von populate_f1 nach den Ergebnissen geschrieben).
+    classified: alle numerisch gewerteten Fahrer in Zielreihenfolge
+    bottom_10:  die zehn schlechtesten davon, schlechtester zuerst
+    """
+    race = models.OneToOneField(Race, on_delete=models.CASCADE, primary_key=True, related_name='outcome')
+    winner = models.ForeignKey(Driver, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    podium = models.JSONField(default=list)
+    classified = models.JSONField(default=list)
+    bottom_10 = models.JSONField(default=list)
+    fastest_lap_driver = models.ForeignKey(Driver, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    fastest_lap_ms = models.IntegerField(null=True, blank=True)
+
+class DriverSeasonStats(models.Model):
+    """Kennzahlen eines Fahrers in einer Saison (von populate_f1 inkrementell neu berechnet)."""
+    driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name='season_stats')
+    season = models.ForeignKey(Season, on_delete=models.CASCADE)
+    races = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    podiums = models.IntegerField(default=0)
+    poles = models.IntegerField(default=0)
+    points = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    best_grid = models.IntegerField(null=True, blank=True)
+    champion = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = (('driver', 'season'),)
+
+class DriverCareerStats(models.Model):
+    """Karriere-Summe über DriverSeasonStats – Grundlage der Fahrer-Detailansicht."""
+    driver = models.OneToOneField(Driver, on_delete=models.CASCADE, primary_key=True, related_name='career_stats')
+    races = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    podiums = models.IntegerField(default=0)
+    poles = models.IntegerField(default=0)
+    points = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    best_grid = models.IntegerField(null=True, blank=True)
+    championships = models.IntegerField(default=0)
+    seasons_active = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class ConstructorSeasonStats(models.Model):
+    """Kennzahlen eines Teams in einer Saison (Punkte/Siege aus der Team-WM)."""
+    constructor = models.ForeignKey(Constructor, on_delete=models.CASCADE, related_name='season_stats')
+    season = models.ForeignKey(Season, on_delete=models.CASCADE)
+    wins = models.IntegerField(default=0)
+    podiums = models.IntegerField(default=0)
+    poles = models.IntegerField(default=0)
+    points = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = (('constructor', 'season'),)
+
+class ConstructorCareerStats(models.Model):
+    """Karriere-Summe über ConstructorSeasonStats – Grundlage der Team-Detailansicht."""
+    constructor = models.OneToOneField(Constructor, on_delete=models.CASCADE, primary_key=True,
+                                       related_name='career_stats')
+    wins = models.IntegerField(default=0)
+    podiums = models.IntegerField(default=0)
+    poles = models.IntegerField(default=0)
+    points = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    seasons_active = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
 
 # class LapTime(models.Model):
 #     date = models.ForeignKey(Race, on_delete=models.CASCADE)
@@ -92,9 +205,16 @@ class Driverstanding(models.Model):
     positionText = models.CharField(max_length=100)
     points = models.CharField(max_length=100)
     wins = models.CharField(max_length=100)
+    # Typisierte Spalten (Text oben bleibt für die Anzeige)
+    position_num = models.IntegerField(null=True, blank=True)
+    points_num = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    wins_num = models.IntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = (('season', 'driver'),)
+        indexes = [
+            models.Index(fields=['season', 'position_num'], name='dstanding_season_pos_idx'),
+        ]
 
 
 class Constructorstanding(models.Model):
@@ -104,6 +224,13 @@ class Constructorstanding(models.Model):
     positionText = models.CharField(max_length=100)
     points = models.CharField(max_length=100)
     wins = models.CharField(max_length=100)
+    # Typisierte Spalten (Text oben bleibt für die Anzeige)
+    position_num = models.IntegerField(null=True, blank=True)
+    points_num = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    wins_num = models.IntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = (('season', 'constructor'),)
+        indexes = [
+            models.Index(fields=['season', 'position_num'], name='cstanding_season_pos_idx'),
+        ]
@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+from catalog.models import Result, RaceOutcome
+from catalog.upsert import bulk_upsert
+from catalog.utils import to_milliseconds
+
+OUTCOME_FIELDS = ['winner', 'podium', 'classified', 'bottom_10', 'fastest_lap_driver', 'fastest_lap_ms']
+
+
+def build_outcome_rows(results):
+    """
+    results: Iterable von (race_id, position, driver_id, fastest_lap)
+    Liefert je Rennen eine Zeile für RaceOutcome.
+    """
+    by_race = defaultdict(list)
+    for race_id, position, driver_id, fastest_lap in results:
+        by_race[race_id].append((position, driver_id, fastest_lap))
+
+    rows = []
+    for race_id, race_results in by_race.items():
+        numeric = []
+        fastest = []
+        for position, driver_id, fastest_lap in race_results:
+            try:
+                numeric.append((int(position), driver_id))
+            except (ValueError, TypeError):
+                pass
+            lap_ms = to_milliseconds(fastest_lap)
+            if lap_ms is not None:
+                fastest.append((lap_ms, driver_id))
+        numeric.sort()
+        fastest.sort()
+
+        classified = [driver_id for _, driver_id in numeric]
+        rows.append({
+            'race_id': race_id,
+            'winner_id': classified[0] if classified else None,
+            'podium': classified[:3],
+            'classified': classified,
+            'bottom_10': classified[::-1][:10],
+            'fastest_lap_driver_id': fastest[0][1] if fastest else None,
+            'fastest_lap_ms': fastest[0][0] if fastest else None,
+        })
+    return rows
+
+
+def refresh_race_outcomes(race_dates):
+    """Berechnet RaceOutcome für die angegebenen Rennen neu (ein SELECT, ein Upsert)."""
+    results = Result.objects.filter(date__in=race_dates).values_list(
+        'date_id', 'position', 'driver_id', 'fastest_lap'
+    )
+    rows = build_outcome_rows(results)
+    return bulk_upsert(RaceOutcome, rows, ['race'], OUTCOME_FIELDS)
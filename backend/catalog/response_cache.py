@@ -0,0 +1,145 @@
+import hashlib
+import json
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+
+from catalog.models import DataUpdate
+
+VERSION_NAME = 'data_version'
+# Die Version steht in der DataUpdate-Zeile (für alle Prozesse gleich); jeder Prozess
+# merkt sie sich nur kurz, ein Lauf von populate_f1 in einem anderen Prozess wirkt also
+# spätestens nach VERSION_TTL Sekunden – unabhängig davon, ob der Cache geteilt ist.
+VERSION_TTL = 5
+_memo = {'version': None, 'until': 0.0}
+RESPONSE_PREFIX = 'catalog:response'
+# Antworten bleiben bis zur nächsten Datenversion gültig – das Timeout begrenzt nur den Speicher
+RESPONSE_TIMEOUT = 6 * 60 * 60
+# Wie lange Browser/CDN eine GET-Antwort ohne Nachfrage verwenden dürfen
+MAX_AGE = getattr(settings, 'CATALOG_RESPONSE_MAX_AGE', 5 * 60)
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_RESPONSE_CACHE', 'default')]
+
+
+def _version(upd):
+    return upd.last_run.strftime('%Y%m%d%H%M%S%f') if upd else '0'
+
+
+def _remembered():
+    return _memo['version'] if time.monotonic() < _memo['until'] else None
+
+
+def _remember(upd):
+    _memo.update(version=_version(upd), until=time.monotonic() + VERSION_TTL)
+    return _memo['version']
+
+
+def get_data_version():
+    """Aktuelle Datenversion (Zeitpunkt des letzten populate_f1-Laufs)."""
+    return _remembered() or _remember(DataUpdate.objects.filter(name=VERSION_NAME).first())
+
+
+async def aget_data_version():
+    """Wie get_data_version, für die async Views."""
+    return _remembered() or _remember(await DataUpdate.objects.filter(name=VERSION_NAME).afirst())
+
+
+def bump_data_version():
+    """Wird von populate_f1 nach jedem Lauf aufgerufen – alle gecachten Antworten verfallen."""
+    DataUpdate.objects.update_or_create(name=VERSION_NAME)
+    _memo['until'] = 0.0
+
+
+def request_params(request):
+    """Parameter aus dem JSON-Body (POST) oder der Query (GET-Alias) – DRF- und einfache Django-Requests."""
+    if request.method == 'GET':
+        return getattr(request, 'query_params', request.GET)
+    if hasattr(request, 'data'):
+        return request.data
+    try:
+        params = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return params if isinstance(params, dict) else {}
+
+
+def _normalized(request):
+    """Parameter sortiert und als Strings – {"year": 2024} (POST) und ?year=2024 (GET) ergeben denselben Schlüssel."""
+    params = request_params(request)
+    if hasattr(params, 'lists'):
+        params = {key: values[0] if len(values) == 1 else values for key, values in params.lists()}
+    return json.dumps(
+        {key: [str(v) for v in value] if isinstance(value, list) else str(value) for key, value in params.items()},
+        sort_keys=True,
+    )
+
+
+def _key(view, request, version):
+    digest = hashlib.md5(_normalized(request).encode()).hexdigest()
+    return f'{RESPONSE_PREFIX}:{view.__name__}:{version}:{digest}'
+
+
+def _entry(response):
+    return {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+    }
+
+
+def _respond(request, cached):
+    if cached['etag'] in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(cached['content'], content_type=cached['content_type'])
+    response['ETag'] = cached['etag']
+    if request.method == 'GET':
+        patch_cache_control(response, public=True, max_age=MAX_AGE)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def cached_response(view):
+    """
+    Cacht die Antwort eines lesenden Catalog-Endpunkts unter
+    Endpunkt + normalisierten Parametern + Datenversion und beantwortet
+    If-None-Match mit 304. Unter @api_view anwenden; async Views werden
+    mit dem async Cache-API bedient.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            key = _key(view, request, await aget_data_version())
+            cached = await _cache().aget(key)
+            if cached is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cached = _entry(response)
+                await _cache().aset(key, cached, RESPONSE_TIMEOUT)
+            return _respond(request, cached)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = _key(view, request, get_data_version())
+        cached = _cache().get(key)
+        if cached is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = _entry(response)
+            _cache().set(key, cached, RESPONSE_TIMEOUT)
+        return _respond(request, cached)
+
+    return wrapper
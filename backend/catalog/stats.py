@@ -0,0 +1,196 @@
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+
+from catalog.models import Result
+
+PERCENTILES = [0, 25, 50, 75, 100]
+
+
+def _number(value):
+    """numpy-Wert -> int/float/None für JSON (ganze Werte als int, NaN als None)."""
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+@contextmanager
+def _quiet():
+    """Leere Zeilen (nur NaN) sind erlaubt – numpy soll dafür nicht warnen."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        yield
+
+
+def padded(series):
+    """Liste ungleich langer Reihen -> 2D-Array, rechts mit NaN aufgefüllt."""
+    width = max((len(s) for s in series), default=0)
+    matrix = np.full((len(series), width), np.nan)
+    for i, s in enumerate(series):
+        matrix[i, :len(s)] = s
+    return matrix
+
+
+def quartiles(matrix):
+    """
+    min, Q1, Median, Q3, max je Zeile (NaN ignoriert, lineare Interpolation wie bisher).
+    Statt np.nanpercentile (intern eine Schleife über die Zeilen) wird einmal sortiert –
+    NaN landet dabei hinten – und je Zeile an den Stellen (n - 1) * p interpoliert.
+    """
+    rows = matrix.shape[0]
+    if matrix.size == 0:
+        return np.full((rows, len(PERCENTILES)), np.nan)
+    ordered = np.sort(matrix, axis=1)
+    count = (~np.isnan(ordered)).sum(axis=1)
+
+    k = (np.maximum(count, 1) - 1)[:, None] * (np.array(PERCENTILES) / 100.0)
+    lower = np.floor(k).astype(int)
+    upper = np.ceil(k).astype(int)
+    low = np.take_along_axis(ordered, lower, axis=1)
+    high = np.take_along_axis(ordered, upper, axis=1)
+    result = low + (high - low) * (k - lower)
+    result[count == 0] = np.nan
+    return result
+
+
+def box_plots(labels, series):
+    """Box-Plot-Payload für mehrere Reihen in einem Durchgang (labels -> "x")."""
+    if not series:
+        return []
+    boxes = []
+    for label, positions, q in zip(labels, series, quartiles(padded(series)).tolist()):
+        q = [int(v) if v.is_integer() else v for v in q]
+        boxes.append({
+            "x":             label,
+            "positions":     list(positions),
+            "min":           q[0],
+            "firstQuartile": q[1],
+            "median":        q[2],
+            "thirdQuartile": q[3],
+            "max":           q[4],
+        })
+    return boxes
+
+
+def _indices(values, ordered):
+    lookup = {value: i for i, value in enumerate(ordered)}
+    return np.fromiter(map(lookup.__getitem__, values), dtype=int, count=len(values))
+
+
+class SeasonMatrix:
+    """
+    Ergebnisse einer Saison als Matrizen Fahrer × Runden (eine Abfrage).
+      positions: Zielposition laut Ergast (NaN = nicht gestartet)
+      finishes:  wie positions, aber NaN für Ausfälle (positionText nicht numerisch)
+      grid:      Startplatz (NaN = Boxengasse oder unbekannt)
+      team:      Team-Index je Fahrer und Runde (-1 = nicht gestartet)
+    """
+
+    def __init__(self, rows):
+        races, drivers, teams, positions, grids, texts = (list(col) for col in zip(*rows)) if rows else ([],) * 6
+        self.rounds = sorted(set(races))
+        self.drivers = sorted(set(drivers))
+        self.teams = sorted(set(teams))
+
+        shape = (len(self.drivers), len(self.rounds))
+        self.positions = np.full(shape, np.nan)
+        self.finishes = np.full(shape, np.nan)
+        self.grid = np.full(shape, np.nan)
+        self.team = np.full(shape, -1)
+        if not races:
+            return
+
+        d = _indices(drivers, self.drivers)
+        c = _indices(races, self.rounds)
+        # None -> NaN; Startplatz 0 (Boxengasse) zählt nicht als Startplatz
+        position = np.array(positions, dtype=float)
+        grid = np.array(grids, dtype=float)
+        grid[grid == 0] = np.nan
+        classified = np.array([text.isdigit() for text in texts], dtype=bool)
+
+        self.positions[d, c] = position
+        self.finishes[d, c] = np.where(classified, position, np.nan)
+        self.grid[d, c] = grid
+        self.team[d, c] = _indices(teams, self.teams)
+
+    @classmethod
+    def load(cls, season):
+        return cls(
+            Result.objects
+            .filter(date__season=season)
+            .values_list('date_id', 'driver_id', 'constructor_id', 'position_num', 'grid_num', 'position_text')
+        )
+
+    def driver_stats(self):
+        """
+        Kennzahlen aller Fahrer auf einmal:
+          races, finish_rate, mean_finish, avg_gain (Startplatz minus Ziel, positiv = gewonnen),
+          teammate_delta (Ziel minus Schnitt der Teamkollegen, negativ = besser), quartiles
+        """
+        if not self.drivers:
+            return {}
+        with _quiet():
+            entered = ~np.isnan(self.positions)
+            classified = ~np.isnan(self.finishes)
+            races = entered.sum(axis=1)
+            finish_rate = classified.sum(axis=1) / np.maximum(races, 1)
+            mean_finish = np.nanmean(self.finishes, axis=1)
+            avg_gain = np.nanmean(self.grid - self.finishes, axis=1)
+
+            # Summe und Anzahl gewerteter Ergebnisse je (Team, Runde) als flacher Index
+            rounds = len(self.rounds)
+            slot = np.where(self.team >= 0, self.team * rounds + np.arange(rounds), 0)
+            size = len(self.teams) * rounds
+            own = np.where(classified, self.finishes, 0)
+            team_sum = np.bincount(slot[classified], weights=own[classified], minlength=size)
+            team_count = np.bincount(slot[classified], minlength=size)
+
+            # Schnitt der Teamkollegen in derselben Runde (ohne den Fahrer selbst)
+            mates = np.where(classified, team_count[slot] - 1, 0)
+            mates_mean = (team_sum[slot] - own) / np.where(mates > 0, mates, 1)
+            delta = np.where(mates > 0, self.finishes - mates_mean, np.nan)
+            teammate_delta = np.nanmean(delta, axis=1)
+
+            driver_quartiles = quartiles(self.positions)
+
+        return {
+            driver: {
+                'races': int(races[i]),
+                'finish_rate': _number(finish_rate[i]),
+                'mean_finish': _number(mean_finish[i]),
+                'avg_gain': _number(avg_gain[i]),
+                'teammate_delta': _number(teammate_delta[i]),
+                'quartiles': [_number(q) for q in driver_quartiles[i]],
+            }
+            for i, driver in enumerate(self.drivers)
+        }
+
+    def team_stats(self):
+        """Kennzahlen aller Teams auf einmal (über alle Fahrer und Runden des Teams)."""
+        with _quiet():
+            entered = self.team >= 0
+            classified = entered & ~np.isnan(self.finishes)
+            size = len(self.teams)
+
+            starts = np.bincount(self.team[entered], minlength=size)
+            finishes = np.bincount(self.team[classified], minlength=size)
+            finish_sum = np.bincount(self.team[classified], weights=self.finishes[classified], minlength=size)
+            gained = classified & ~np.isnan(self.grid)
+            gain_sum = np.bincount(self.team[gained], weights=(self.grid - self.finishes)[gained], minlength=size)
+            gain_count = np.bincount(self.team[gained], minlength=size)
+
+            finish_rate = finishes / np.maximum(starts, 1)
+            mean_finish = finish_sum / finishes
+            avg_gain = gain_sum / gain_count
+
+        return {
+            team: {
+                'starts': int(starts[i]),
+                'finish_rate': _number(finish_rate[i]),
+                'mean_finish': _number(mean_finish[i]),
+                'avg_gain': _number(avg_gain[i]),
+            }
+            for i, team in enumerate(self.teams)
+        }
@@ -1,3 +1,764 @@
-from django.test import TestCase
+import json
+import re
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from catalog.ergast import ErgastClient, ResponseCache
+from catalog.current_season import get_current_season, invalidate_current_season
+from catalog.career import refresh_career_stats
+from catalog.models import Season, Circuit, Driver, Constructor, DriverTeam, Constructorstanding, Race, Result, \
+    QualifyingResult, Driverstanding, DriverCareerStats, ConstructorCareerStats, DataUpdate, IngestWatermark, \
+    IngestCheckpoint
+from catalog.upsert import bulk_upsert
+from catalog.utils import result_numbers, standing_numbers
+from catalog.response_cache import get_data_version, bump_data_version
+from catalog import response_cache, stats
+from catalog.management.commands import populate_f1
+from catalog.management.commands.benchmark_stats import python_box_plots
+
+
+class BulkUpsertTestCase(TestCase):
+    def test_counts_inserted_and_updated_rows(self):
+        Circuit.objects.create(circuit='monza', name='Monza', location='Monza', country='Italy')
+
+        rows = [
+            {'circuit': 'monza', 'name': 'Autodromo Nazionale di Monza', 'location': 'Monza', 'country': 'Italy'},
+            {'circuit': 'spa', 'name': 'Spa-Francorchamps', 'location': 'Spa', 'country': 'Belgium'},
+            {'circuit': 'spa', 'name': 'Circuit de Spa-Francorchamps', 'location': 'Spa', 'country': 'Belgium'},
+        ]
+        inserted, updated = bulk_upsert(Circuit, rows, ['circuit'], ['name', 'location', 'country'], batch_size=1)
+
+        self.assertEqual((inserted, updated), (1, 1))
+        self.assertEqual(Circuit.objects.get(pk='monza').name, 'Autodromo Nazionale di Monza')
+        self.assertEqual(Circuit.objects.get(pk='spa').name, 'Circuit de Spa-Francorchamps')
+
+    def test_rows_without_update_fields_are_only_inserted(self):
+        Season.objects.create(season='2024')
+
+        inserted, updated = bulk_upsert(Season, [{'season': '2024'}, {'season': '2025'}], ['season'], [])
+
+        self.assertEqual((inserted, updated), (1, 1))
+        self.assertEqual(Season.objects.count(), 2)
+
+
+class CurrentSeasonTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        Season.objects.bulk_create([Season(season='999'), Season(season='2024'), Season(season='2025')])
+
+    def test_snapshot_is_cached_until_invalidated(self):
+        self.assertEqual(get_current_season()['years'], [2025, 2024, 999])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_season()['season'], '2025')
+
+        Season.objects.create(season='2026')
+        invalidate_current_season()
+        self.assertEqual(get_current_season()['season'], '2026')
+
+
+class CurrentTeamsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('get_current_teams')
+        Season.objects.create(season='2025')
+
+    def add_teams(self, count):
+        start = Constructor.objects.count()
+        for i in range(start, start + count):
+            team = Constructor.objects.create(constructor=f'team{i}', name=f'Team {i}', nationality='x')
+            Constructorstanding.objects.create(season_id='2025', constructor=team, position=str(i + 1),
+                                               position_num=i + 1, positionText=str(i + 1), points='0', wins='0')
+            for seat in range(2):
+                driver = Driver.objects.create(driver=f'd{i}_{seat}', forename='F', surname='S',
+                                               dob='1990-01-01', nationality='x')
+                DriverTeam.objects.create(season_id='2025', driver=driver, constructor=team,
+                                          driver_season_number=str(seat))
+
+    def test_query_count_does_not_grow_with_teams(self):
+        for count in (2, 8):
+            self.add_teams(count)
+            cache.clear()
+            # seasons, driver standings, season stats (drivers, teams), results matrix, driver teams,
+            # constructor standings
+            with self.assertNumQueries(7):
+                response = self.client.get(self.url)
+            self.assertTrue(all(len(t['drivers']) == 2 for t in response.json()['teams']))
+
+    def test_unchanged_season_returns_304(self):
+        self.add_teams(2)
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class CatalogDataMixin:
+    """Ein Fahrer bei Ferrari, je zwei Rennen in 2024 und 2025."""
+
+    def create_catalog_data(self):
+        circuit = Circuit.objects.create(circuit='monza', name='Monza', location='Monza', country='Italy')
+        self.team = Constructor.objects.create(constructor='ferrari', name='Ferrari', nationality='Italian')
+        self.driver = Driver.objects.create(driver='leclerc', forename='Charles', surname='Leclerc',
+                                            dob='1997-10-16', nationality='Monegasque')
+        for year, positions in (('2024', ['1', '4']), ('2025', ['2', '\\N'])):
+            Season.objects.create(season=year)
+            DriverTeam.objects.create(season_id=year, driver=self.driver, constructor=self.team,
+                                      driver_season_number='16')
+            for rnd, position in enumerate(positions, start=1):
+                race = Race.objects.create(date=f'{year}-0{rnd}-01', season_id=year, circuit=circuit, round=str(rnd))
+                Result.objects.create(date=race, driver=self.driver, constructor=self.team, number='16',
+                                      grid=str(rnd + 1), grid_num=rnd + 1, position=position,
+                                      position_num=int(position) if position.isdigit() else None,
+                                      position_text=position, points='10', points_num=10, laps='50', status='')
+            QualifyingResult.objects.create(date=race, driver=self.driver, position='1', position_num=1)
+        Driverstanding.objects.create(season_id='2024', driver=self.driver, constructor=self.team, position='1',
+                                      positionText='1', points='35', wins='1')
+
+
+class CareerStatsTestCase(CatalogDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_catalog_data()
+
+    def test_career_rows(self):
+        refresh_career_stats()
+
+        driver = DriverCareerStats.objects.get(pk='leclerc')
+        self.assertEqual((driver.races, driver.wins, driver.podiums, driver.poles), (4, 1, 2, 2))
+        self.assertEqual((driver.points, driver.best_grid, driver.championships), (40, 2, 1))
+        self.assertEqual(driver.seasons_active, ['2025', '2024'])
+        self.assertEqual(ConstructorCareerStats.objects.get(pk='ferrari').poles, 2)
+
+    def test_detail_view_is_one_row_lookup(self):
+        refresh_career_stats()
+        get_current_season()
+        get_data_version()
+
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('detailed_driver_view'), {'driver_id': 'leclerc'}, format='json')
+        self.assertEqual(response.json()['driver']['career_wins'], 1)
+        self.assertEqual(response.json()['driver']['current_season_podiums'], 1)
+
+    def test_missing_rows_are_served_zeroed_without_writes(self):
+        get_current_season()
+        get_data_version()
+
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('detailed_driver_view'), {'driver_id': 'leclerc'}, format='json')
+        self.assertEqual(response.json()['driver']['career_wins'], 0)
+        self.assertEqual(response.json()['driver']['seasons_active'], [])
+
+        for name, params in (('team_batch_view', {'team_ids': 'ferrari', 'sections': 'detail'}),
+                             ('async_detailed_team_view', {'team_id': 'ferrari'})):
+            self.assertEqual(self.client.get(reverse(name), params).status_code, 200)
+        self.assertFalse(DriverCareerStats.objects.exists())
+        self.assertFalse(ConstructorCareerStats.objects.exists())
+
+
+class BoxPlotTestCase(CatalogDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_catalog_data()
+        get_current_season()
+        get_data_version()
+
+    def test_all_seasons_in_one_query_then_cached(self):
+        url = reverse('get_team_box_plot')
+        # team lookup + one Result query for every season
+        with self.assertNumQueries(2):
+            boxes = self.client.post(url, {'team_id': 'ferrari'}, format='json').json()['boxPlots']
+        self.assertEqual([(b['x'], b['positions'], b['median']) for b in boxes], [(2025, [2], 2), (2024, [1, 4], 2.5)])
+
+        # andere Saisonanzahl: eigene Antwort, Box-Plots aber aus dem Cache
+        with self.assertNumQueries(1):
+            self.client.post(url, {'team_id': 'ferrari', 'seasons': 1}, format='json')
+
+    def test_season_count_is_bounded(self):
+        for name, params in (('get_team_box_plot', {'team_id': 'ferrari'}),
+                             ('get_box_plot', {'driver_id': 'leclerc'})):
+            url = reverse(name)
+            for seasons in (0, -3, 'x'):
+                response = self.client.post(url, {**params, 'seasons': seasons}, format='json')
+                self.assertEqual(response.status_code, 400, (name, seasons))
+            with mock.patch('catalog.views.MAX_BOX_PLOT_SEASONS', 1):
+                response = self.client.post(url, {**params, 'seasons': 10 ** 9}, format='json')
+            self.assertEqual(len(response.json()['boxPlots']), 1)
+
+
+class TeamStandingsTestCase(CatalogDataMixin, APITestCase):
+    url = '/api/catalog/team/getstandings'
+
+    def setUp(self):
+        cache.clear()
+        self.create_catalog_data()
+        get_data_version()
+
+    def test_one_result_query_for_the_season(self):
+        # season, team, drivers, results
+        with self.assertNumQueries(4):
+            races = self.client.post(self.url, {'team_id': 'ferrari', 'year': 2025}, format='json').json()['races']
+        self.assertEqual([(r['round'], r['driver_id'], r['position']) for r in races],
+                         [('1', 'leclerc', 2), ('2', 'leclerc', 9999)])
+
+    def test_columnar_format(self):
+        data = self.client.post(self.url, {'team_id': 'ferrari', 'year': 2024, 'format': 'columnar'},
+                                format='json').json()
+        self.assertEqual(data, {
+            'rounds': ['1', '2'],
+            'drivers': [{'driver': 'Charles Leclerc', 'driver_id': 'leclerc', 'positions': [1, 4]}],
+        })
+
+
+class AsyncViewsTestCase(CatalogDataMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_catalog_data()
+        refresh_career_stats()
+
+    def test_same_payload_as_sync_views(self):
+        for path, params in (
+            ('driver/detailedview', {'driver_id': 'leclerc'}),
+            ('team/detailedview', {'team_id': 'ferrari'}),
+            ('insigth/getdriverstandings', {'year': 2024}),
+            ('insigth/getteamstanding', {'year': 2024}),
+        ):
+            sync = self.client.post(f'/api/catalog/{path}', params, format='json')
+            cache.clear()
+            async_ = self.client.post(f'/api/catalog/async/{path}', params, format='json')
+            self.assertEqual(async_.status_code, 200, path)
+            self.assertEqual(async_.json(), sync.json(), path)
+
+    def test_errors(self):
+        self.assertEqual(self.client.post('/api/catalog/async/driver/detailedview', {}, format='json').status_code, 400)
+        self.assertEqual(self.client.get('/api/catalog/async/team/detailedview', {'team_id': 'x'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/catalog/async/insigth/getteamstanding', {'year': 1900}).status_code, 404)
+
+
+class BatchTestCase(CatalogDataMixin, APITestCase):
+    def setUp(self):
+        self.create_catalog_data()
+        refresh_career_stats()
+        for code in ('sainz', 'bearman'):
+            driver = Driver.objects.create(driver=code, forename=code.title(), surname=code.upper(),
+                                           dob='1994-09-01', nationality='Spanish')
+            race = Race.objects.get(date='2025-01-01')
+            Result.objects.create(date=race, driver=driver, constructor=self.team, number='55', grid='3',
+                                  grid_num=3, position='3', position_num=3, position_text='3', points='15',
+                                  points_num=15, laps='50', status='')
+        refresh_career_stats()
+
+    def prime(self):
+        cache.clear()
+        get_current_season()
+        get_data_version()
+
+    def test_same_payload_as_single_endpoints(self):
+        self.prime()
+        data = self.client.post(reverse('driver_batch_view'), {'driver_ids': ['leclerc', 'nobody']},
+                                format='json').json()
+        self.assertEqual(data['not_found'], ['nobody'])
+
+        entry = data['drivers']['leclerc']
+        for path, key, params in (
+            ('driver/detailedview', 'driver', {'driver_id': 'leclerc'}),
+            ('driver/getboxplot', 'boxPlots', {'driver_id': 'leclerc'}),
+            ('driver/getstandings', 'races', {'driver_id': 'leclerc'}),
+        ):
+            single = self.client.post(f'/api/catalog/{path}', params, format='json').json()[key]
+            self.assertEqual(entry['detail' if key == 'driver' else key], single, path)
+
+        team = self.client.get(reverse('team_batch_view'), {'team_ids': 'ferrari', 'year': 2025}).json()
+        single = self.client.post('/api/catalog/team/getstandings', {'team_id': 'ferrari', 'year': 2025},
+                                  format='json').json()
+        self.assertEqual(team['teams']['ferrari']['races'], single['races'])
+
+    def test_constant_number_of_queries(self):
+        url = reverse('driver_batch_view')
+        # Fahrer, Box-Plots, neueste Saison je Fahrer, Ergebnisse
+        for ids in (['leclerc'], ['leclerc', 'sainz', 'bearman']):
+            self.prime()
+            with self.assertNumQueries(4):
+                data = self.client.post(url, {'driver_ids': ids}, format='json').json()
+            self.assertEqual(list(data['drivers']), ids)
+
+        self.prime()
+        with self.assertNumQueries(1):
+            self.client.post(url, {'driver_ids': ['sainz', 'bearman'], 'sections': ['detail']}, format='json')
+
+    def test_bad_requests(self):
+        url = reverse('driver_batch_view')
+        self.assertEqual(self.client.post(url, {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'driver_ids': ['leclerc'], 'sections': ['x']},
+                                          format='json').status_code, 400)
+        for seasons in (0, -1):
+            self.assertEqual(self.client.get(reverse('team_batch_view'),
+                                             {'team_ids': 'ferrari', 'seasons': seasons}).status_code, 400)
+
+
+class ResponseCacheTestCase(CatalogDataMixin, APITestCase):
+    url = '/api/catalog/team/getstandings'
+
+    def setUp(self):
+        cache.clear()
+        self.create_catalog_data()
+        get_data_version()
+
+    def test_get_alias_is_cached_until_data_version_changes(self):
+        response = self.client.get(self.url, {'team_id': 'ferrari', 'year': 2024, 'format': 'columnar'})
+        self.assertEqual(response.json()['rounds'], ['1', '2'])
+        self.assertIn('max-age', response['Cache-Control'])
+
+        # gleiche Parameter als POST-Body: selbe Antwort aus dem Cache
+        with self.assertNumQueries(0):
+            cached = self.client.post(self.url, {'format': 'columnar', 'year': 2024, 'team_id': 'ferrari'},
+                                      format='json')
+        self.assertEqual(cached.content, response.content)
+
+        with self.assertNumQueries(0):
+            revalidated = self.client.get(self.url, {'team_id': 'ferrari', 'year': 2024, 'format': 'columnar'},
+                                          HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+        bump_data_version()
+        with self.assertNumQueries(5):
+            self.client.get(self.url, {'team_id': 'ferrari', 'year': 2024, 'format': 'columnar'})
+
+    def test_version_is_read_from_the_database_row(self):
+        version = get_data_version()
+        # populate_f1 in einem anderen Prozess: nur die Zeile ändert sich, der lokale Merker nicht
+        DataUpdate.objects.update_or_create(name=response_cache.VERSION_NAME)
+        self.assertEqual(get_data_version(), version)
+
+        with mock.patch.object(response_cache.time, 'monotonic', return_value=time.monotonic() + response_cache.VERSION_TTL):
+            self.assertNotEqual(get_data_version(), version)
+
+    def test_errors_are_not_cached(self):
+        params = {'team_id': 'williams', 'year': 2024}
+        self.assertEqual(self.client.get(self.url, params).status_code, 404)
+
+        team = Constructor.objects.create(constructor='williams', name='Williams', nationality='British')
+        driver = Driver.objects.create(driver='albon', forename='Alex', surname='Albon', dob='1996-03-23',
+                                       nationality='Thai')
+        DriverTeam.objects.create(season_id='2024', driver=driver, constructor=team, driver_season_number='23')
+        self.assertEqual(self.client.get(self.url, params).json(), {'races': []})
+
+
+class StatsTestCase(SimpleTestCase):
+    def test_quartiles_match_python_percentiles(self):
+        series = [[4, 3, 2], [2, 3, 1, 2, 6, 1], [7], [1, 20, 5, 5, 9, 13, 2]]
+        boxes = stats.box_plots(range(len(series)), series)
+
+        expected = python_box_plots(series)
+        self.assertEqual([(b['min'], b['firstQuartile'], b['median'], b['thirdQuartile'], b['max']) for b in boxes],
+                         expected)
+
+    def test_season_matrix(self):
+        # two rounds, one team; 'b' retires in round 2
+        matrix = stats.SeasonMatrix([
+            ('r1', 'a', 't', 1, 3, '1'), ('r1', 'b', 't', 4, 0, '4'),
+            ('r2', 'a', 't', 3, 2, '3'), ('r2', 'b', 't', 9, 5, 'R'),
+        ])
+        drivers = matrix.driver_stats()
+
+        self.assertEqual(drivers['a']['teammate_delta'], -3)
+        self.assertEqual(drivers['b']['finish_rate'], 0.5)
+        self.assertEqual(drivers['a']['avg_gain'], 0.5)
+        self.assertEqual(matrix.team_stats()['t']['mean_finish'], 8 / 3)
+
+
+class NumericColumnsTestCase(SimpleTestCase):
+    def test_result_numbers(self):
+        row = {'position': '2', 'grid': '0', 'laps': '57', 'points': '18',
+               'time': '+2.061', 'fastest_lap': '1:32.608'}
+        numbers = result_numbers(row, winner_ms=5504742)
+
+        self.assertEqual(numbers['position_num'], 2)
+        self.assertEqual(numbers['grid_num'], 0)
+        self.assertEqual(numbers['time_ms'], 5506803)
+        self.assertEqual(numbers['fastest_lap_ms'], 92608)
+
+    def test_unparseable_values_become_null(self):
+        numbers = standing_numbers({'position': '', 'points': '0.5', 'wins': '\\N'})
+
+        self.assertIsNone(numbers['position_num'])
+        self.assertEqual(str(numbers['points_num']), '0.5')
+        self.assertIsNone(numbers['wins_num'])
+
+
+def ergast_page(endpoint, items, offset, limit):
+    """Eine MRData-Seite wie bei Ergast – /results wird nach Ergebniszeilen paginiert."""
+    name = endpoint.rsplit('/', 1)[-1]
+    if name == 'results':
+        rows = [(race, result) for race in items for result in race['Results']]
+        page = []
+        for race, result in rows[offset:offset + limit]:
+            # Ein Rennen kann auf der nächsten Seite weitergehen
+            if not page or page[-1]['date'] != race['date']:
+                page.append({**race, 'Results': []})
+            page[-1]['Results'].append(result)
+        total = len(rows)
+    else:
+        page, total = items[offset:offset + limit], len(items)
+
+    tables = {
+        'seasons': ('SeasonTable', 'Seasons'), 'circuits': ('CircuitTable', 'Circuits'),
+        'drivers': ('DriverTable', 'Drivers'), 'constructors': ('ConstructorTable', 'Constructors'),
+        'races': ('RaceTable', 'Races'), 'qualifying': ('RaceTable', 'Races'), 'results': ('RaceTable', 'Races'),
+    }
+    if name in tables:
+        table, key = tables[name]
+        content = {table: {key: page}}
+    else:
+        key = 'DriverStandings' if name == 'driverStandings' else 'ConstructorStandings'
+        content = {'StandingsTable': {'StandingsLists': [{key: page}] if page else []}}
+    return {'MRData': {'total': str(total), **content}}
+
+
+class StubErgastHandler(BaseHTTPRequestHandler):
+    """Liefert server.items(endpoint) als paginierte Ergast-Antwort (limit/offset)."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: int(v[0]) for k, v in parse_qs(url.query).items()}
+        endpoint = url.path.removeprefix('/f1').removesuffix('.json')
+        server = self.server
+
+        with server.lock:
+            server.requests.append((endpoint, params['offset']))
+            throttle = params['offset'] in server.throttle_offsets
+            server.throttle_offsets.discard(params['offset'])
+            # Anzahl der noch fehlschlagenden Anfragen je Endpunkt
+            failing = server.failures.get(endpoint, 0)
+            if failing:
+                server.failures[endpoint] = failing - 1
+
+        if throttle:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        if failing:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        offset, limit = params['offset'], params['limit']
+        etag = f'"{endpoint}-{offset}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = json.dumps(ergast_page(endpoint, server.items(endpoint), offset, limit)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubErgastMixin:
+    def start_stub_ergast(self, items):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubErgastHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.throttle_offsets = set()
+        self.server.failures = {}
+        self.server.items = items
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        host, port = self.server.server_address
+        self.base_url = f'http://{host}:{port}/f1'
+
+    def requested(self):
+        return [endpoint for endpoint, _ in self.server.requests]
+
+
+class ErgastFixture:
+    """Zwei Saisons mit je drei Rennen und sechs Fahrern; 2025 ist die aktuelle (Rennen relativ zu heute)."""
+    TEAMS = {'verstappen': 'red_bull', 'perez': 'red_bull', 'leclerc': 'ferrari', 'sainz': 'ferrari',
+             'hamilton': 'mercedes', 'russell': 'mercedes'}
+
+    def __init__(self):
+        today = date.today()
+        self.dates = {
+            '2024': [date(2024, 3, 10), date(2024, 4, 14), date(2024, 5, 19)],
+            '2025': [today - timedelta(days=30), today - timedelta(days=16), today - timedelta(days=2)],
+        }
+        # Runden mit veröffentlichten Ergebnissen
+        self.published = {'2024': 3, '2025': 3}
+
+    def race(self, season, rnd):
+        return {'season': season, 'round': str(rnd), 'date': self.dates[season][rnd - 1].isoformat(),
+                'Circuit': {'circuitId': f'circuit{rnd}'}}
+
+    def results(self, rnd):
+        drivers = list(self.TEAMS)
+        order = drivers[rnd:] + drivers[:rnd]
+        return [
+            {'number': str(pos), 'grid': str(pos), 'position': str(pos), 'positionText': str(pos),
+             'points': str(max(0, 30 - 5 * pos)), 'laps': '50', 'status': 'Finished',
+             'Time': {'time': '1:30:00.000' if pos == 1 else f'+{pos}.500'},
+             'FastestLap': {'Time': {'time': f'1:2{pos}.000'}},
+             'Driver': {'driverId': driver}, 'Constructor': {'constructorId': self.TEAMS[driver]}}
+            for pos, driver in enumerate(order, start=1)
+        ]
+
+    def items(self, endpoint):
+        season, rnd, name = re.match(r'^(?:/(\d{4}))?(?:/(\d+))?/(\w+)$', endpoint).groups()
+        seasons = [season] if season else list(self.dates)
+        races = [(s, r) for s in seasons for r in ([int(rnd)] if rnd else range(1, len(self.dates[s]) + 1))]
+        published = [(s, r) for s, r in races if r <= self.published[s]]
+        teams = sorted(set(self.TEAMS.values()))
+
+        if name == 'seasons':
+            return [{'season': s} for s in self.dates]
+        if name == 'circuits':
+            return [{'circuitId': f'circuit{r}', 'circuitName': f'Circuit {r}',
+                     'Location': {'locality': 'x', 'country': 'y'}} for r in range(1, 4)]
+        if name == 'drivers':
+            return [{'driverId': d, 'givenName': d.title(), 'familyName': d.upper(), 'dateOfBirth': '1990-01-01',
+                     'nationality': 'Dutch'} for d in self.TEAMS]
+        if name == 'constructors':
+            return [{'constructorId': t, 'name': t.title(), 'nationality': 'x'} for t in teams]
+        if name == 'races':
+            return [self.race(s, r) for s, r in races]
+        if name == 'results':
+            return [dict(self.race(s, r), Results=self.results(r)) for s, r in published]
+        if name == 'qualifying':
+            return [dict(self.race(s, r), QualifyingResults=[
+                {'position': str(pos), 'Q1': f'1:2{pos}.000', 'Driver': {'driverId': d}}
+                for pos, d in enumerate(self.TEAMS, start=1)
+            ]) for s, r in published]
+        if name == 'driverStandings':
+            return [{'position': str(pos), 'positionText': str(pos), 'points': str(100 - 10 * pos), 'wins': '1',
+                     'Driver': {'driverId': d}, 'Constructors': [{'constructorId': self.TEAMS[d]}]}
+                    for pos, d in enumerate(self.TEAMS, start=1)]
+        return [{'position': str(pos), 'positionText': str(pos), 'points': str(200 - 50 * pos), 'wins': '1',
+                 'Constructor': {'constructorId': t}} for pos, t in enumerate(teams, start=1)]
+
+
+class StubPopulateCommand(populate_f1.Command):
+    """populate_f1 gegen den Stub-Server, mit kleiner Seitengröße."""
+
+    def __init__(self, base_url, page_limit=100):
+        super().__init__(stdout=StringIO())
+        self.base_url = base_url
+        self.page_limit = page_limit
+
+    def make_client(self, options):
+        return ErgastClient(base_url=self.base_url, rate=1000, burst=100, workers=2, page_limit=self.page_limit)
+
+
+class PopulateF1Mixin(StubErgastMixin):
+    """populate_f1 gegen ErgastFixture; mit TransactionTestCase, da die Saisons
+    in Worker-Threads (eigene DB-Verbindung) geschrieben werden."""
+
+    def setUp(self):
+        cache.clear()
+        self.data = ErgastFixture()
+        self.start_stub_ergast(self.data.items)
+
+    def populate(self, *args, page_limit=100):
+        call_command(StubPopulateCommand(self.base_url, page_limit), '--no-cache', '--season-workers', '1', *args)
+
+
+class PopulateF1TestCase(PopulateF1Mixin, TransactionTestCase):
+    def test_race_split_across_pages_keeps_gap_times(self):
+        # 6 Ergebnisse je Rennen, 4 je Seite: Rennen 2 und 3 beginnen mitten auf einer Seite
+        self.populate(page_limit=4)
+
+        self.assertEqual(Result.objects.count(), 2 * 3 * 6)
+        self.assertFalse(Result.objects.filter(time_ms__isnull=True).exists())
+        second = Result.objects.get(date_id=self.data.dates['2024'][1], position='2')
+        self.assertEqual(second.time_ms, 90 * 60 * 1000 + 2500)
+
+
+class IncrementalPopulateTestCase(PopulateF1Mixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        today = date.today()
+        # Runde 3 der aktuellen Saison liegt in der Zukunft
+        self.data.dates['2025'] = [today - timedelta(days=30), today - timedelta(days=16), today + timedelta(days=5)]
+        self.data.published['2025'] = 1
+
+    def incremental_run(self):
+        DataUpdate.objects.filter(name='populate_f1').update(last_run=timezone.now() - timedelta(hours=1))
+        self.server.requests.clear()
+        self.populate()
+
+    def round_requests(self):
+        return [endpoint for endpoint in self.requested() if re.match(r'^/2025/\d+/', endpoint)]
+
+    def watermark(self, data_type):
+        return IngestWatermark.objects.get(data_type=data_type, season_id='2025').last_round
+
+    def test_nothing_new_fetches_no_rounds(self):
+        self.data.published['2025'] = 2
+        self.populate()
+        self.assertEqual(self.watermark('results'), 2)
+
+        self.incremental_run()
+
+        self.assertIn('/2025/races', self.requested())
+        self.assertEqual(self.round_requests(), [])
+
+    def test_only_new_rounds_and_their_standings(self):
+        self.populate()
+        self.assertEqual(self.watermark('results'), 1)
+        self.data.published['2025'] = 2
+
+        self.incremental_run()
+
+        self.assertEqual(sorted(self.round_requests()), [
+            '/2025/2/constructorstandings', '/2025/2/driverStandings', '/2025/2/qualifying', '/2025/2/results',
+        ])
+        self.assertEqual((self.watermark('results'), self.watermark('standings')), (2, 2))
+        self.assertEqual(Result.objects.filter(date_id=self.data.dates['2025'][1]).count(), 6)
+
+    def test_unpublished_round_stops_without_advancing(self):
+        today = date.today()
+        self.data.dates['2025'][2] = today - timedelta(days=9)
+        self.populate()
+
+        # Runden 2 und 3 sind gefahren, aber erst Runde 1 veröffentlicht
+        self.incremental_run()
+
+        self.assertEqual(sorted(self.round_requests()), ['/2025/2/qualifying', '/2025/2/results'])
+        self.assertEqual([self.watermark(t) for t in ('qualifying', 'results', 'standings')], [1, 1, 1])
+
+    def test_recent_round_is_fetched_again(self):
+        self.data.dates['2025'][1] = date.today() - timedelta(days=1)
+        self.data.published['2025'] = 2
+        self.populate()
+
+        # Nachträgliche Disqualifikation des Siegers von Runde 2
+        results = self.data.results
+        self.data.results = lambda rnd: [
+            dict(r, status='Disqualified', positionText='D') if r['position'] == '1' and rnd == 2 else r
+            for r in results(rnd)
+        ]
+        self.incremental_run()
+
+        self.assertEqual(sorted(self.round_requests()), [
+            '/2025/2/constructorstandings', '/2025/2/driverStandings', '/2025/2/qualifying', '/2025/2/results',
+        ])
+        winner = Result.objects.get(date_id=self.data.dates['2025'][1], position='1')
+        self.assertEqual((winner.status, winner.position_text), ('Disqualified', 'D'))
+        self.assertEqual(self.watermark('results'), 2)
+
+
+class ResumeFullLoadTestCase(PopulateF1Mixin, TransactionTestCase):
+    def test_resume_skips_completed_chunks(self):
+        self.server.failures['/2025/results'] = 10
+
+        with self.assertRaisesMessage(CommandError, '--resume'):
+            self.populate('--retries', '0')
+
+        self.assertFalse(DataUpdate.objects.filter(name='populate_f1').exists())
+        self.assertNotIn(('results', '2025'), set(IngestCheckpoint.objects.values_list('chunk', 'season')))
+        self.assertIn(('results', '2024'), set(IngestCheckpoint.objects.values_list('chunk', 'season')))
+
+        self.server.failures.clear()
+        self.server.requests.clear()
+        self.populate('--resume')
+
+        # nur der fehlgeschlagene Abschnitt wird erneut geladen
+        self.assertEqual(self.requested(), ['/2025/results'])
+        self.assertEqual(Result.objects.count(), 2 * 3 * 6)
+        self.assertTrue(DataUpdate.objects.filter(name='populate_f1').exists())
+
+
+class BackfillStandingsTestCase(PopulateF1Mixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.populate()
+        Driverstanding.objects.all().delete()
+        Constructorstanding.objects.all().delete()
+        self.server.requests.clear()
+
+    def test_failed_season_is_retried(self):
+        self.server.failures['/2024/driverStandings'] = 1
+
+        self.populate('--backfill-standings', '--retries', '1')
+
+        self.assertEqual(self.requested().count('/2024/driverStandings'), 2)
+        self.assertEqual(Driverstanding.objects.filter(season_id='2024').count(), 6)
+        self.assertEqual(Driverstanding.objects.filter(season_id='2025').count(), 6)
+
+    def test_other_seasons_stay_committed(self):
+        self.server.failures['/2024/driverStandings'] = 10
+
+        with self.assertRaisesMessage(CommandError, '--backfill-standings 2024'):
+            self.populate('--backfill-standings', '--retries', '2')
+
+        self.assertEqual(self.requested().count('/2024/driverStandings'), 3)
+        self.assertFalse(Driverstanding.objects.filter(season_id='2024').exists())
+        self.assertEqual(Driverstanding.objects.filter(season_id='2025').count(), 6)
+        # Teamwertung ist ein eigener Abschnitt je Saison
+        self.assertEqual(Constructorstanding.objects.filter(season_id='2024').count(), 3)
+
+
+class ErgastClientTestCase(StubErgastMixin, SimpleTestCase):
+    def setUp(self):
+        self.start_stub_ergast(lambda endpoint: [{'circuitId': f'c{i}'} for i in range(250)])
+        self.client = ErgastClient(base_url=self.base_url, rate=100, burst=10, workers=3)
+
+    def test_fetches_all_pages_in_order(self):
+        items = self.client.fetch('/circuits')
+
+        self.assertEqual([c['circuitId'] for c in items], [f'c{i}' for i in range(250)])
+        self.assertEqual(sorted(offset for _, offset in self.server.requests), [0, 100, 200])
+
+    def test_retries_page_after_429(self):
+        self.server.throttle_offsets.add(100)
+
+        items = self.client.fetch('/circuits')
+
+        self.assertEqual(len(items), 250)
+        self.assertEqual([offset for _, offset in self.server.requests].count(100), 2)
+
+    def test_expired_cache_entries_are_revalidated_with_etag(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = ResponseCache(cache_dir.name, current_ttl=timedelta(0))
+        client = ErgastClient(base_url=self.base_url, rate=100, burst=10, workers=3, cache=cache)
+
+        first = client.fetch('/circuits')
+        second = client.fetch('/circuits')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.server.requests), 6)
+
+    def test_finished_seasons_are_served_from_cache(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = ResponseCache(cache_dir.name, current_ttl=timedelta(0))
+        cache.put('/1990/drivers', 0, 100, {'MRData': {'total': '1', 'DriverTable': {'Drivers': [{'driverId': 'senna'}]}}})
+        client = ErgastClient(base_url=self.base_url, cache=cache)
+
+        items = client.fetch('/1990/drivers')
+
+        self.assertEqual(items, [{'driverId': 'senna'}])
+        self.assertEqual(self.server.requests, [])
@@ -0,0 +1,54 @@
+from django.db.models import Q
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def bulk_upsert(model, rows, unique_fields, update_fields, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Schreibt Zeilen gesammelt per INSERT ... ON CONFLICT DO UPDATE in die Tabelle.
+
+    rows:          Liste von Dicts mit Attributnamen (Fremdschlüssel als ``*_id``)
+    unique_fields: Feldnamen, die eine Zeile eindeutig identifizieren
+    update_fields: Feldnamen, die bei einem Konflikt überschrieben werden
+    Rückgabe:      (eingefügt, aktualisiert)
+    """
+    key_attrs = [model._meta.get_field(name).attname for name in unique_fields]
+
+    # Doppelte Schlüssel innerhalb eines Laufs zusammenfassen (letzter gewinnt),
+    # sonst bricht ON CONFLICT ab, weil dieselbe Zeile zweimal betroffen wäre.
+    deduped = {}
+    for row in rows:
+        deduped[tuple(row[attr] for attr in key_attrs)] = row
+    keys = sorted(deduped, key=lambda k: tuple(str(v) for v in k))
+
+    inserted = updated = 0
+    for start in range(0, len(keys), batch_size):
+        batch_keys = keys[start:start + batch_size]
+
+        existing = _existing_keys(model, key_attrs, batch_keys)
+        updated += len(existing)
+        inserted += len(batch_keys) - len(existing)
+
+        objs = [model(**deduped[key]) for key in batch_keys]
+        if update_fields:
+            model.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+        else:
+            model.objects.bulk_create(objs, ignore_conflicts=True)
+
+    return inserted, updated
+
+
+def _existing_keys(model, key_attrs, batch_keys):
+    """Liefert die Schlüssel aus batch_keys, die bereits in der Tabelle stehen."""
+    lookup = Q()
+    for i, attr in enumerate(key_attrs):
+        lookup &= Q(**{f'{attr}__in': {key[i] for key in batch_keys}})
+
+    wanted = set(batch_keys)
+    found = model.objects.filter(lookup).values_list(*key_attrs)
+    return {tuple(row) for row in found} & wanted
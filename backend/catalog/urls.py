@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
 
@@ -11,12 +11,21 @@ urlpatterns = [
     path('driver/detailedview', views.detailed_driver_view, name='detailed_driver_view'),
     path('driver/getboxplot', views.get_driver_box_plot, name='get_box_plot'),
     path('driver/getstandings', views.get_driver_standings, name='get_standings'),
+    path('driver/batch', views.driver_batch_view, name='driver_batch_view'),
 
     path('team/detailedview', views.detailed_team_view, name='detailed_team_view'),
     path('team/getboxplot', views.get_team_box_plot, name='get_team_box_plot'),
     path('team/getstandings', views.get_team_standings, name='get_team_standings'),
+    path('team/batch', views.team_batch_view, name='team_batch_view'),
 
     path('insigth/getdriverstandings', views.insight_driver_standings, name='get_team_standings'),
     path('insigth/getteamstanding', views.insight_team_standings, name='get_team_standings'),
 
+    # Async Varianten (ASGI)
+    path('async/driver/detailedview', async_views.detailed_driver_view, name='async_detailed_driver_view'),
+    path('async/team/detailedview', async_views.detailed_team_view, name='async_detailed_team_view'),
+    path('async/insigth/getdriverstandings', async_views.insight_driver_standings,
+         name='async_insight_driver_standings'),
+    path('async/insigth/getteamstanding', async_views.insight_team_standings, name='async_insight_team_standings'),
+
 ]
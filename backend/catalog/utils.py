@@ -0,0 +1,80 @@
+from decimal import Decimal, InvalidOperation
+
+
+def to_milliseconds(time_str):
+    """
+    Konvertiert einen Zeitstring wie "1:27.097", "57.099" oder "1:31:44.742"
+    in Millisekunden (int). Leere oder unlesbare Werte ergeben None.
+    """
+    if not time_str:
+        return None
+    try:
+        *head, seconds = time_str.strip().split(':')
+        total = float(seconds)
+        for i, part in enumerate(reversed(head)):
+            total += int(part) * 60 ** (i + 1)
+    except ValueError:
+        return None
+    return round(total * 1000)
+
+
+def to_int(value):
+    """Ganzzahl aus einem Ergast-Textfeld ("3"), sonst None (z.B. "", "\\N", "R")."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def to_decimal(value):
+    """Dezimalzahl aus einem Ergast-Textfeld ("18", "0.5"), sonst None."""
+    try:
+        return Decimal(value)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def race_time_ms(time_str, winner_ms):
+    """
+    Renndauer in Millisekunden. Ergast liefert nur beim Sieger die volle
+    Zeit ("1:31:44.742"), alle anderen als Abstand ("+5.123") – dieser
+    wird auf die Siegerzeit addiert.
+    """
+    if time_str and time_str.startswith('+'):
+        gap = to_milliseconds(time_str[1:])
+        return winner_ms + gap if gap is not None and winner_ms is not None else None
+    return to_milliseconds(time_str)
+
+
+# Typisierte Spalten neben den Original-Texten (werden beim Import und per Migration befüllt)
+RESULT_NUMERIC_FIELDS = ['position_num', 'grid_num', 'laps_num', 'points_num', 'time_ms', 'fastest_lap_ms']
+QUALIFYING_NUMERIC_FIELDS = ['position_num', 'q1_ms', 'q2_ms', 'q3_ms']
+STANDING_NUMERIC_FIELDS = ['position_num', 'points_num', 'wins_num']
+
+
+def result_numbers(row, winner_ms=None):
+    return {
+        'position_num': to_int(row['position']),
+        'grid_num': to_int(row['grid']),
+        'laps_num': to_int(row['laps']),
+        'points_num': to_decimal(row['points']),
+        'time_ms': race_time_ms(row['time'], winner_ms),
+        'fastest_lap_ms': to_milliseconds(row['fastest_lap']),
+    }
+
+
+def qualifying_numbers(row):
+    return {
+        'position_num': to_int(row['position']),
+        'q1_ms': to_milliseconds(row['q1']),
+        'q2_ms': to_milliseconds(row['q2']),
+        'q3_ms': to_milliseconds(row['q3']),
+    }
+
+
+def standing_numbers(row):
+    return {
+        'position_num': to_int(row['position']),
+        'points_num': to_decimal(row['points']),
+        'wins_num': to_int(row['wins']),
+    }
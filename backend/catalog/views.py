@@ -6,19 +6,42 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.views.decorators.http import require_http_methods
-from django.http import JsonResponse
-from catalog.models import Season, Circuit, Driver, Constructor, Race, DriverTeam, QualifyingResult, Result, \
+from django.http import JsonResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from catalog.models import Season, Circuit, Driver, Constructor, DriverTeam, Result, \
     Driverstanding, Constructorstanding, DataUpdate
+from catalog.current_season import get_current_season
+from catalog.career import career_or_zero
+from catalog.boxplots import box_plots, box_plots_many
+from catalog.response_cache import cached_response, request_params
 import json
 from datetime import date, datetime
 from django.http import JsonResponse
-from django.db.models import IntegerField, Sum, Min, FloatField, Case, When, Value
-from django.db.models.functions import Cast
+from collections import defaultdict
+from django.db.models import F, Value, Max, Exists, OuterRef
+from django.db.models.functions import Coalesce
 from drf_yasg.utils   import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.decorators import api_view
 from django.http      import JsonResponse
-from math import floor, ceil
+
+DEFAULT_BOX_PLOT_SEASONS = 4
+# Obergrenze für ?seasons= (mehr Saisons bedeuten mehr Box-Plots je Antwort und Cache-Eintrag)
+MAX_BOX_PLOT_SEASONS = 20
+
+
+def box_plot_season_count(params):
+    """Anzahl der Box-Plot-Saisons (Standard 4, höchstens MAX_BOX_PLOT_SEASONS); ValueError mit Meldung."""
+    value = params.get('seasons')
+    if value in (None, ''):
+        return DEFAULT_BOX_PLOT_SEASONS
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("seasons must be an integer")
+    if count < 1:
+        raise ValueError("seasons must be at least 1")
+    return min(count, MAX_BOX_PLOT_SEASONS)
 
 
 @swagger_auto_schema(
@@ -53,7 +76,8 @@ from math import floor, ceil
         400: openapi.Response(description="Fehlerhafte Anfrage"),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_init(request):
     """
     Liefert die Mapping-Tabellen für Frontend-Initialisierung:
@@ -87,64 +111,41 @@ def get_init(request):
     operation_description="Gibt eine Liste der Fahrer der aktuellen Saison zurück.",
     responses={200: openapi.Response('Liste der Fahrer')}
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_current_drivers(request):
     """
     Returns a list of current drivers with their details.
     """
-    # 1. Aktuelle Saison bestimmen
-    latest_season = (
-        Season.objects
-        .annotate(as_int=Cast('season', IntegerField()))
-        .order_by('-as_int')
-        .first()
-    )
-    if not latest_season:
+    current = get_current_season()
+    if not current:
         return JsonResponse({'error': "Database has no season"}, status=404)
 
-    # 2. Alle Fahrer-Teams der aktuellen Saison laden
-    driver_teams = DriverTeam.objects.filter(
-        season=latest_season
-    ).select_related('driver', 'constructor')
-
-    # 3. Fahrerwertung der aktuellen Saison einlesen
-    standings_qs = Driverstanding.objects.filter(
-        season=latest_season
-    ).values('driver_id', 'points', 'positionText')
-    # Mapping driver_id -> {'points': ..., 'position': ...}
-    standings_map = {
-        s['driver_id']: {
-            'points': s['points'],
-            'position': s['positionText'],
+    drivers_data = [
+        {
+            'number': d['number'],
+            'forename': d['forename'],
+            'surname': d['surname'],
+            'nationality': d['nationality'],
+            'team': d['team'],
+            'points': d['points'],
+            'position': d['position'],
+            'driver_id': d['driver_id'],
         }
-        for s in standings_qs
-    }
-
-    # 4. Ergebnis-Liste zusammenbauen
-    drivers_data = []
-    for dt in driver_teams:
-        driver = dt.driver
-        standing = standings_map.get(driver.driver, {})
-        drivers_data.append({
-            'number': dt.driver_season_number,
-            'forename': driver.forename,
-            'surname': driver.surname,
-            'nationality': driver.nationality,
-            'team': dt.constructor.name,
-            'points': standing.get('points', '0'),
-            'position': standing.get('position', ''),
-            'driver_id': driver.driver,
-        })
+        for d in current['drivers']
+    ]
 
     return JsonResponse({'drivers': drivers_data})
 
 @swagger_auto_schema(
-    method='post',
+    methods=['get', 'post'],
     operation_summary="Aktuelle Teams abrufen",
-    operation_description="Gibt eine Liste der Teams der aktuellen Saison zurück.",
-    responses={200: openapi.Response('Liste der Teams')}
+    operation_description="Gibt eine Liste der Teams der aktuellen Saison zurück. "
+                          "Mit If-None-Match und dem zuletzt erhaltenen ETag antwortet der Server mit 304, "
+                          "solange sich die Daten der Saison nicht geändert haben.",
+    responses={200: openapi.Response('Liste der Teams'), 304: openapi.Response('Unverändert')}
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
 def get_current_teams(request):
     """
     Returns a list of current-season teams with:
@@ -155,51 +156,37 @@ def get_current_teams(request):
       - position
       - drivers: list of drivers in that team this season
     """
-    # 1. Aktuelle Saison bestimmen
-    latest_season = (
-        Season.objects
-        .annotate(as_int=Cast('season', IntegerField()))
-        .order_by('-as_int')
-        .first()
-    )
-    if not latest_season:
+    current = get_current_season()
+    if not current:
         return JsonResponse({'error': "Database has no season"}, status=404)
 
-    # 2. Alle Constructorstandings der aktuellen Saison laden
-    standings_qs = Constructorstanding.objects.filter(
-        season=latest_season
-    ).select_related('constructor')
-
-    teams_data = []
-    for standing in standings_qs:
-        team = standing.constructor
-
-        # 3. Fahrer dieses Teams in der aktuellen Saison
-        driver_teams = DriverTeam.objects.filter(
-            season=latest_season,
-            constructor=team
-        ).select_related('driver')
-
-        drivers = []
-        for dt in driver_teams:
-            d = dt.driver
-            drivers.append({
-                'driver_id': f"{d.driver}",
-                'forename':  d.forename,
-                'surname':   d.surname,
-                'number':    dt.driver_season_number,
-            })
+    etag = f'"teams-{current["etag"]}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        return _not_modified(etag)
 
-        teams_data.append({
-            'team_id':     team.constructor,
-            'name':        team.name,
-            'nationality': team.nationality,
-            'points':      standing.points,
-            'position':    standing.positionText,
-            'drivers':     drivers,
-        })
+    teams_data = [
+        {
+            'team_id':     t['team_id'],
+            'name':        t['name'],
+            'nationality': t['nationality'],
+            'points':      t['points'],
+            'position':    t['position'],
+            'drivers':     t['drivers'],
+        }
+        for t in current['teams']
+    ]
+
+    response = JsonResponse({'teams': teams_data})
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
 
-    return JsonResponse({'teams': teams_data})
+
+def _not_modified(etag):
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
 
 @swagger_auto_schema(
     method='post',
@@ -216,9 +203,10 @@ def get_current_teams(request):
     ),
     responses={200: openapi.Response('Liste der Fahrer')}
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def detailed_driver_view(request):
-    driver_id = request.data.get('driver_id')
+    driver_id = request_params(request).get('driver_id')
     if not driver_id:
         return JsonResponse(
             {'error': 'Bitte driver_id im Request-Body mitgeben.'},
@@ -226,7 +214,7 @@ def detailed_driver_view(request):
         )
 
     try:
-        driver = Driver.objects.get(pk=driver_id)
+        driver = Driver.objects.select_related('career_stats').get(pk=driver_id)
     except Driver.DoesNotExist:
         return JsonResponse(
             {'error': f'Kein Fahrer mit der ID "{driver_id}" gefunden.'},
@@ -234,93 +222,41 @@ def detailed_driver_view(request):
         )
 
     # 1. Aktuelle Saison holen
-    latest = Season.objects.annotate(
-        as_int=Cast('season', IntegerField())
-    ).order_by('-as_int').first()
-    current_season = latest.season
-
-    # 2. Karriere-Statistiken
-    career_qs = Result.objects.filter(driver=driver)
-    career_wins = career_qs.filter(position='1').count()
-    career_podiums = career_qs.filter(position__in=['1', '2', '3']).count()
-    career_points = career_qs.aggregate(
-        total=Sum(Cast('points', FloatField()))
-    )['total'] or 0
-    career_poles = QualifyingResult.objects.filter(
-        driver=driver, position='1'
-    ).count()
-    races_entered = career_qs.count()
-    championships = Driverstanding.objects.filter(
-        driver=driver, positionText='1'
-    ).count()
-    # Best Grid
-    numeric_grids = career_qs.filter(grid__regex=r'^[1-9]\d*$')
-    best_grid = numeric_grids.annotate(
-        grid_int=Cast('grid', IntegerField())
-    ).aggregate(
-        best=Min('grid_int')
-    )['best']
-
-    # 3. Aktuelle Saison-Statistiken
-    #   Team & Nummer
-    dt = DriverTeam.objects.filter(
-        driver=driver, season=current_season
-    ).select_related('constructor').first()
-    team_name = dt.constructor.name if dt else None
-    current_number = dt.driver_season_number if dt else None
-
-    #   Fahrerwertung
-    ds = Driverstanding.objects.filter(
-        driver=driver, season=current_season
-    ).first()
-    current_points = float(ds.points) if ds and ds.points else 0
-    current_wins = int(ds.wins) if ds and ds.wins else 0
-
-    #   Saison-Pole-Positions & Podien
-    current_poles = QualifyingResult.objects.filter(
-        driver=driver,
-        date__season=current_season,
-        position='1'
-    ).count()
-    current_podiums = Result.objects.filter(
-        driver=driver,
-        date__season=current_season,
-        position__in=['1', '2', '3']
-    ).count()
-
-    # 4. Seasons, in denen der Fahrer aktiv war
-    seasons_active = list(
-        DriverTeam.objects
-        .filter(driver=driver)
-        .values_list('season__season', flat=True)
-        .distinct()
-        .order_by('-season__season')
-    )
+    current = get_current_season()
+
+    # 2. Karriere-Statistiken (vorberechnet von populate_f1)
+    career = career_or_zero(driver)
+
+    return JsonResponse({'driver': driver_detail(driver, career, current)})
+
 
-    # 5. Antwort-Daten
-    data = {
+def driver_detail(driver, career, current):
+    """Antwort-Daten der Fahrer-Detailansicht (auch für die async Variante)."""
+    # Aktuelle Saison: Team, Nummer, Wertung, Podien & Poles
+    entry = next((d for d in current['drivers'] if d['driver_id'] == driver.driver), None) if current else None
+
+    return {
         'forename': driver.forename,
         'surname': driver.surname,
         'date_of_birth': driver.dob.isoformat(),
         'place_of_birth': driver.nationality,
-        'career_wins': career_wins,
-        'career_points': career_points,
-        'career_podiums': career_podiums,
-        'career_poles': career_poles,
-        'grand_prix_entered': races_entered,
-        'world_championships': championships,
-        'best_grid_position': best_grid,
-        'current_team': team_name,
-        'current_number': current_number,
-        'current_season_points': current_points,
-        'current_season_wins': current_wins,
-        'current_season_podiums': current_podiums,
-        'current_season_poles': current_poles,
-        'seasons_active': seasons_active,
+        'career_wins': career.wins,
+        'career_points': float(career.points),
+        'career_podiums': career.podiums,
+        'career_poles': career.poles,
+        'grand_prix_entered': career.races,
+        'world_championships': career.championships,
+        'best_grid_position': career.best_grid,
+        'current_team': entry['team'] if entry else None,
+        'current_number': entry['number'] if entry else None,
+        'current_season_points': entry['points_num'] if entry else 0,
+        'current_season_wins': entry['wins'] if entry else 0,
+        'current_season_podiums': entry['podiums'] if entry else 0,
+        'current_season_poles': entry['poles'] if entry else 0,
+        'current_season_form': entry['form'] if entry else None,
+        'seasons_active': career.seasons_active,
     }
 
-    return JsonResponse({'driver': data})
-
 
 @swagger_auto_schema(
     method='post',
@@ -333,6 +269,10 @@ def detailed_driver_view(request):
                 type=openapi.TYPE_STRING,
                 description='Fahrer-, z.B. max_verstappen'
             ),
+            'seasons': openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description=f'Anzahl der Saisons (optional, Standard 4, höchstens {MAX_BOX_PLOT_SEASONS})'
+            ),
         },
         required=['driver_id'],
     ),
@@ -342,22 +282,17 @@ def detailed_driver_view(request):
                }
 
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_driver_box_plot(request):
-    driver_id = request.data.get('driver_id')
+    driver_id = request_params(request).get('driver_id')
     if not driver_id:
         return JsonResponse({"error": "Required field: driver_id"}, status=400)
 
     # 1) Neueste Saison im System ermitteln
-    latest = (
-        Season.objects
-        .annotate(as_int=Cast('season', IntegerField()))
-        .order_by('-as_int')
-        .first()
-    )
-    if not latest:
+    current = get_current_season()
+    if not current:
         return JsonResponse({"error": "No seasons defined"}, status=500)
-    max_year = int(latest.season)
 
     # 2) Driver lookup
     try:
@@ -365,47 +300,12 @@ def get_driver_box_plot(request):
     except Driver.DoesNotExist:
         return JsonResponse({"error": f"No driver found with id {driver_id}"}, status=404)
 
-    # 3) Alle Saisons als ints ≤ max_year, absteigend
-    years = sorted(
-        (int(s) for s in Season.objects.values_list('season', flat=True) if s.isdigit()),
-        reverse=True
-    )
-    years = [y for y in years if y <= max_year][:4]
-
-    boxplots = []
-    for y in years:
-        season = Season.objects.get(season=str(y))
-
-        # 4) Alle Platzierungen dieses Fahrers in dieser Saison abrufen
-        raw_qs = (
-            Result.objects
-            .filter(date__season=season, driver=driver)
-            .values_list('position', flat=True)
-        )
-        # zuerst als ints, blinde Einträge rauswerfen
-        positions_int = []
-        for pos in raw_qs:
-            try:
-                pi = int(pos)
-            except (ValueError, TypeError):
-                continue
-            positions_int.append(pi)
-
-        if not positions_int:
-            continue
-
-        # für Percentile-Sortierung
-        sorted_pos = sorted(positions_int)
-
-        boxplots.append({
-            "x":             y,
-            "positions":     positions_int,                # <— die rohe Serie [1,4,2,1,1,3,…]
-            "min":           sorted_pos[0],
-            "firstQuartile": _percentile(sorted_pos, 25),
-            "median":        _percentile(sorted_pos, 50),
-            "thirdQuartile": _percentile(sorted_pos, 75),
-            "max":           sorted_pos[-1],
-        })
+    # 3) Die letzten n Saisons (Standard 4), absteigend – eine Abfrage für alle nicht gecachten
+    try:
+        count = box_plot_season_count(request_params(request))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    boxplots = box_plots('driver', driver.driver, current['years'][:count], current)
 
     return JsonResponse({"boxPlots": boxplots})
 
@@ -432,10 +332,11 @@ def get_driver_box_plot(request):
         404: openapi.Response('Keine Daten gefunden'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_driver_standings(request):
-    driver_id   = request.data.get('driver_id')
-    season_year = request.data.get('season')
+    driver_id   = request_params(request).get('driver_id')
+    season_year = request_params(request).get('season')
 
     if not driver_id:
         return JsonResponse({'error': 'driver_id fehlt im Request.'}, status=400)
@@ -459,16 +360,11 @@ def get_driver_standings(request):
         if not season_year:
             return JsonResponse({'error': 'Keine Renn-Daten für diesen Fahrer.'}, status=404)
 
-    # Nur Ergebnisse dieser Saison laden, casten und ungültige (≤0) ausschließen
+    # Nur Ergebnisse dieser Saison laden, ungültige (≤0) ausschließen
     qs = (
         Result.objects
-        .filter(driver=driver, date__season__season=season_year)
-        .annotate(
-            grid_int=Cast('grid', IntegerField()),
-            pos_int=Cast('position', IntegerField())
-        )
-        .exclude(grid_int__lte=0)
-        .exclude(pos_int__lte=0)
+        .filter(driver=driver, date__season__season=season_year, grid_num__gt=0, position_num__gt=0)
+        .select_related('date')
         .order_by('date__round')
     )
 
@@ -477,21 +373,19 @@ def get_driver_standings(request):
             'error': f'Keine Renn-Daten für {driver_id} in Saison {season_year}.'
         }, status=404)
 
-    # Rennen-Daten für diese Saison sammeln
-    races = [
-        {
-            'round':  r.date.round,
-            'grid':   r.grid_int,
-            'result': r.pos_int,
-        }
-        for r in qs
-    ]
-
     return JsonResponse({
-        'races':  races,
+        'races':  [driver_race(r.date.round, r.grid_num, r.position_num) for r in qs],
     })
 
 
+def driver_race(rnd, grid, result):
+    return {
+        'round':  rnd,
+        'grid':   grid,
+        'result': result,
+    }
+
+
 @swagger_auto_schema(
     method='post',
     operation_summary="Detaillierte Team-Daten",
@@ -511,9 +405,10 @@ def get_driver_standings(request):
         404: openapi.Response('Team nicht gefunden'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def detailed_team_view(request):
-    team_id = request.data.get('team_id')
+    team_id = request_params(request).get('team_id')
     if not team_id:
         return JsonResponse(
             {'error': 'Bitte team_id im Request-Body mitgeben.'},
@@ -521,7 +416,7 @@ def detailed_team_view(request):
         )
 
     try:
-        team = Constructor.objects.get(pk=team_id)
+        team = Constructor.objects.select_related('career_stats').get(pk=team_id)
     except Constructor.DoesNotExist:
         return JsonResponse(
             {'error': f'Kein Team mit der ID \"{team_id}\" gefunden.'},
@@ -529,106 +424,56 @@ def detailed_team_view(request):
         )
 
     # 1. Aktuelle Saison ermitteln
-    # (pure Python max, avoids Cast issues)
-    seasons = Season.objects.values_list('season', flat=True)
-    years = [int(s) for s in seasons if s.isdigit()]
-    if not years:
+    current = get_current_season()
+    if not current:
         return JsonResponse({'error': 'Keine Saison-Daten gefunden.'}, status=404)
-    latest_year = max(years)
-    latest_season_obj = Season.objects.get(season=str(latest_year))
-
-    # 2. Fahrer des Teams in dieser Saison
-    current_dts = DriverTeam.objects.filter(
-        constructor=team,
-        season=latest_season_obj
-    ).select_related('driver')
-    current_driver_ids = [dt.driver_id for dt in current_dts]
+
+    # 2. Karriere (vorberechnet von populate_f1)
+    career = career_or_zero(team)
+
+    return JsonResponse(team_detail(team, career, current))
+
+
+def team_detail(team, career, current):
+    """Antwort-Daten der Team-Detailansicht (auch für die async Variante)."""
+    # Fahrer des Teams in dieser Saison
+    team_drivers = [d for d in current['drivers'] if d['team_id'] == team.constructor]
     current_drivers = [
         {
-            'id':       dt.driver.driver,
-            'forename': dt.driver.forename,
-            'surname':  dt.driver.surname,
-            'number':   dt.driver_season_number,
+            'id':       d['driver_id'],
+            'forename': d['forename'],
+            'surname':  d['surname'],
+            'number':   d['number'],
         }
-        for dt in current_dts
+        for d in team_drivers
     ]
 
-    # 3. Aktuelle Saison: Punkte & Siege
-    try:
-        cs_current = Constructorstanding.objects.get(
-            constructor=team,
-            season=latest_season_obj
-        )
-        current_points = float(cs_current.points)
-        current_wins   = int(cs_current.wins)
-    except Constructorstanding.DoesNotExist:
-        current_points = 0.0
-        current_wins   = 0
-
-    # 4. Karriere: aufsummierte Punkte & Siege
-    career_agg = Constructorstanding.objects.filter(
-        constructor=team
-    ).aggregate(
-        total_points=Sum(Cast('points', FloatField())),
-        total_wins=  Sum(Cast('wins',   IntegerField()))
-    )
-    career_points = career_agg['total_points'] or 0.0
-    career_wins   = career_agg['total_wins']   or 0
-
-    # 5. Podien & Poles – aktuell & Karriere
-    current_results = Result.objects.filter(
-        constructor=team,
-        date__season=latest_season_obj
-    )
-    current_podiums = current_results.filter(position__in=['1','2','3']).count()
-    current_poles   = QualifyingResult.objects.filter(
-        position='1',
-        date__season=latest_season_obj,
-        driver_id__in=current_driver_ids
-    ).count()
-
-    career_results  = Result.objects.filter(constructor=team)
-    career_podiums  = career_results.filter(position__in=['1','2','3']).count()
-    career_poles    = QualifyingResult.objects.filter(
-        position='1',
-        driver_id__in=DriverTeam.objects
-            .filter(constructor=team)
-            .values_list('driver_id', flat=True)
-            .distinct()
-    ).count()
-
-    # 6. Seasons active – alle Saisons, in denen das Team Fahrer hatte
-    seasons_active = list(
-        DriverTeam.objects
-        .filter(constructor=team)
-        .values_list('season__season', flat=True)
-        .distinct()
-        .order_by('-season__season')
-    )
+    # Aktuelle Saison: Punkte, Siege, Podien & Poles
+    entry = next((t for t in current['teams'] if t['team_id'] == team.constructor), None)
 
-    # 7. JSON-Antwort
-    return JsonResponse({
+    return {
         'team': {
             'id':          team.constructor,
             'name':        team.name,
             'nationality': team.nationality,
         },
         'current_season': {
-            'season':  latest_season_obj.season,
+            'season':  current['season'],
             'drivers': current_drivers,
-            'wins':    current_wins,
-            'points':  current_points,
-            'podiums': current_podiums,
-            'poles':   current_poles,
+            'wins':    entry['wins'] if entry else 0,
+            'points':  entry['points_num'] if entry else 0.0,
+            'podiums': entry['podiums'] if entry else 0,
+            'poles':   entry['poles'] if entry else 0,
+            'form':    entry['form'] if entry else None,
         },
         'career': {
-            'wins':    career_wins,
-            'points':  career_points,
-            'podiums': career_podiums,
-            'poles':   career_poles,
+            'wins':    career.wins,
+            'points':  float(career.points),
+            'podiums': career.podiums,
+            'poles':   career.poles,
         },
-        'seasons_active': seasons_active,
-    })
+        'seasons_active': career.seasons_active,
+    }
 
 @swagger_auto_schema(
     method='post',
@@ -638,6 +483,8 @@ def detailed_team_view(request):
         properties={
             'team_id': openapi.Schema(type=openapi.TYPE_STRING, description='Team-ID z.B.: red_bull'),
             'year':    openapi.Schema(type=openapi.TYPE_INTEGER, description='Saison-Jahr (optional) z.B.: 2024'),
+            'format':  openapi.Schema(type=openapi.TYPE_STRING, enum=['columnar'],
+                                      description='Optional: "columnar" liefert rounds + Positions-Array je Fahrer'),
         },
         required=['team_id'],
     ),
@@ -647,10 +494,11 @@ def detailed_team_view(request):
         404: openapi.Response('Keine Daten gefunden'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_team_standings(request):
-    team_id = request.data.get('team_id')
-    year = request.data.get('year') or datetime.now().year
+    team_id = request_params(request).get('team_id')
+    year = request_params(request).get('year') or datetime.now().year
 
     if not team_id:
         return JsonResponse(
@@ -674,45 +522,64 @@ def get_team_standings(request):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    driver_teams = DriverTeam.objects.filter(
-        season=season, constructor=team
-    ).select_related('driver')
-    if not driver_teams.exists():
+    driver_ids = list(
+        DriverTeam.objects.filter(season=season, constructor=team).values_list('driver_id', flat=True)
+    )
+    if not driver_ids:
         return JsonResponse(
             {"error": f"No drivers found for team {team.name} in {year}"},
             status=status.HTTP_404_NOT_FOUND
         )
-    drivers = [dt.driver for dt in driver_teams]
 
-    standings = []
-    for race in Race.objects.filter(season=season).order_by('date'):
-        qs = (
-            Result.objects
-            .filter(date=race, constructor=team, driver__in=drivers)
-            .select_related('driver')
-            .annotate(
-                pos_int=Case(
-                    When(position__regex=r'^\d+$', then=Cast('position', IntegerField())),
-                    default=Value(9999),
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by('pos_int')
-        )
-        if not qs.exists():
-            continue
-
-        for r in qs:
-            standings.append({
-                "driver": f"{r.driver.forename} {r.driver.surname}",
-                "driver_id": r.driver.driver,
-                "round": race.round,
-                "position": r.pos_int,
+    # Alle Ergebnisse der Saison in einer Abfrage, nach Rennen und Platzierung sortiert
+    results = (
+        Result.objects
+        .filter(date__season=season, constructor=team, driver__in=driver_ids)
+        .annotate(pos_int=Coalesce('position_num', Value(9999)))
+        .order_by('date', 'pos_int')
+        .values_list('date__round', 'driver_id', 'driver__forename', 'driver__surname', 'pos_int')
+    )
+
+    return JsonResponse(team_races(results, request_params(request).get('format') == 'columnar'))
+
+
+def team_races(results, columnar=False):
+    """
+    Rennergebnisse eines Teams aus (round, driver_id, forename, surname, position),
+    nach Rennen sortiert – als Liste je Rennen und Fahrer oder im Spaltenformat.
+    """
+    if columnar:
+        # Spaltenformat fürs Diagramm: eine Runden-Liste und je Fahrer ein Positions-Array
+        rounds = []
+        drivers = {}
+        for rnd, driver_id, forename, surname, position in results:
+            if not rounds or rounds[-1] != rnd:
+                rounds.append(rnd)
+            entry = drivers.setdefault(driver_id, {
+                "driver": f"{forename} {surname}",
+                "driver_id": driver_id,
+                "positions": [],
             })
+            entry["positions"].extend([None] * (len(rounds) - 1 - len(entry["positions"])))
+            entry["positions"].append(position)
+        for entry in drivers.values():
+            entry["positions"].extend([None] * (len(rounds) - len(entry["positions"])))
+        return {
+            "rounds": rounds,
+            "drivers": list(drivers.values()),
+        }
 
-    return JsonResponse({
-        "races": standings
-    })
+    return {
+        "races": [
+            {
+                "driver": f"{forename} {surname}",
+                "driver_id": driver_id,
+                "round": rnd,
+                "position": position,
+            }
+            for rnd, driver_id, forename, surname, position in results
+        ]
+    }
 
 @swagger_auto_schema(
     method='post',
@@ -721,6 +588,9 @@ def get_team_standings(request):
         type=openapi.TYPE_OBJECT,
         properties={
             'team_id': openapi.Schema(type=openapi.TYPE_STRING, description='Team-ID z.B.: red_bull'),
+            'seasons': openapi.Schema(type=openapi.TYPE_INTEGER,
+                                      description='Anzahl der Saisons '
+                                                  f'(optional, Standard 4, höchstens {MAX_BOX_PLOT_SEASONS})'),
         },
         required=['team_id'],
     ),
@@ -730,22 +600,17 @@ def get_team_standings(request):
         404: openapi.Response('Keine Daten gefunden'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def get_team_box_plot(request):
-    team_id = request.data.get('team_id')
+    team_id = request_params(request).get('team_id')
     if not team_id:
         return JsonResponse({"error": "Required field: team_id"}, status=400)
 
     # 1) Latest season
-    latest = (
-        Season.objects
-        .annotate(as_int=Cast('season', IntegerField()))
-        .order_by('-as_int')
-        .first()
-    )
-    if not latest:
+    current = get_current_season()
+    if not current:
         return JsonResponse({"error": "No seasons defined"}, status=500)
-    max_year = int(latest.season)
 
     # 2) Team lookup
     try:
@@ -753,51 +618,12 @@ def get_team_box_plot(request):
     except Constructor.DoesNotExist:
         return JsonResponse({"error": f"No team found with id {team_id}"}, status=404)
 
-    # 3) Candidate years ≤ max_year, desc
-    candidate = sorted(
-        (int(s) for s in Season.objects.values_list('season', flat=True) if s.isdigit() and int(s) <= max_year),
-        reverse=True
-    )
-
-    # 4) Only years with results, up to 4
-    seasons_with_results = []
-    for y in candidate:
-        if Result.objects.filter(date__season__season=str(y), constructor=team).exists():
-            seasons_with_results.append(y)
-        if len(seasons_with_results) >= 4:
-            break
-
-    # 5) Compute boxplots
-    boxplots = []
-    for y in seasons_with_results:
-        season = Season.objects.get(season=str(y))
-
-        # gather all raw positions for this team in that season
-        raw_positions = []
-        for race in Race.objects.filter(season=season):
-            qs = Result.objects.filter(
-                date=race, constructor=team
-            ).values_list('position', flat=True)
-            for pos in qs:
-                try:
-                    pi = int(pos)
-                except (ValueError, TypeError):
-                    continue
-                raw_positions.append(pi)
-
-        if not raw_positions:
-            continue
-
-        sorted_pos = sorted(raw_positions)
-        boxplots.append({
-            "x":             y,
-            "positions":     raw_positions,                # raw list, e.g. [5,2,8,1,...]
-            "min":           sorted_pos[0],
-            "firstQuartile": _percentile(sorted_pos, 25),
-            "median":        _percentile(sorted_pos, 50),
-            "thirdQuartile": _percentile(sorted_pos, 75),
-            "max":           sorted_pos[-1],
-        })
+    # 3) Latest n years with results (default 4), desc – one query for all uncached seasons
+    try:
+        count = box_plot_season_count(request_params(request))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    boxplots = box_plots('constructor', team.constructor, current['years'], current, limit=count)
 
     return JsonResponse({"boxPlots": boxplots})
 
@@ -820,9 +646,10 @@ def get_team_box_plot(request):
         404: openapi.Response('Keine Daten für Saison'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def insight_driver_standings(request):
-    year = request.data.get('year')
+    year = request_params(request).get('year')
     if not year:
         return JsonResponse({"error": "Missing required field: year"}, status=status.HTTP_400_BAD_REQUEST)
     try:
@@ -833,21 +660,21 @@ def insight_driver_standings(request):
         Driverstanding.objects
         .filter(season=season)
         .select_related('driver', 'constructor')
-        .order_by('position')
+        .order_by(F('position_num').asc(nulls_last=True))
     )
 
-    data = []
-    for s in qs:
-        data.append({
-            "driver": f"{s.driver.forename} {s.driver.surname}",
-            "driver_id": s.driver.driver,
-            "nationality": s.driver.nationality,
-            "team": s.constructor.name,
-            "position": s.positionText,
-            "points": s.points,
-        })
-    data.sort(key=lambda x: int(x["position"]) if x["position"].isdigit() else 9999)
-    return JsonResponse(data, safe=False)
+    return JsonResponse([driver_standing(s) for s in qs], safe=False)
+
+
+def driver_standing(s):
+    return {
+        "driver": f"{s.driver.forename} {s.driver.surname}",
+        "driver_id": s.driver.driver,
+        "nationality": s.driver.nationality,
+        "team": s.constructor.name,
+        "position": s.positionText,
+        "points": s.points,
+    }
 
 
 @swagger_auto_schema(
@@ -866,9 +693,10 @@ def insight_driver_standings(request):
         404: openapi.Response('Keine Daten für Saison'),
     }
 )
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
+@cached_response
 def insight_team_standings(request):
-    year = request.data.get('year')
+    year = request_params(request).get('year')
     if not year:
         return JsonResponse({"error": "Missing required field: year"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -881,35 +709,202 @@ def insight_team_standings(request):
         Constructorstanding.objects
         .filter(season=season)
         .select_related('constructor')
-        .order_by('position')
+        .order_by(F('position_num').asc(nulls_last=True))
     )
 
-    data = []
-    for s in qs:
-        data.append({
-            "team": s.constructor.name,
-            "team_id": s.constructor.constructor,
-            "position": s.positionText,
-            "points": s.points,
-        })
-    data.sort(key=lambda x: int(x["position"]) if x["position"].isdigit() else 9999)
+    return JsonResponse([team_standing(s) for s in qs], safe=False)
 
-    return JsonResponse(data, safe=False)
 
+def team_standing(s):
+    return {
+        "team": s.constructor.name,
+        "team_id": s.constructor.constructor,
+        "position": s.positionText,
+        "points": s.points,
+    }
 
-def _percentile(data, percent):
-    """
-    Lineare Interpolation für den p-ten Perzentil-Wert
-    data: bereits sortierte Liste von Zahlen
-    percent: Float zwischen 0 und 100
-    """
-    if not data:
-        return None
-    k = (len(data) - 1) * (percent / 100.0)
-    f = floor(k)
-    c = ceil(k)
-    if f == c:
-        return data[int(k)]
-    d0 = data[f] * (c - k)
-    d1 = data[c] * (k - f)
-    return d0 + d1
\ No newline at end of file
+
+BATCH_SECTIONS = ('detail', 'boxplot', 'standings')
+# Obergrenze je Batch-Anfrage (ein Grid hat 20 Fahrer bzw. 10 Teams)
+MAX_BATCH_IDS = 50
+
+
+def _id_list(params, key):
+    """Liste aus dem JSON-Body oder der Query (?driver_ids=a&driver_ids=b bzw. ?driver_ids=a,b)."""
+    values = params.getlist(key) if hasattr(params, 'getlist') else params.get(key)
+    if isinstance(values, str):
+        values = [values]
+    if not isinstance(values, list):
+        return []
+    return list(dict.fromkeys(v for value in values for v in str(value).split(',') if v))
+
+
+def _batch_request(request, key):
+    """ids, sections und Box-Plot-Saisonzahl einer Batch-Anfrage – oder eine Fehlerantwort."""
+    params = request_params(request)
+    ids = _id_list(params, key)
+    if not ids:
+        return None, JsonResponse({"error": f"Required field: {key} (list)"}, status=400)
+    if len(ids) > MAX_BATCH_IDS:
+        return None, JsonResponse({"error": f"At most {MAX_BATCH_IDS} ids per request"}, status=400)
+
+    sections = _id_list(params, 'sections') or list(BATCH_SECTIONS)
+    unknown = [s for s in sections if s not in BATCH_SECTIONS]
+    if unknown:
+        return None, JsonResponse(
+            {"error": f"Unknown sections: {', '.join(unknown)} (allowed: {', '.join(BATCH_SECTIONS)})"},
+            status=400
+        )
+
+    try:
+        count = box_plot_season_count(params)
+    except ValueError as exc:
+        return None, JsonResponse({"error": str(exc)}, status=400)
+    return (ids, sections, count, params), None
+
+
+def _batch_schema(key, example, season_field):
+    return openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            key: openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING),
+                                description=f'IDs, z.B. {example} (höchstens {MAX_BATCH_IDS})'),
+            'sections': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                       items=openapi.Schema(type=openapi.TYPE_STRING, enum=list(BATCH_SECTIONS)),
+                                       description='Optional, Standard: alle'),
+            'seasons': openapi.Schema(type=openapi.TYPE_INTEGER,
+                                      description='Box-Plot: Anzahl der Saisons '
+                                                  f'(Standard 4, höchstens {MAX_BOX_PLOT_SEASONS})'),
+            season_field: openapi.Schema(type=openapi.TYPE_INTEGER, description='Renn-Ergebnisse: Saison (optional)'),
+        },
+        required=[key],
+    )
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="Mehrere Fahrer auf einmal",
+    operation_description="Detailansicht, Box-Plot und Renn-Ergebnisse für eine Liste von Fahrern – "
+                          "eine Abfrage je Abschnitt statt einer Anfrage je Fahrer und Endpunkt.",
+    request_body=_batch_schema('driver_ids', '["leclerc", "hamilton"]', 'season'),
+    responses={
+        200: openapi.Response('drivers: driver_id -> {detail, boxPlots, races}; not_found: unbekannte IDs'),
+        400: openapi.Response('Bad Request'),
+    }
+)
+@api_view(['GET', 'POST'])
+@cached_response
+def driver_batch_view(request):
+    parsed, error = _batch_request(request, 'driver_ids')
+    if error:
+        return error
+    ids, sections, count, params = parsed
+
+    current = get_current_season()
+    if not current:
+        return JsonResponse({"error": "No seasons defined"}, status=500)
+
+    drivers = {d.driver: d for d in Driver.objects.select_related('career_stats').filter(pk__in=ids)}
+    found = [driver_id for driver_id in ids if driver_id in drivers]
+    data = {driver_id: {} for driver_id in found}
+
+    if 'detail' in sections:
+        for driver_id in found:
+            driver = drivers[driver_id]
+            data[driver_id]['detail'] = driver_detail(driver, career_or_zero(driver), current)
+
+    if 'boxplot' in sections:
+        for driver_id, boxes in box_plots_many('driver', found, current['years'][:count], current).items():
+            data[driver_id]['boxPlots'] = boxes
+
+    if 'standings' in sections:
+        # Saison je Fahrer: angegeben oder die neueste mit Rennen (eine Abfrage für alle)
+        season_year = params.get('season')
+        if season_year:
+            season_of = {driver_id: str(season_year) for driver_id in found}
+        else:
+            season_of = dict(
+                Result.objects
+                .filter(driver__in=found)
+                .values('driver_id')
+                .annotate(latest=Max('date__season__season'))
+                .values_list('driver_id', 'latest')
+                .order_by()
+            )
+        races = {driver_id: [] for driver_id in found}
+        for driver_id, season, rnd, grid, position in (
+            Result.objects
+            .filter(driver__in=found, date__season__in=set(season_of.values()), grid_num__gt=0, position_num__gt=0)
+            .order_by('date__round')
+            .values_list('driver_id', 'date__season_id', 'date__round', 'grid_num', 'position_num')
+        ):
+            if season_of.get(driver_id) == season:
+                races[driver_id].append(driver_race(rnd, grid, position))
+        for driver_id in found:
+            data[driver_id]['races'] = races[driver_id]
+
+    return JsonResponse({
+        'drivers': data,
+        'not_found': [driver_id for driver_id in ids if driver_id not in drivers],
+    })
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="Mehrere Teams auf einmal",
+    operation_description="Detailansicht, Box-Plot und Renn-Ergebnisse für eine Liste von Teams – "
+                          "eine Abfrage je Abschnitt statt einer Anfrage je Team und Endpunkt.",
+    request_body=_batch_schema('team_ids', '["ferrari", "red_bull"]', 'year'),
+    responses={
+        200: openapi.Response('teams: team_id -> {detail, boxPlots, races}; not_found: unbekannte IDs'),
+        400: openapi.Response('Bad Request'),
+    }
+)
+@api_view(['GET', 'POST'])
+@cached_response
+def team_batch_view(request):
+    parsed, error = _batch_request(request, 'team_ids')
+    if error:
+        return error
+    ids, sections, count, params = parsed
+
+    current = get_current_season()
+    if not current:
+        return JsonResponse({"error": "No seasons defined"}, status=500)
+
+    teams = {t.constructor: t for t in Constructor.objects.select_related('career_stats').filter(pk__in=ids)}
+    found = [team_id for team_id in ids if team_id in teams]
+    data = {team_id: {} for team_id in found}
+
+    if 'detail' in sections:
+        for team_id in found:
+            team = teams[team_id]
+            data[team_id]['detail'] = team_detail(team, career_or_zero(team), current)
+
+    if 'boxplot' in sections:
+        for team_id, boxes in box_plots_many('constructor', found, current['years'], current, limit=count).items():
+            data[team_id]['boxPlots'] = boxes
+
+    if 'standings' in sections:
+        # Alle Teams in einer Abfrage; nur Fahrer, die laut DriverTeam in der Saison für das Team fuhren
+        year = str(params.get('year') or datetime.now().year)
+        results = defaultdict(list)
+        for team_id, *row in (
+            Result.objects
+            .filter(date__season=year, constructor__in=found)
+            .filter(Exists(DriverTeam.objects.filter(
+                season=year, driver=OuterRef('driver'), constructor=OuterRef('constructor'))))
+            .annotate(pos_int=Coalesce('position_num', Value(9999)))
+            .order_by('date', 'pos_int')
+            .values_list('constructor_id', 'date__round', 'driver_id', 'driver__forename', 'driver__surname',
+                         'pos_int')
+        ):
+            results[team_id].append(row)
+        columnar = params.get('format') == 'columnar'
+        for team_id in found:
+            data[team_id].update(team_races(results[team_id], columnar))
+
+    return JsonResponse({
+        'teams': data,
+        'not_found': [team_id for team_id in ids if team_id not in teams],
+    })
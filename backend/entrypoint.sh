@@ -1,8 +1,19 @@
 #!/bin/sh
 # entrypoint.sh
 
+# Cron (populate_f1) und mehrere Worker brauchen einen gemeinsamen Cache
+if [ "$CACHE_BACKEND" = "locmem" ]; then
+  echo "CACHE_BACKEND=locmem ist je Prozess – mit Cron und mehreren Workern file oder redis verwenden." >&2
+  exit 1
+fi
+
 echo "Starting cron…"
 /usr/sbin/cron
 
+if [ "$SERVER" = "asgi" ]; then
+  echo "Switching to appuser and starting Uvicorn (ASGI)…"
+  exec runuser -u appuser -- uvicorn f1hub.asgi:application --host 0.0.0.0 --port 8000 --workers 3
+fi
+
 echo "Switching to appuser and starting Gunicorn…"
 exec runuser -u appuser -- gunicorn --bind 0.0.0.0:8000 --workers 3 f1hub.wsgi:application
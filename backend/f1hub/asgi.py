@@ -5,6 +5,23 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Deployment under ASGI (opt-in, the default stays gunicorn + WSGI):
+
+    uvicorn f1hub.asgi:application --host 0.0.0.0 --port 8000 --workers 3
+    daphne -b 0.0.0.0 -p 8000 f1hub.asgi:application
+
+In Docker set SERVER=asgi (see entrypoint.sh). The async variants of the
+read endpoints live under api/catalog/async/... and api/betting/async/...
+(catalog/async_views.py, betting/async_views.py); all other views keep
+running as sync views in Django's thread pool. Use DATABASE_POOL_MODE=pool
+or pgbouncer with ASGI, since async views do not reuse persistent
+connections (CONN_MAX_AGE) across requests.
+
+Compare throughput with the load_test command, e.g. at 200 concurrent clients:
+
+    python manage.py load_test --concurrency 200 --requests 1000 --bypass-cache --save sync.json
+    python manage.py load_test --concurrency 200 --requests 1000 --bypass-cache --async-views --compare sync.json
 """
 
 import os
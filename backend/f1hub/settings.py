@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
@@ -107,9 +108,66 @@ DATABASES = {
         'PASSWORD': os.getenv('DATABASE_PASSWORD', 'password'),
         'HOST': os.getenv('DATABASE_HOST', '127.0.0.1'),
         'PORT': os.getenv('DATABASE_PORT', 5432),
+        # Verbindungen pro Worker wiederverwenden statt je Request neu aufzubauen;
+        # vor der Wiederverwendung wird geprüft, ob die Verbindung noch lebt
+        'CONN_MAX_AGE': int(os.getenv('DATABASE_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     }
 }
 
+# DATABASE_POOL_MODE:
+#   persistent (Standard) – eine dauerhafte Verbindung je Worker (CONN_MAX_AGE)
+#   pool                  – Connection-Pool von psycopg 3 im Prozess (CONN_MAX_AGE muss 0 sein)
+#   pgbouncer             – hinter PgBouncer im Transaction-Pooling: keine serverseitigen Cursor
+#                           (die Verbindung zu PgBouncer selbst darf bestehen bleiben)
+DATABASE_POOL_MODE = os.getenv('DATABASE_POOL_MODE', 'persistent')
+if DATABASE_POOL_MODE == 'pool':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', 10)),
+    }
+elif DATABASE_POOL_MODE == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+elif DATABASE_POOL_MODE != 'persistent':
+    raise ValueError(f'Unbekannter DATABASE_POOL_MODE: {DATABASE_POOL_MODE}')
+
+# Cache (Saison-Schnappschuss, Box-Plots, Antworten der Catalog-Endpunkte)
+# CACHE_BACKEND: file (Standard, geteilt über ein Verzeichnis), redis oder locmem (je Prozess).
+# populate_f1 läuft per Cron in einem eigenen Prozess und invalidiert danach den Cache – das
+# erreicht die Worker nur über einen geteilten Cache. locmem daher nur für Tests und runserver
+# (entrypoint.sh bricht mit locmem ab).
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem' if TESTING else 'file')
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+            'KEY_PREFIX': 'f1hub',
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', BASE_DIR / '.django_cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'f1hub',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    raise ValueError(f'Unbekanntes CACHE_BACKEND: {CACHE_BACKEND}')
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -133,9 +191,13 @@ SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
 }
 
+# Lokaler Cache für Ergast-Antworten (populate_f1)
+ERGAST_CACHE_DIR = os.getenv('ERGAST_CACHE_DIR', BASE_DIR / '.ergast_cache')
+
 CRONJOBS = [
     # alle 3 Stunden um Minute 0
-    ('0 */3 * * *', 'django.core.management.call_command', ['populate_f1']),
+    # --resume: ein abgebrochener erster Import wird fortgesetzt statt neu begonnen
+    ('0 */3 * * *', 'django.core.management.call_command', ['populate_f1', '--resume']),
     ('0 */3 * * *', 'django.core.management.call_command', ['evaluate_bets']),
 ]
 
@@ -163,7 +225,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # "format" ist ein Parameter der Catalog-Endpunkte (GET-Aliase), keine Renderer-Auswahl
+    'URL_FORMAT_OVERRIDE': None,
 }
 
 SIMPLE_JWT = {